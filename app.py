@@ -1,203 +1,704 @@
-from flask import Flask, render_template, jsonify
-from src.core.sheets_client import GoogleSheetsClient
-from src.core.data_processor import ProcessadorDados
-from src.config.campos_config import CAMPOS_CONFIGURACAO
-from src.config.logging_config import setup_logging
-import logging
+"""
+Servidor do dashboard de atendimentos
+
+A aplicação é montada por `create_app()`. O módulo em si só importa o Flask:
+pandas, clientes do Google e o restante do pipeline são importados pela
+fábrica, e o `app` usado por `flask run`/`gunicorn app:app` é criado no
+primeiro acesso.
+
+Uso:
+    python app.py            inicia o servidor
+    python app.py --check    verifica ambiente, credenciais e dependências
+"""
 import os
-from dotenv import load_dotenv
+
+# Worker gevent opcional (SERVER_WORKER=gevent, extra 'gevent' do setup.py),
+# para manter muitas conexões abertas no /api/stream; o patch precisa vir
+# antes dos demais imports. Sem o pacote, segue com o servidor com threads
+# (`python app.py --check` aponta a dependência ausente)
+if os.getenv('SERVER_WORKER') == 'gevent':
+    try:
+        from gevent import monkey
+    except ImportError:
+        pass
+    else:
+        monkey.patch_all()
+
+from flask import Flask, g, render_template, jsonify, request, stream_with_context
+import argparse
+import logging
+import re
 import sys
-import traceback
+import threading
+import time
+import uuid
 
-# Configura logging primeiro
-setup_logging()
 logger = logging.getLogger(__name__)
 
-# Carrega variáveis de ambiente
-load_dotenv()
-
-logger.info("=== Iniciando Aplicação ===")
-logger.info(f"Working Directory: {os.getcwd()}")
-
-# Log detalhado do ambiente
-logger.info("=== Configurações do Ambiente ===")
-logger.info(f"Sistema Operacional: {os.name}")
-logger.info(f"Plataforma: {sys.platform}")
-logger.info(f"Versão Python: {sys.version}")
-logger.info(f"Encoding do Sistema: {sys.getfilesystemencoding()}")
-
-# Log das variáveis de ambiente
-env_vars = {
-    'PYTHONPATH': os.getenv('PYTHONPATH'),
-    'FLASK_DEBUG': os.getenv('FLASK_DEBUG'),
-    'FLASK_APP': os.getenv('FLASK_APP'),
-    'FLASK_ENV': os.getenv('FLASK_ENV'),
-    'GOOGLE_CREDENTIALS_PATH': os.getenv('GOOGLE_CREDENTIALS_PATH')
-}
-
-logger.info("=== Variáveis de Ambiente ===")
-for key, value in env_vars.items():
-    logger.info(f"{key}: {value or 'não definido'}")
-
-# Verifica existência do arquivo de credenciais
-credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH')
-if credentials_path:
-    logger.info(f"GOOGLE_CREDENTIALS_PATH configurado: {credentials_path}")
-    # Verifica se o caminho é absoluto
-    logger.info(f"Caminho é absoluto? {os.path.isabs(credentials_path)}")
-    # Tenta resolver caminho relativo se necessário
-    full_path = os.path.abspath(credentials_path)
-    logger.info(f"Caminho completo resolvido: {full_path}")
-    
-    if os.path.exists(full_path):
-        logger.info("✓ Arquivo de credenciais encontrado")
-        try:
-            with open(full_path, 'r') as f:
-                content = f.read()
-                logger.info("✓ Arquivo de credenciais pode ser lido")
-                # Verifica tamanho do arquivo
-                file_size = len(content)
-                logger.info(f"✓ Tamanho do arquivo: {file_size} bytes")
-                # Verifica se é JSON válido
-                import json
-                try:
-                    json.loads(content)
-                    logger.info("✓ Arquivo de credenciais é um JSON válido")
-                except json.JSONDecodeError as e:
-                    logger.error(f"✗ Arquivo de credenciais não é um JSON válido: {str(e)}")
-        except Exception as e:
-            logger.error(f"✗ Erro ao ler arquivo de credenciais: {str(e)}")
-            logger.error(f"✗ Permissões do arquivo: {oct(os.stat(full_path).st_mode)[-3:]}")
-    else:
-        logger.error(f"✗ Arquivo de credenciais NÃO encontrado em: {full_path}")
-        # Lista diretório pai para debug
-        parent_dir = os.path.dirname(full_path)
-        if os.path.exists(parent_dir):
-            logger.info(f"Conteúdo do diretório pai ({parent_dir}):")
-            try:
-                for item in os.listdir(parent_dir):
-                    logger.info(f"  - {item}")
-            except Exception as e:
-                logger.error(f"✗ Erro ao listar diretório: {str(e)}")
-else:
-    logger.error("✗ GOOGLE_CREDENTIALS_PATH não definido no arquivo .env")
-
-# Verifica paths do projeto
-project_path = os.getenv('PYTHONPATH')
-if project_path:
-    logger.info(f"Verificando diretório do projeto: {project_path}")
-    # Verifica se o caminho é absoluto
-    logger.info(f"Caminho é absoluto? {os.path.isabs(project_path)}")
-    # Tenta resolver caminho relativo se necessário
-    full_project_path = os.path.abspath(project_path)
-    logger.info(f"Caminho completo resolvido: {full_project_path}")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Id de requisição aceito do cliente/proxy (X-Request-ID); outros valores são substituídos
+ID_REQUISICAO_VALIDO = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# Conexões simultâneas do /api/stream quando STREAM_MAX_CONNECTIONS não é
+# definido: com o servidor com threads cada conexão ocupa uma thread
+STREAM_CONEXOES_GEVENT = 1000
+STREAM_CONEXOES_THREADS = 32
+
+# Corpos de /api/data (projeção, formato e versão base do delta) guardados
+# por snapshot; os usados há mais tempo são descartados
+CORPOS_DADOS_POR_SNAPSHOT = 32
+
+def servidor_gevent() -> bool:
+    """Indica se o processo roda sobre gevent (SERVER_WORKER=gevent ou `gunicorn -k gevent`)."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+def create_app(get_sheets_client=None):
+    """
+    Monta a aplicação: configuração, pipeline de dados, snapshot e rotas.
     
-    if os.path.exists(full_project_path):
-        logger.info("✓ Diretório do projeto encontrado")
+    Args:
+        get_sheets_client: Fábrica do cliente de leitura da planilha,
+                           `(sheet_url) -> cliente` (padrão: GoogleSheetsClient
+                           ou, com SHEETS_ASYNC_READER=1, AsyncSheetsClient)
+    """
+    import pandas as pd
+
+    from src.config.campos_config import (
+        CAMPOS_CONFIGURACAO,
+        GOOGLE_SHEETS_CONFIG,
+        get_campos_ordenaveis,
+        get_fontes_planilha
+    )
+    from src.config.logging_config import setup_logging
+    from src.core import contexto
+    from src.core.federacao import CarregadorFederado
+    from src.core.data_processor import ProcessadorDados, FORMATOS_REGISTROS
+    from src.core.snapshot import SnapshotManager
+    from src.core.metricas import CONTENT_TYPE as CONTENT_TYPE_METRICAS, metricas
+    from src.core.ordenacao import parse_ordenacao
+    from src.filter_manager import FiltrosDashboard
+    from src.pagination import PaginationManager
+    from src.utils.json_provider import init_json_provider
+    from src.utils.compressao import CorpoComprimido, codificacoes_disponiveis
+    from src.utils.perfilador import init_perfilador
+    from src.utils.sse import formatar_comentario, formatar_evento
+
+    setup_logging()
+    logger.info("=== Iniciando Aplicação ===")
+    logger.info(f"Working Directory: {os.getcwd()}")
+
+    app = Flask(__name__,
+        template_folder='src/templates',
+        static_folder='src/static'
+    )
+
+    # Configura o modo debug baseado na variável de ambiente
+    app.debug = os.getenv('FLASK_DEBUG') == '1'
+    logger.info(f"Debug mode: {app.debug}")
+
+    # Provedor de JSON das respostas (orjson quando disponível)
+    logger.info(f"Provedor de JSON: {init_json_provider(app)}")
+    logger.info(f"Compressão das respostas: {', '.join(codificacoes_disponiveis())}")
+
+    # Perfilamento opcional de requisições (PROFILER_SECRET / PROFILER_SAMPLE_RATE)
+    perfilador = init_perfilador(app, os.path.join(BASE_DIR, 'logs', 'perfis'))
+    if perfilador is not None:
+        logger.info(f"Perfilador de requisições ativo (amostragem: 1 em {perfilador.amostragem or '-'}, diretório: {perfilador.diretorio})")
+
+    processador = ProcessadorDados(CAMPOS_CONFIGURACAO, processos=GOOGLE_SHEETS_CONFIG["processing_workers"])
+    # KPIs e gráficos de cada snapshot são agregados uma única vez (ver MotorAgregacao)
+    motor = processador.motor
+
+    duracao_requisicoes = metricas.histograma(
+        'dashboard_requisicao_duracao_segundos', 'Duração das requisições por rota e status'
+    )
+
+    @app.before_request
+    def iniciar_medicao():
+        g.inicio_requisicao = time.perf_counter()
+        id_requisicao = request.headers.get('X-Request-ID', '')
+        if not ID_REQUISICAO_VALIDO.match(id_requisicao):
+            id_requisicao = uuid.uuid4().hex[:16]
+        g.contexto_requisicao = contexto.iniciar(id_requisicao)
+
+    @app.after_request
+    def registrar_metricas(resposta):
+        """
+        Alimenta as métricas de duração e tamanho das respostas (ver /metrics)
+        e registra o resumo da requisição em um único registro de log.
+        """
+        rota = request.url_rule.rule if request.url_rule else 'desconhecida'
+        inicio = g.get('inicio_requisicao')
+        duracao = time.perf_counter() - inicio if inicio is not None else 0.0
+        if inicio is not None:
+            duracao_requisicoes.observar(duracao, rota=rota, status=resposta.status_code)
+        # Em respostas em fluxo (/api/stream) o cálculo consumiria o gerador
+        tamanho = None if resposta.is_streamed else resposta.calculate_content_length()
+        codificacao = resposta.content_encoding or 'identity'
+        if tamanho is not None and resposta.status_code != 304:
+            metricas.bytes_resposta.observar(tamanho, rota=rota, codificacao=codificacao)
+
+        resumo = contexto.resumo()
+        if resumo is not None:
+            resposta.headers['X-Request-ID'] = contexto.id_requisicao()
+            logger.info(
+                f"{request.method} {request.path} {resposta.status_code} ({duracao * 1000:.1f} ms)",
+                extra={'resumo': {
+                    'metodo': request.method,
+                    'rota': rota,
+                    'status': resposta.status_code,
+                    'duracao_ms': round(duracao * 1000, 2),
+                    'bytes': tamanho,
+                    'codificacao': codificacao,
+                    **resumo.como_dict()
+                }}
+            )
+        return resposta
+
+    @app.teardown_request
+    def encerrar_contexto(erro=None):
+        tokens = g.pop('contexto_requisicao', None)
+        if tokens is not None:
+            contexto.encerrar(tokens)
+
+    @app.route('/')
+    def index():
+        """Rota principal que renderiza o dashboard."""
         try:
-            contents = os.listdir(full_project_path)
-            logger.info("✓ Diretório do projeto pode ser lido")
-            logger.info("Conteúdo do diretório do projeto:")
-            for item in contents:
-                logger.info(f"  - {item}")
+            logger.debug("Iniciando carregamento do dashboard")
+            return render_template('dashboard.html')
+
         except Exception as e:
-            logger.error(f"✗ Erro ao ler diretório do projeto: {str(e)}")
-            logger.error(f"✗ Permissões do diretório: {oct(os.stat(full_project_path).st_mode)[-3:]}")
-    else:
-        logger.error(f"✗ Diretório do projeto NÃO encontrado em: {full_project_path}")
-else:
-    logger.error("✗ PYTHONPATH não definido no arquivo .env")
+            logger.error(f"Erro ao renderizar dashboard: {str(e)}", exc_info=True)
+            error_msg = "Erro ao carregar dashboard. Por favor, tente novamente mais tarde."
+            if app.debug:
+                error_msg = str(e)
+            return render_template('error.html', error=error_msg)
 
-app = Flask(__name__, 
-    template_folder='src/templates',
-    static_folder='src/static'
-)
+    leitor_async = None
+    clientes_planilha = {}
+    trava_clientes = threading.Lock()
 
-# Configura o modo debug baseado na variável de ambiente
-app.debug = os.getenv('FLASK_DEBUG') == '1'
-logger.info(f"Debug mode: {app.debug}")
+    def cliente_padrao(sheet_url=None):
+        """
+        Retorna o cliente de leitura da planilha.
 
-processador = ProcessadorDados(CAMPOS_CONFIGURACAO)
+        O GoogleSheetsClient é criado uma vez por URL: credenciais, serviços
+        (discovery) e o serviço do Drive da consulta de versão são
+        reaproveitados entre as leituras, feitas uma de cada vez sob o lock
+        do SnapshotManager.
 
-@app.route('/')
-def index():
-    """Rota principal que renderiza o dashboard."""
-    try:
-        logger.info("Iniciando carregamento do dashboard")
-        return render_template('dashboard.html')
-        
-    except Exception as e:
-        logger.error(f"Erro ao renderizar dashboard: {str(e)}", exc_info=True)
-        error_msg = "Erro ao carregar dashboard. Por favor, tente novamente mais tarde."
-        if app.debug:
-            error_msg = str(e)
-        return render_template('error.html', error=error_msg)
-
-@app.route('/api/data')
-def get_data():
-    """API endpoint para carregamento e atualização dos dados."""
-    try:
-        logger.info("=== Iniciando carregamento de dados via API ===")
-        
-        logger.info("Inicializando Google Sheets Client")
+        Com SHEETS_ASYNC_READER=1 usa o leitor assíncrono, criado uma única vez
+        para que o pool de conexões seja reaproveitado entre as leituras (e
+        compartilhado entre as planilhas).
+        """
+        nonlocal leitor_async
+        if not GOOGLE_SHEETS_CONFIG["async_reader"]:
+            from src.core.sheets_client import GoogleSheetsClient
+            with trava_clientes:
+                if sheet_url not in clientes_planilha:
+                    clientes_planilha[sheet_url] = GoogleSheetsClient(sheet_url=sheet_url)
+                return clientes_planilha[sheet_url]
+        if leitor_async is None:
+            from src.core.sheets_async import AsyncSheetsClient
+            leitor_async = AsyncSheetsClient()
+        return leitor_async
+
+    if get_sheets_client is None:
+        get_sheets_client = cliente_padrao
+
+    def ler_fonte(fonte, versao_conhecida=None):
+        """
+        Lê uma das planilhas configuradas (ver get_fontes_planilha).
+
+        Returns:
+            Tupla (versão no Drive, dados brutos); os dados vêm None quando a
+            planilha não mudou desde `versao_conhecida`
+        """
         try:
-            sheets_client = GoogleSheetsClient()
-            logger.info("✓ Cliente do Google Sheets inicializado com sucesso")
+            sheets_client = get_sheets_client(fonte['url'])
         except Exception as e:
-            logger.error("✗ Erro ao inicializar Google Sheets Client")
-            logger.error(f"Detalhes do erro: {str(e)}")
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro ao inicializar Google Sheets Client ({fonte['nome']}): {str(e)}")
             raise
-        
-        logger.info("Solicitando leitura da planilha")
+
+        logger.debug(f"Solicitando leitura da planilha ({fonte['nome']})")
         try:
-            dados_brutos = sheets_client.ler_planilha()
-            logger.info(f"✓ Dados brutos obtidos: {len(dados_brutos)} linhas")
+            em_blocos = GOOGLE_SHEETS_CONFIG["stream_reader"]
+            if sheets_client is leitor_async:
+                from src.core.sheets_async import extrair_spreadsheet_id
+                versao, dados_brutos = sheets_client.ler_planilha_se_alterada(
+                    fonte['range'], extrair_spreadsheet_id(fonte['url']), versao_conhecida, em_blocos
+                )
+            else:
+                versao, dados_brutos = sheets_client.ler_planilha_se_alterada(fonte['range'], versao_conhecida, em_blocos)
+            if dados_brutos is None or em_blocos:
+                # Em blocos, as linhas são lidas à medida que o carregador consome o gerador
+                return versao, dados_brutos
+            logger.debug(f"✓ Dados brutos obtidos: {len(dados_brutos)} linhas")
         except Exception as e:
-            logger.error("✗ Erro ao ler planilha")
-            logger.error(f"Detalhes do erro: {str(e)}")
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro ao ler planilha ({fonte['nome']}): {str(e)}")
             raise
-        
+
         if len(dados_brutos) > 1:
             logger.debug("Amostra dos dados brutos:")
             for i, linha in enumerate(dados_brutos[1:3]):
                 logger.debug(f"Linha {i+1}: {linha}")
-        
-        # Processa os dados
-        logger.info("Processando dados...")
+        return versao, dados_brutos
+
+    carregador = CarregadorFederado(
+        get_fontes_planilha(),
+        ler_fonte,
+        processador=processador
+    )
+
+    def carregar_dados():
+        """Lê as planilhas e retorna o DataFrame processado para um novo snapshot."""
         try:
-            dados_processados = processador.processar_dados(dados_brutos)
-            logger.info("✓ Dados processados com sucesso")
+            with metricas.medir('carregamento'):
+                return carregador.carregar()
         except Exception as e:
-            logger.error("✗ Erro ao processar dados")
-            logger.error(f"Detalhes do erro: {str(e)}")
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro ao processar dados: {str(e)}")
             raise
-        
-        return jsonify(dados_processados)
-        
-    except Exception as e:
-        logger.error("=== Erro na rota /api/data ===")
-        logger.error(f"Tipo do erro: {type(e).__name__}")
-        logger.error(f"Mensagem do erro: {str(e)}")
-        logger.error("Stack trace completo:")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            "error": True, 
-            "message": str(e) if app.debug else "Erro ao atualizar dados",
-            "type": type(e).__name__ if app.debug else None
-        }), 500
 
-if __name__ == '__main__':
+    def comprimir_json(dados):
+        """Serializa os dados com o provedor de JSON do app e pré-comprime o corpo."""
+        with metricas.medir('json'):
+            corpo = jsonify(dados).get_data()
+        with metricas.medir('compressao'):
+            return CorpoComprimido(corpo)
+
+    def gerar_corpo_dados(snapshot, campos, formato, base=None):
+        """
+        Serializa e comprime o resultado de /api/data uma única vez por snapshot.
+
+        As requisições seguintes (de qualquer cliente) reaproveitam os bytes já
+        comprimidos em cada codificação, entre as CORPOS_DADOS_POR_SNAPSHOT
+        variantes usadas mais recentemente.
+
+        Args:
+            base: Resumo da versão que o cliente já tem (ver `Snapshot.posicao_delta`).
+                  Quando informado, o corpo traz apenas os registros acrescentados
+                  desde ela (`delta`), com KPIs e gráficos completos.
+        """
+        inicio = snapshot.posicao_delta(base) if base is not None else None
+        versao_base = base.versao if inicio is not None else None
+
+        def gerar():
+            dados_processados = processador.gerar_resultado(
+                snapshot.df, campos, formato, inicio=inicio or 0, agregados=motor.agregar_snapshot(snapshot)
+            )
+            dados_processados['versao'] = snapshot.versao
+            dados_processados['delta'] = versao_base is not None
+            if versao_base is not None:
+                dados_processados['versao_base'] = versao_base
+            return comprimir_json(dados_processados)
+
+        return snapshot.get_cache(
+            ('corpo', tuple(campos), formato, versao_base), gerar, limite=CORPOS_DADOS_POR_SNAPSHOT
+        )
+
+    def preparar_snapshot(snapshot):
+        """Aquece, antes da publicação, as estruturas usadas pelo dashboard."""
+        snapshot.get_indice_busca()
+        with app.app_context():
+            # Representação solicitada pelo frontend (campos padrão, colunar)
+            gerar_corpo_dados(snapshot, processador.resolver_campos(snapshot.df), 'columnar')
+
+    snapshot_manager = SnapshotManager(
+        carregar_dados,
+        ttl=GOOGLE_SHEETS_CONFIG["snapshot_ttl"],
+        preparar=preparar_snapshot,
+        historico=GOOGLE_SHEETS_CONFIG["snapshot_history"],
+        # Recargas feitas por requisições: índice de busca pronto antes da primeira busca
+        aquecer=lambda snapshot: snapshot.get_indice_busca()
+    )
+    app.extensions['snapshot_manager'] = snapshot_manager
+    if GOOGLE_SHEETS_CONFIG["background_refresh"]:
+        snapshot_manager.iniciar_atualizacao_periodica(GOOGLE_SHEETS_CONFIG["update_interval"])
+
+    limite_stream = GOOGLE_SHEETS_CONFIG["stream_max_connections"] or (
+        STREAM_CONEXOES_GEVENT if servidor_gevent() else STREAM_CONEXOES_THREADS
+    )
+    conexoes_stream = threading.BoundedSemaphore(limite_stream)
+    paginador = PaginationManager()
+    filtros_dashboard = FiltrosDashboard()
+    CAMPOS_ORDENAVEIS = set(get_campos_ordenaveis())
+
+    def ler_per_page():
+        """Itens por página pedidos em `per_page`, entre 1 e MAX_RECORDS_PER_PAGE."""
+        per_page = request.args.get('per_page', GOOGLE_SHEETS_CONFIG["records_per_page"], type=int)
+        return min(max(1, per_page), GOOGLE_SHEETS_CONFIG["max_records_per_page"])
+
+    def resposta_condicional(snapshot, variante, gerar_resposta):
+        """
+        Responde com 304 quando o cliente já tem a representação atual.
+
+        Compara `If-None-Match` com a ETag da variante (ou, na ausência dele,
+        `If-Modified-Since` com a última modificação do snapshot). Só chama
+        `gerar_resposta` quando o corpo precisa ser enviado.
+        """
+        etag = snapshot.get_etag(*variante)
+        if request.if_none_match:
+            nao_modificado = request.if_none_match.contains_weak(etag)
+        else:
+            nao_modificado = (
+                request.if_modified_since is not None
+                and snapshot.modificado_em <= request.if_modified_since
+            )
+
+        if nao_modificado:
+            resposta = app.response_class(status=304)
+        else:
+            resposta = gerar_resposta()
+
+        resposta.set_etag(etag, weak=True)
+        resposta.last_modified = snapshot.modificado_em
+        resposta.headers['X-Snapshot-Version'] = str(snapshot.versao)
+        validade = snapshot_manager.segundos_ate_expirar()
+        if validade:
+            resposta.headers['Cache-Control'] = f"private, max-age={validade}, must-revalidate"
+        else:
+            resposta.headers['Cache-Control'] = "private, no-cache"
+        return resposta
+
+    def resposta_cacheada(snapshot, variante, gerar_dados):
+        """
+        Resposta condicional cujo corpo é serializado e comprimido uma vez por snapshot.
+
+        Args:
+            snapshot: Snapshot de origem dos dados
+            variante: Identifica a representação (chave do cache e da ETag)
+            gerar_dados: Função sem argumentos que monta o conteúdo da resposta
+        """
+        def gerar_resposta():
+            corpo = snapshot.get_cache(('corpo',) + variante, lambda: comprimir_json(gerar_dados()))
+            return corpo.resposta(app.response_class, request.accept_encodings)
+
+        resposta = resposta_condicional(snapshot, variante, gerar_resposta)
+        resposta.vary.add('Accept-Encoding')
+        return resposta
+
+    @app.route('/api/kpis')
+    def get_kpis():
+        """API endpoint apenas com os KPIs, sem gráficos nem registros."""
+        try:
+            snapshot = snapshot_manager.get_snapshot()
+            return resposta_cacheada(snapshot, ('kpis',), lambda: {
+                'kpis': motor.kpis(motor.agregar_snapshot(snapshot)),
+                'versao': snapshot.versao
+            })
+
+        except Exception as e:
+            logger.error(f"Erro na rota /api/kpis: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": True,
+                "message": str(e) if app.debug else "Erro ao carregar KPIs"
+            }), 500
+
+    @app.route('/api/charts/<nome>')
+    def get_chart(nome):
+        """API endpoint com os dados de um gráfico (ver GRAFICOS_CONFIGURACAO em campos_config)."""
+        try:
+            if nome not in motor.definicoes:
+                return jsonify({"error": True, "message": f"Gráfico {nome} não encontrado"}), 404
+
+            snapshot = snapshot_manager.get_snapshot()
+            return resposta_cacheada(snapshot, ('grafico', nome), lambda: {
+                'grafico': motor.grafico(motor.agregar_snapshot(snapshot), nome),
+                'versao': snapshot.versao
+            })
+
+        except Exception as e:
+            logger.error(f"Erro na rota /api/charts/{nome}: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": True,
+                "message": str(e) if app.debug else "Erro ao carregar gráfico"
+            }), 500
+
+    @app.route('/api/data')
+    def get_data():
+        """
+        API endpoint para carregamento e atualização dos dados.
+
+        Com `since=<versao>`, retorna apenas os registros acrescentados desde
+        essa versão (`delta: true`); versões antigas, desconhecidas ou com
+        linhas alteradas recebem o conteúdo completo (`delta: false`).
+        """
+        try:
+            logger.debug("Iniciando carregamento de dados via API")
+
+            snapshot = snapshot_manager.get_snapshot()
+            formato = request.args.get('format', 'records')
+            try:
+                campos = processador.resolver_campos(snapshot.df, request.args.get('fields'))
+                if formato not in FORMATOS_REGISTROS:
+                    raise ValueError(f"Formato inválido: {formato}")
+                since = request.args.get('since')
+                if since and not since.isdigit():
+                    raise ValueError(f"Versão inválida: {since}")
+                base = snapshot_manager.get_versao(int(since)) if since else None
+            except ValueError as e:
+                return jsonify({"error": True, "message": str(e)}), 400
+
+            if base is not None and snapshot.posicao_delta(base) is None:
+                base = None
+
+            def gerar_resposta():
+                corpo = gerar_corpo_dados(snapshot, campos, formato, base)
+                return corpo.resposta(app.response_class, request.accept_encodings)
+
+            variante = ('data', tuple(campos), formato)
+            if base is not None:
+                variante += (base.versao,)
+            resposta = resposta_condicional(snapshot, variante, gerar_resposta)
+            resposta.vary.add('Accept-Encoding')
+            return resposta
+
+        except Exception as e:
+            logger.error(f"Erro na rota /api/data: {type(e).__name__}: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": True,
+                "message": str(e) if app.debug else "Erro ao atualizar dados",
+                "type": type(e).__name__ if app.debug else None
+            }), 500
+
+    @app.route('/api/stream')
+    def stream_data():
+        """
+        Canal Server-Sent Events com as novas versões dos dados.
+
+        A cada snapshot publicado pela atualização periódica envia um evento
+        `versao` com o delta desde a versão do cliente (`since` ou o cabeçalho
+        `Last-Event-ID` na reconexão), no mesmo formato de /api/data?format=columnar.
+        Quando o delta não se aplica, o evento traz apenas `{versao, delta: false}`
+        e o cliente relê /api/kpis, /api/charts/<nome> e /api/records.
+
+        Sem atualização periódica responde 204 (o cliente passa a usar polling);
+        acima do limite de conexões (STREAM_MAX_CONNECTIONS), 503 com
+        Retry-After, e o cliente faz polling até tentar o canal de novo.
+        """
+        if not snapshot_manager.atualizacao_periodica_ativa:
+            return app.response_class(status=204)
+
+        since = request.headers.get('Last-Event-ID') or request.args.get('since')
+        if since and not since.isdigit():
+            return jsonify({"error": True, "message": f"Versão inválida: {since}"}), 400
+
+        if not conexoes_stream.acquire(blocking=False):
+            resposta = jsonify({"error": True, "message": "Limite de conexões atingido"})
+            resposta.status_code = 503
+            resposta.headers['Retry-After'] = str(GOOGLE_SHEETS_CONFIG["update_interval"])
+            return resposta
+
+        keepalive = GOOGLE_SHEETS_CONFIG["stream_keepalive"]
+
+        def evento_versao(snapshot, versao_cliente):
+            base = snapshot_manager.get_versao(versao_cliente) if versao_cliente else None
+            if base is not None and snapshot.posicao_delta(base) is not None:
+                campos = processador.resolver_campos(snapshot.df)
+                dados = gerar_corpo_dados(snapshot, campos, 'columnar', base).variantes['identity']
+            else:
+                dados = app.json.dumps({'versao': snapshot.versao, 'delta': False})
+            return formatar_evento(dados, evento='versao', id_evento=snapshot.versao)
+
+        def eventos():
+            yield formatar_evento(retry=keepalive * 1000)
+            versao = int(since) if since else None
+            snapshot = snapshot_manager.snapshot
+            while True:
+                if snapshot is not None and snapshot.versao != versao:
+                    yield evento_versao(snapshot, versao)
+                    versao = snapshot.versao
+                snapshot = snapshot_manager.aguardar_snapshot(versao, timeout=keepalive)
+                if snapshot is None:
+                    yield formatar_comentario('keepalive')
+
+        resposta = app.response_class(stream_with_context(eventos()), mimetype='text/event-stream')
+        # O servidor fecha a resposta mesmo quando o cliente desconecta antes
+        # do primeiro evento (o `finally` do gerador não chegaria a rodar)
+        liberada = threading.Lock()
+
+        def liberar_vaga():
+            # `close()` pode ser chamado mais de uma vez
+            if liberada.acquire(blocking=False):
+                conexoes_stream.release()
+
+        resposta.call_on_close(liberar_vaga)
+        resposta.headers['Cache-Control'] = 'no-cache'
+        resposta.headers['X-Accel-Buffering'] = 'no'
+        return resposta
+
+    @app.route('/api/records')
+    def get_records():
+        """
+        API endpoint para leitura paginada e ordenada dos registros.
+
+        Parâmetros: `sort` (campos visíveis separados por vírgula, prefixo '-'
+        para ordem decrescente; padrão '-data_hora'), `per_page` (até
+        MAX_RECORDS_PER_PAGE), `cursor` (valor de `next_cursor` da página
+        anterior), `fields` e `format` ('records' ou 'columnar').
+        """
+        try:
+            sort = request.args.get('sort', '-data_hora')
+            per_page = ler_per_page()
+            cursor = request.args.get('cursor')
+            formato = request.args.get('format', 'records')
+
+            try:
+                if formato not in FORMATOS_REGISTROS:
+                    raise ValueError(f"Formato inválido: {formato}")
+                espec = parse_ordenacao(sort)
+                invalidos = [campo for campo, _ in espec if campo not in CAMPOS_ORDENAVEIS]
+                if invalidos:
+                    raise ValueError(f"Campo de ordenação inválido: {', '.join(invalidos)}")
+
+                snapshot = snapshot_manager.get_snapshot()
+                campos = processador.resolver_campos(snapshot.df, request.args.get('fields'))
+                ordenacao = snapshot.get_ordenacao(espec)
+                pagina = paginador.get_cursor_pagination(ordenacao, per_page, cursor=cursor)
+            except (KeyError, ValueError) as e:
+                return jsonify({"error": True, "message": str(e)}), 400
+
+            indices = pagina.pop('indices')
+
+            def gerar_resposta():
+                pagina_df = snapshot.df[campos].iloc[indices]
+                registros = (
+                    processador.gerar_registros_colunares(pagina_df)
+                    if formato == 'columnar' else pagina_df.to_dict('records')
+                )
+                return jsonify({
+                    'registros': registros,
+                    'paginacao': pagina,
+                    'versao': snapshot.versao
+                })
+
+            variante = ('records', ordenacao.sort, per_page, cursor, tuple(campos), formato)
+            return resposta_condicional(snapshot, variante, gerar_resposta)
+
+        except Exception as e:
+            logger.error(f"Erro na rota /api/records: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": True,
+                "message": str(e) if app.debug else "Erro ao carregar registros"
+            }), 500
+
+    @app.route('/api/records/<int:id_registro>')
+    def get_record_detail(id_registro):
+        """API endpoint com todos os campos de um registro, para exibição sob demanda."""
+        try:
+            registro = snapshot_manager.get_snapshot().get_registro(id_registro)
+            if registro is None:
+                return jsonify({"error": True, "message": f"Registro {id_registro} não encontrado"}), 404
+            return jsonify(registro)
+
+        except Exception as e:
+            logger.error(f"Erro na rota /api/records/{id_registro}: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": True,
+                "message": str(e) if app.debug else "Erro ao carregar registro"
+            }), 500
+
+    @app.route('/api/search')
+    def search_records():
+        """
+        API endpoint de busca textual nos relatos e descrições.
+
+        Parâmetros: `q` (texto buscado), `per_page` (até MAX_RECORDS_PER_PAGE),
+        `cursor` (valor de `next_cursor` da página anterior), `fields` e
+        filtros estruturados pelo nome interno do campo (ex.: `status_atendimento`).
+        Retorna uma página dos registros encontrados, em ordem de relevância.
+        """
+        try:
+            consulta = request.args.get('q', '').strip()
+            if not consulta:
+                return jsonify({"error": True, "message": "Parâmetro q é obrigatório"}), 400
+            per_page = ler_per_page()
+            cursor = request.args.get('cursor')
+
+            snapshot = snapshot_manager.get_snapshot()
+            try:
+                campos = processador.resolver_campos(snapshot.df, request.args.get('fields'))
+            except ValueError as e:
+                return jsonify({"error": True, "message": str(e)}), 400
+            indice = snapshot.get_indice_busca()
+            linhas, pontuacoes = indice.buscar(consulta)
+            relevancia = pd.Series(pontuacoes, index=indice.ids[linhas])
+
+            df = filtros_dashboard.aplicar_busca(snapshot.df, relevancia.index)
+            filtros = filtros_dashboard.converter_filtros(request.args.to_dict())
+            if filtros:
+                df = filtros_dashboard.aplicar_filtros(df, filtros)
+
+            try:
+                pagina = paginador.get_search_pagination(
+                    consulta, df['id_registro'].to_numpy(),
+                    relevancia.reindex(df['id_registro']).to_numpy(), per_page, cursor=cursor
+                )
+            except ValueError as e:
+                return jsonify({"error": True, "message": str(e)}), 400
+            indices = pagina.pop('indices')
+
+            return jsonify({
+                'total': len(df),
+                'registros': df[campos].iloc[indices].to_dict('records'),
+                'paginacao': pagina,
+                'versao': snapshot.versao
+            })
+
+        except Exception as e:
+            logger.error(f"Erro na rota /api/search: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": True,
+                "message": str(e) if app.debug else "Erro ao buscar registros"
+            }), 500
+
+    @app.route('/metrics')
+    def get_metrics():
+        """Métricas do processo no formato de texto do Prometheus."""
+        return app.response_class(metricas.exportar(), mimetype=None, content_type=CONTENT_TYPE_METRICAS)
+
+    return app
+
+def __getattr__(nome):
+    # `app:app` (flask run, gunicorn) cria a aplicação no primeiro acesso
+    if nome == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor do dashboard de atendimentos")
+    parser.add_argument('--check', action='store_true',
+                        help="Verifica ambiente, credenciais e dependências e encerra")
+    args = parser.parse_args()
+
+    if args.check:
+        from src.utils.diagnostico import diagnosticar
+        return 0 if diagnosticar() else 1
+
+    aplicacao = create_app()
+
     # Configurações do servidor baseadas nas variáveis de ambiente
     port = int(os.getenv('FLASK_RUN_PORT', 5002))
     host = os.getenv('FLASK_RUN_HOST', '0.0.0.0')
-    
+
     logger.info(f"Iniciando servidor Flask em {host}:{port}")
-    logger.info(f"Debug mode: {app.debug}")
-    
-    app.run(debug=app.debug, host=host, port=port)
\ No newline at end of file
+    logger.info(f"Debug mode: {aplicacao.debug}")
+
+    if servidor_gevent():
+        from gevent.pywsgi import WSGIServer
+        logger.info("Servidor gevent")
+        WSGIServer((host, port), aplicacao).serve_forever()
+    else:
+        aplicacao.run(debug=aplicacao.debug, host=host, port=port, threaded=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Teste de carga do /api/data com uma planilha simulada no próprio processo
+
+Sobe o app.py em um servidor WSGI local, trocando o cliente do Google Sheets
+por `PlanilhaSimulada` (dados de dados_sinteticos.py, com latência e taxa de
+erro configuráveis), e dispara requisições concorrentes de vários usuários.
+Para cada modo, informa latência p50/p95/p99, requisições por segundo e os
+códigos de status:
+  - sem-cache: SNAPSHOT_TTL=0 e a planilha muda a cada leitura (uma linha
+               nova), então cada requisição relê e reprocessa tudo
+  - cache:     snapshot reaproveitado por --ttl segundos; as requisições
+               servem os corpos já serializados e comprimidos
+
+Com --url, as requisições vão para um servidor já em execução (a planilha
+simulada não é usada e --modos é ignorado).
+
+Uso:
+    python benchmarks/carga.py [--linhas 10000] [--usuarios 20] [--duracao 10]
+                               [--atraso 0.2] [--taxa-erro 0.0] [--modos sem-cache,cache]
+                               [--caminho /api/data] [--condicional] [--url http://host:porta]
+"""
+import argparse
+import copy
+import http.client
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import numpy as np
+
+from dados_sinteticos import gerar_planilha
+
+MODOS = ('sem-cache', 'cache')
+
+
+class PlanilhaSimulada:
+    """
+    Substituto do GoogleSheetsClient com a interface usada pelo app.py.
+
+    Cada leitura (e cada consulta de versão) espera `atraso` segundos, como
+    uma chamada de rede, e falha com probabilidade `taxa_erro`. Com
+    `alterar=True`, cada leitura acrescenta uma resposta à planilha e muda
+    a versão, simulando um formulário recebendo respostas.
+    """
+
+    def __init__(self, linhas, atraso=0.0, taxa_erro=0.0, seed=0):
+        self.dados = gerar_planilha(linhas, seed=seed)
+        self.atraso = atraso
+        self.taxa_erro = taxa_erro
+        self.alterar = False
+        self.leituras = 0
+        self._versao = 1
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _chamada(self):
+        if self.atraso:
+            time.sleep(self.atraso)
+        with self._lock:
+            falhou = self._rnd.random() < self.taxa_erro
+        if falhou:
+            raise RuntimeError("Erro 503 simulado da API do Google Sheets")
+
+    def get_versao_arquivo(self):
+        self._chamada()
+        return f"{self._versao}@simulada"
+
+    def ler_planilha(self, range_name=None):
+        self._chamada()
+        with self._lock:
+            self.leituras += 1
+            if self.alterar:
+                self.dados.append(copy.copy(self.dados[-1]))
+                self._versao += 1
+            return list(self.dados)
+
+    def ler_planilha_se_alterada(self, range_name=None, versao_conhecida=None, em_blocos=False):
+        versao = self.get_versao_arquivo()
+        if versao == versao_conhecida and not self.alterar:
+            return versao, None
+        dados = self.ler_planilha(range_name)
+        return f"{self._versao}@simulada", (iter([dados]) if em_blocos else dados)
+
+
+def iniciar_servidor(planilha):
+    """Cria o app com a planilha simulada e o serve em uma porta livre."""
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    aplicacao = create_app(get_sheets_client=lambda sheet_url=None: planilha)
+    servidor = make_server('127.0.0.1', 0, aplicacao, threaded=True)
+    threading.Thread(target=servidor.serve_forever, name="servidor-carga", daemon=True).start()
+    return aplicacao.extensions['snapshot_manager'], servidor
+
+def usuario(host, porta, caminho, prazo, condicional):
+    """Requisições sequenciais de um usuário, em uma conexão keep-alive, até o prazo."""
+    latencias, status = [], Counter()
+    conexao, etag = None, None
+    while time.perf_counter() < prazo:
+        headers = {'Accept-Encoding': 'gzip, br'}
+        if condicional and etag:
+            headers['If-None-Match'] = etag
+        inicio = time.perf_counter()
+        try:
+            if conexao is None:
+                conexao = http.client.HTTPConnection(host, porta, timeout=60)
+            conexao.request('GET', caminho, headers=headers)
+            resposta = conexao.getresponse()
+            resposta.read()
+            etag = resposta.getheader('ETag') or etag
+            status[resposta.status] += 1
+            if resposta.getheader('Connection', '').lower() == 'close':
+                conexao.close()
+                conexao = None
+        except (OSError, http.client.HTTPException) as e:
+            status[type(e).__name__] += 1
+            if conexao is not None:
+                conexao.close()
+            conexao = None
+            continue
+        latencias.append(time.perf_counter() - inicio)
+    if conexao is not None:
+        conexao.close()
+    return latencias, status
+
+def disparar(host, porta, caminho, usuarios, duracao, condicional):
+    inicio = time.perf_counter()
+    prazo = inicio + duracao
+    with ThreadPoolExecutor(max_workers=usuarios) as executor:
+        resultados = list(executor.map(
+            lambda _: usuario(host, porta, caminho, prazo, condicional), range(usuarios)
+        ))
+    decorrido = time.perf_counter() - inicio
+
+    latencias = np.array([latencia for parcial, _ in resultados for latencia in parcial]) * 1000
+    status = sum((contagem for _, contagem in resultados), Counter())
+    return latencias, status, decorrido
+
+def relatar(nome, latencias, status, decorrido):
+    print(f"\n{nome}")
+    if not len(latencias):
+        print(f"  nenhuma resposta ({dict(status)})")
+        return
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+    print(f"  requisições  {len(latencias):>8}   {len(latencias) / decorrido:10.1f} req/s")
+    print(f"  latência     p50 {p50:8.1f} ms   p95 {p95:8.1f} ms   p99 {p99:8.1f} ms   máx {latencias.max():8.1f} ms")
+    print(f"  status       {', '.join(f'{codigo}: {quantidade}' for codigo, quantidade in sorted(status.items(), key=str))}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=10000)
+    parser.add_argument('--usuarios', type=int, default=20)
+    parser.add_argument('--duracao', type=float, default=10, help="Segundos de carga por modo")
+    parser.add_argument('--atraso', type=float, default=0.2, help="Latência de cada chamada à planilha (s)")
+    parser.add_argument('--taxa-erro', type=float, default=0.0, help="Fração das chamadas à planilha que falham")
+    parser.add_argument('--ttl', type=int, default=300, help="SNAPSHOT_TTL do modo cache")
+    parser.add_argument('--modos', default=','.join(MODOS))
+    parser.add_argument('--caminho', default='/api/data')
+    parser.add_argument('--condicional', action='store_true', help="Reenvia o ETag recebido (If-None-Match)")
+    parser.add_argument('--url', help="Servidor já em execução (ex.: http://127.0.0.1:5002)")
+    args = parser.parse_args()
+
+    if args.url:
+        destino = urlsplit(args.url)
+        resultado = disparar(destino.hostname, destino.port or 80, args.caminho, args.usuarios, args.duracao, args.condicional)
+        relatar(f"{args.url}{args.caminho} - {args.usuarios} usuários", *resultado)
+        return
+
+    planilha = PlanilhaSimulada(args.linhas, atraso=args.atraso, taxa_erro=args.taxa_erro)
+    snapshot_manager, servidor = iniciar_servidor(planilha)
+    # Os logs por requisição, por valor processado e dos erros simulados
+    # dominariam as medidas
+    logging.disable(logging.ERROR)
+    warnings.simplefilter('ignore', FutureWarning)
+    print(
+        f"{args.linhas} linhas, {args.usuarios} usuários, {args.duracao:g} s por modo, "
+        f"atraso {args.atraso * 1000:g} ms, taxa de erro {args.taxa_erro:.0%}"
+    )
+
+    try:
+        for modo in args.modos.split(','):
+            if modo not in MODOS:
+                parser.error(f"Modo desconhecido: {modo}")
+            planilha.alterar = modo == 'sem-cache'
+            snapshot_manager.ttl = 0 if modo == 'sem-cache' else args.ttl
+            # A primeira leitura fica fora da medida (repetida se a falha simulada a atingir)
+            for tentativa in range(10):
+                try:
+                    snapshot_manager.get_snapshot(forcar=True)
+                    break
+                except RuntimeError:
+                    if tentativa == 9:
+                        raise
+            leituras = planilha.leituras
+
+            resultado = disparar('127.0.0.1', servidor.server_port, args.caminho, args.usuarios, args.duracao, args.condicional)
+            relatar(f"{modo} ({args.caminho})", *resultado)
+            print(f"  leituras da planilha: {planilha.leituras - leituras}")
+    finally:
+        servidor.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Gerador de planilhas sintéticas no formato das respostas do Google Forms
+
+As linhas seguem o cabeçalho de MAPEAMENTO_COLUNAS e imitam a planilha real:
+  - respostas em ordem cronológica (o formulário só acrescenta linhas)
+  - cardinalidades realistas, com distribuição concentrada (Zipf) em poucos
+    prestadores e clientes
+  - relatos de tamanho variável, relatos detalhados quase sempre vazios
+  - uma fração de datas malformadas ou vazias
+  - células vazias no fim da linha omitidas, como faz a API
+
+Uso como script (imprime uma amostra):
+    python benchmarks/dados_sinteticos.py [--linhas 5]
+"""
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.config.campos_config import MAPEAMENTO_COLUNAS
+
+INICIO = datetime.datetime(2023, 1, 2, 8, 0, 0)
+
+PRESTADORES = [
+    'Ana Souza', 'Bruno Lima', 'Carla Mendes', 'Diego Rocha', 'Eduarda Alves', 'Felipe Costa',
+    'Gabriela Nunes', 'Henrique Dias', 'Isabela Ramos', 'João Pereira', 'Karina Melo',
+    'Lucas Martins', 'Mariana Teixeira', 'Nelson Araújo', 'Otávio Barros', 'Patrícia Gomes',
+    'Rafael Cardoso', 'Sabrina Pinto', 'Tiago Moreira', 'Vanessa Lopes'
+]
+STATUS = {'Concluído': 70, 'Pendente': 18, 'Em Andamento': 8, 'Cancelado': 4}
+TIPOS = {'Suporte': 45, 'Dúvida': 25, 'Erro no sistema': 15, 'Implantação': 7, 'Treinamento': 5, 'Customização': 3}
+SISTEMAS = {'ERP': 40, 'PDV': 25, 'Fiscal': 15, 'Financeiro': 8, 'Estoque': 6, 'Folha': 4, 'App Mobile': 2}
+CANAIS = {'Telefone': 35, 'WhatsApp': 40, 'E-mail': 12, 'Acesso remoto': 10, 'Presencial': 3}
+VOCABULARIO = (
+    'cliente relata erro ao emitir nota fiscal eletrônica rejeição schema certificado digital vencido '
+    'senha bloqueada usuário sem acesso relatório de vendas divergente estoque negativo produto sem '
+    'cadastro impressora não imprime cupom sincronização pdv lenta backup atualização versão boleto '
+    'conciliação bancária cálculo de impostos icms st cfop alíquota tabela de preços desconto pedido '
+    'orientado configurado ajustado reinstalado validado testado com o cliente aguardando retorno'
+).split()
+DATAS_MALFORMADAS = ['31/02/2024 10:00:00', '2024-13-45 25:61:00', 'ontem', '00/00/0000 00:00:00', '12/31/2024 08:00']
+
+# Probabilidade de cada relato detalhado estar preenchido
+PREENCHIMENTO_RELATOS = (0.3, 0.1, 0.04, 0.01, 0.005)
+
+def _zipf(nomes, s=1.1):
+    """Pesos cumulativos de uma distribuição Zipf sobre os nomes."""
+    return nomes, list(itertools.accumulate(1 / (i + 1) ** s for i in range(len(nomes))))
+
+def _pesos(opcoes):
+    return list(opcoes), list(itertools.accumulate(opcoes.values()))
+
+def _texto(rnd, media_palavras):
+    palavras = max(1, int(rnd.lognormvariate(0, 0.6) * media_palavras))
+    return ' '.join(rnd.choices(VOCABULARIO, k=palavras)).capitalize()
+
+def gerar_planilha(linhas, seed=0, fracao_datas_invalidas=0.01, fracao_relatos_vazios=0.08):
+    """
+    Gera as linhas de uma planilha de respostas, com o cabeçalho na primeira.
+
+    Args:
+        linhas: Quantidade de respostas
+        seed: Semente, para que o mesmo tamanho gere sempre os mesmos dados
+        fracao_datas_invalidas: Fração de datas malformadas ou vazias
+        fracao_relatos_vazios: Fração de respostas sem o relato do pedido
+    """
+    rnd = random.Random(seed)
+    cabecalho = list(MAPEAMENTO_COLUNAS.keys())
+
+    quantidade_clientes = max(10, min(3000, linhas // 20))
+    clientes = _zipf([f"Empresa {i} Ltda" for i in range(1, quantidade_clientes + 1)])
+    solicitantes = [f"Solicitante {i}" for i in range(1, max(20, min(8000, linhas // 8)) + 1)]
+    prestadores = _zipf(PRESTADORES, s=0.8)
+    status, tipos, sistemas, canais = _pesos(STATUS), _pesos(TIPOS), _pesos(SISTEMAS), _pesos(CANAIS)
+
+    def escolher(opcoes):
+        return rnd.choices(opcoes[0], cum_weights=opcoes[1])[0]
+
+    # Intervalo médio entre respostas: a planilha cobre cerca de dois anos
+    intervalo_medio = max(1.0, 2 * 365 * 24 * 3600 / max(1, linhas))
+    momento = INICIO
+    dados = [cabecalho]
+    for _ in range(linhas):
+        momento += datetime.timedelta(seconds=rnd.expovariate(1 / intervalo_medio))
+        if rnd.random() < fracao_datas_invalidas:
+            data = rnd.choice(DATAS_MALFORMADAS + [''])
+        else:
+            data = momento.strftime('%d/%m/%Y %H:%M:%S')
+
+        canal = escolher(canais)
+        if rnd.random() < 0.15:
+            canal = f"{canal}, {escolher(canais)}"
+
+        linha = [
+            data,
+            escolher(prestadores),
+            escolher(clientes),
+            rnd.choice(solicitantes) if rnd.random() > 0.05 else '',
+            *(_texto(rnd, 25) if rnd.random() < p else '' for p in PREENCHIMENTO_RELATOS),
+            _texto(rnd, 12) if rnd.random() > fracao_relatos_vazios else '',
+            _texto(rnd, 30) if rnd.random() > 0.15 else '',
+            escolher(status),
+            escolher(tipos),
+            escolher(sistemas) if rnd.random() > 0.03 else '',
+            canal if rnd.random() > 0.05 else ''
+        ]
+        while linha and linha[-1] == '':
+            linha.pop()
+        dados.append(linha)
+    return dados
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for linha in gerar_planilha(args.linhas, seed=args.seed):
+        print(linha)
+
+if __name__ == '__main__':
+    main()
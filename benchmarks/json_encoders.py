@@ -0,0 +1,108 @@
+"""
+Benchmark dos encoders de JSON usados nas respostas da API
+
+Compara, sobre o mesmo payload:
+  - app.py: provedor padrão do Flask x NumpyJSONProvider x OrjsonProvider
+  - modelo: json.dumps(default=dtSerializer) x toJson com orjson
+
+Uso:
+    python benchmarks/json_encoders.py [--linhas 10000] [--repeticoes 5]
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from dados_sinteticos import gerar_planilha
+from flask import Flask, jsonify
+from src.core.data_processor import ProcessadorDados
+from src.utils.json_provider import NumpyJSONProvider, OrjsonProvider, orjson
+
+def gerar_linhas_banco(linhas, seed=0):
+    """Gera linhas como as retornadas pelo fdb no servidor modelo."""
+    rnd = random.Random(seed)
+    return [
+        {
+            'ID': i,
+            'NOME': f"Produto {i}",
+            'PRECO': Decimal(f"{rnd.randint(1, 99999)}.{rnd.randint(0, 99):02d}"),
+            'DATA_CADASTRO': datetime.date(2024, 1, 1) + datetime.timedelta(days=rnd.randint(0, 365)),
+            'ULTIMA_ALTERACAO': datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=rnd.randint(0, 10**7)),
+            'ATIVO': rnd.random() > 0.1
+        }
+        for i in range(linhas)
+    ]
+
+def carregar_serializer_modelo():
+    """Importa modelo/app/lib/serializer.py sem conflitar com o app.py da raiz."""
+    caminho = os.path.join(BASE_DIR, 'modelo', 'app', 'lib', 'serializer.py')
+    spec = importlib.util.spec_from_file_location('modelo_serializer', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+def medir(funcao, repeticoes):
+    """Retorna o melhor tempo (ms) entre as repetições."""
+    return min(timeit.repeat(funcao, number=1, repeat=repeticoes)) * 1000
+
+def benchmark_app(linhas, repeticoes):
+    payload = ProcessadorDados().processar_dados(gerar_planilha(linhas))
+    provedores = [('flask padrão', None), ('std + numpy', NumpyJSONProvider)]
+    if orjson is not None:
+        provedores.append(('orjson', OrjsonProvider))
+
+    resultados = []
+    for nome, provedor in provedores:
+        app = Flask(__name__)
+        if provedor is not None:
+            app.json = provedor(app)
+        with app.app_context():
+            tamanho = len(jsonify(payload).get_data())
+            tempo = medir(lambda: jsonify(payload).get_data(), repeticoes)
+        resultados.append((nome, tempo, tamanho))
+    return resultados
+
+def benchmark_modelo(linhas, repeticoes):
+    serializer = carregar_serializer_modelo()
+    dados = gerar_linhas_banco(linhas)
+
+    resultados = []
+    atual = lambda: json.dumps(dados, default=serializer.dtSerializer)
+    resultados.append(('json.dumps + dtSerializer', medir(atual, repeticoes), len(atual())))
+
+    if orjson is not None:
+        serializer.JSON_ENCODER = 'orjson'
+        novo = lambda: serializer.toJson(dados)
+        if json.loads(novo()) != json.loads(atual()):
+            raise AssertionError("toJson com orjson gerou conteúdo diferente do encoder atual")
+        resultados.append(('toJson (orjson)', medir(novo, repeticoes), len(novo().encode('utf-8'))))
+    return resultados
+
+def imprimir(titulo, resultados):
+    print(f"\n{titulo}")
+    base = resultados[0][1]
+    for nome, tempo, tamanho in resultados:
+        print(f"  {nome:<28} {tempo:9.2f} ms  {base / tempo:5.1f}x  {tamanho:>10} bytes")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=10000)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson não instalado: apenas os encoders da biblioteca padrão serão medidos")
+
+    imprimir(f"app.py - /api/data ({args.linhas} registros)", benchmark_app(args.linhas, args.repeticoes))
+    imprimir(f"modelo - toJson ({args.linhas} linhas)", benchmark_modelo(args.linhas, args.repeticoes))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmark das etapas do pipeline do dashboard, com baseline e detecção de regressões
+
+Para cada tamanho de planilha sintética (ver dados_sinteticos.py), mede o
+melhor tempo e o pico de memória (tracemalloc, em uma execução separada) de:
+  - preparar:        ProcessadorDados.preparar_dataframe
+  - resultado:       ProcessadorDados.gerar_resultado (KPIs, gráficos e registros)
+  - snapshot:        Snapshot (hashes das linhas e do conteúdo)
+  - ordenacao:       Snapshot.get_ordenacao + PaginationManager (cursor e páginas)
+  - filtros:         FiltrosDashboard.aplicar_filtros + gerar_dados_graficos
+  - busca:           IndiceBusca (indexação e consulta)
+  - dashboard:       DashboardManager.processar_dashboard
+
+Os resultados podem ser gravados como baseline (--salvar) e, nas execuções
+seguintes, comparados com ela: etapas mais lentas ou com mais memória do que
+o limite (--limite, fração) encerram o script com código 1.
+
+Uso:
+    python benchmarks/pipeline.py [--tamanhos 1000,10000,100000,1000000] [--repeticoes 3]
+                                  [--etapas preparar,resultado] [--baseline ARQUIVO]
+                                  [--salvar] [--limite 0.25]
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+import warnings
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_planilha
+from src.core.busca import IndiceBusca
+from src.core.dashboard_manager import DashboardManager
+from src.core.data_processor import ProcessadorDados
+from src.core.ordenacao import parse_ordenacao
+from src.core.snapshot import Snapshot
+from src.config.campos_config import get_campos_pesquisaveis
+from src.filter_manager import FiltrosDashboard
+from src.pagination import PaginationManager
+
+TAMANHOS_PADRAO = '1000,10000,100000,1000000'
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'pipeline.json')
+
+# Diferenças abaixo destes valores são tratadas como ruído de medição
+TOLERANCIA_MS = 2.0
+TOLERANCIA_MB = 1.0
+
+def preparar_entradas(linhas):
+    """Gera a planilha e as entradas já processadas que as etapas seguintes usam."""
+    dados = gerar_planilha(linhas)
+    processador = ProcessadorDados()
+    df = processador.preparar_dataframe(dados)
+    registros_dashboard = pd.DataFrame(dados[1:], columns=dados[0]).rename(
+        columns=processador.mapeamento_colunas
+    ).to_dict('records')
+    return {
+        'dados': dados,
+        'processador': processador,
+        'df': df,
+        'funcionario': df['funcionario'].mode().iat[0],
+        'registros_dashboard': registros_dashboard
+    }
+
+def etapas(entradas):
+    """Funções medidas em cada etapa, todas sem argumentos."""
+    processador, df = entradas['processador'], entradas['df']
+    filtros = FiltrosDashboard()
+    paginador = PaginationManager()
+    pesquisaveis = get_campos_pesquisaveis().values()
+
+    def ordenacao():
+        # Snapshot novo a cada execução: a ordenação é cacheada por snapshot
+        snapshot = Snapshot(df, 1, hash_conteudo='-', hashes_linhas=np.empty(0, dtype=np.uint64))
+        ordem = snapshot.get_ordenacao(parse_ordenacao('cliente,-data_hora'))
+        pagina = paginador.get_cursor_pagination(ordem, 50)
+        if pagina['next_cursor']:
+            paginador.get_cursor_pagination(ordem, 50, cursor=pagina['next_cursor'])
+        paginador.get_pagination(len(df) // 100, 50, len(df))
+
+    def filtrar():
+        filtrado = filtros.aplicar_filtros(df, filtros.converter_filtros({
+            'funcionario': entradas['funcionario'],
+            'status_atendimento': 'Concluído'
+        }))
+        filtros.gerar_dados_graficos(filtrado)
+
+    def buscar():
+        indice = IndiceBusca(
+            df,
+            [config['nome_interno'] for config in pesquisaveis],
+            valores_ignorados=[config['valor_default'] for config in pesquisaveis]
+        )
+        indice.buscar_ids('nota fiscal rejeição')
+
+    return {
+        'preparar': lambda: processador.preparar_dataframe(entradas['dados']),
+        'resultado': lambda: processador.gerar_resultado(df, processador.resolver_campos(df)),
+        'snapshot': lambda: Snapshot(df, 1),
+        'ordenacao': ordenacao,
+        'filtros': filtrar,
+        'busca': buscar,
+        'dashboard': lambda: DashboardManager().processar_dashboard(entradas['registros_dashboard'])
+    }
+
+def medir_etapa(funcao, repeticoes):
+    """Retorna (melhor tempo em ms, pico de memória alocada em MB)."""
+    tempo = min(timeit.repeat(funcao, number=1, repeat=repeticoes)) * 1000
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tempo, pico / 2 ** 20
+
+def executar(tamanhos, repeticoes, nomes_etapas=None):
+    resultados = {}
+    for linhas in tamanhos:
+        inicio = time.perf_counter()
+        entradas = preparar_entradas(linhas)
+        print(f"\n{linhas} linhas (entradas geradas em {time.perf_counter() - inicio:.1f} s)")
+        resultados[str(linhas)] = {}
+        for nome, funcao in etapas(entradas).items():
+            if nomes_etapas and nome not in nomes_etapas:
+                continue
+            tempo, pico = medir_etapa(funcao, repeticoes)
+            resultados[str(linhas)][nome] = {'tempo_ms': round(tempo, 2), 'pico_mb': round(pico, 2)}
+            print(f"  {nome:<12} {tempo:12.1f} ms  {pico:10.1f} MB")
+        del entradas
+        gc.collect()
+    return resultados
+
+def comparar(resultados, baseline, limite):
+    """Lista as etapas que pioraram além do limite em relação à baseline."""
+    regressoes = []
+    for linhas, medidas in resultados.items():
+        for etapa, atual in medidas.items():
+            anterior = baseline.get('resultados', {}).get(linhas, {}).get(etapa)
+            if anterior is None:
+                continue
+            for metrica, tolerancia in (('tempo_ms', TOLERANCIA_MS), ('pico_mb', TOLERANCIA_MB)):
+                valor, referencia = atual[metrica], anterior[metrica]
+                if valor > referencia * (1 + limite) and valor - referencia > tolerancia:
+                    regressoes.append(
+                        f"{linhas} linhas / {etapa}: {metrica} {referencia} -> {valor} "
+                        f"(+{(valor / referencia - 1) * 100:.0f}%)"
+                    )
+    return regressoes
+
+def ambiente():
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default=TAMANHOS_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--etapas', help="Etapas medidas, separadas por vírgula (padrão: todas)")
+    parser.add_argument('--baseline', default=BASELINE_PADRAO)
+    parser.add_argument('--salvar', action='store_true', help="Grava os resultados como nova baseline")
+    parser.add_argument('--limite', type=float, default=0.25, help="Piora tolerada (fração) antes de falhar")
+    args = parser.parse_args()
+
+    # Os logs por valor do processamento (inclusive os avisos das datas
+    # malformadas de propósito) distorcem as medidas
+    logging.disable(logging.WARNING)
+    warnings.simplefilter('ignore', FutureWarning)
+
+    tamanhos = [int(tamanho) for tamanho in args.tamanhos.split(',')]
+    nomes_etapas = set(args.etapas.split(',')) if args.etapas else None
+    resultados = executar(tamanhos, max(1, args.repeticoes), nomes_etapas)
+
+    if args.salvar:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump({'ambiente': ambiente(), 'resultados': resultados}, arquivo, indent=2, ensure_ascii=False)
+        print(f"\nBaseline gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nSem baseline em {args.baseline}; use --salvar para criá-la")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as arquivo:
+        baseline = json.load(arquivo)
+    if baseline.get('ambiente') != ambiente():
+        print("\nAviso: baseline gravada em outro ambiente; as comparações podem não ser significativas")
+
+    regressoes = comparar(resultados, baseline, args.limite)
+    if regressoes:
+        print(f"\nRegressões acima de {args.limite * 100:.0f}%:")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        return 1
+    print(f"\nSem regressões acima de {args.limite * 100:.0f}% em relação à baseline")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark do processamento em partes (ProcessamentoParalelo)
+
+Mede `ProcessadorDados.processar_dados` em planilhas sintéticas com
+processamento serial e com 2, 4, ... processos (até o número de núcleos),
+descontando a criação do pool (a primeira execução de cada configuração).
+
+Com vários tamanhos em --linhas, informa o menor em que o processamento em
+paralelo superou o serial: o valor medido para PROCESSING_PARALLEL_MIN_ROWS
+nesta máquina.
+
+Uso:
+    python benchmarks/processamento_paralelo.py [--linhas 20000,50000,200000] [--repeticoes 3] [--processos 1,2,4]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from dados_sinteticos import gerar_planilha
+from src.core.data_processor import ProcessadorDados, nucleos_disponiveis
+
+def contagens_processos():
+    nucleos = nucleos_disponiveis()
+    processos, n = [1], 2
+    while n <= nucleos:
+        processos.append(n)
+        n *= 2
+    if processos[-1] != nucleos:
+        processos.append(nucleos)
+    return processos
+
+def medir(processador, dados, repeticoes):
+    processador.processar_dados(dados)  # aquece o pool de processos
+    return min(timeit.repeat(lambda: processador.processar_dados(dados), number=1, repeat=repeticoes)) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', default='200000', help="Tamanhos separados por vírgula")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--processos', help="Lista separada por vírgula (padrão: 1, 2, 4... até os núcleos)")
+    args = parser.parse_args()
+
+    processos = [int(p) for p in args.processos.split(',')] if args.processos else contagens_processos()
+    # Processos acima dos núcleos disponíveis são reduzidos pelo ProcessadorDados
+    processos = sorted({max(1, min(quantidade, nucleos_disponiveis())) for quantidade in processos})
+    tamanhos = sorted(int(linhas) for linhas in args.linhas.split(','))
+
+    limiar = None
+    for linhas in tamanhos:
+        dados = gerar_planilha(linhas)
+        print(f"\nProcessarDados - {linhas} linhas ({nucleos_disponiveis()} núcleos disponíveis)")
+        base = None
+        for quantidade in processos:
+            processador = ProcessadorDados(processos=quantidade, minimo_linhas_paralelo=0)
+            try:
+                tempo = medir(processador, dados, args.repeticoes)
+            finally:
+                processador.encerrar()
+            base = base or tempo
+            nome = 'serial' if quantidade <= 1 else f"{quantidade} processos"
+            print(f"  {nome:<14} {tempo:10.1f} ms  {base / tempo:5.2f}x")
+            if quantidade > 1 and tempo < base and limiar is None:
+                limiar = linhas
+
+    if len(tamanhos) > 1:
+        if limiar is None:
+            print("\nO processamento em paralelo não superou o serial em nenhum tamanho medido")
+        else:
+            print(f"\nPROCESSING_PARALLEL_MIN_ROWS medido: {limiar} linhas")
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,23 @@
+import os
 import json
 import datetime
 from decimal import Decimal
 from flask import request
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Encoder usado por toJson: 'orjson' (padrão quando instalado) ou 'std'
+JSON_ENCODER = os.environ.get('nbti.nbAdminServer-json') or ('orjson' if orjson else 'std')
+
+if JSON_ENCODER == 'orjson' and orjson is None:
+    raise ImportError("Encoder 'orjson' solicitado, mas o pacote orjson não está instalado")
+
+# Datas, Decimal e NumPy continuam passando por dtSerializer, mantendo o formato de saída
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
 
 def dtSerializer(obj):
     if isinstance(obj, float) or isinstance(obj, Decimal):
@@ -32,6 +47,15 @@ def getStandardTime(time):
     return f'{time}'
 
 def toJson(object):
+    # Com orjson, NaN e Infinity são gravados como null (o json padrão grava
+    # NaN/Infinity, que não são JSON válido). Inteiros com mais de 64 bits não
+    # são aceitos pelo orjson: nesse caso o objeto passa pelo json padrão
+    if JSON_ENCODER == 'orjson':
+        try:
+            return orjson.dumps(object, default=dtSerializer, option=ORJSON_OPTIONS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+
     return json.dumps(object, default=dtSerializer)
 
 def formatDate(value):
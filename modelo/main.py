@@ -1,10 +1,15 @@
 import os
 import ctypes
+import logging
 
 from flask import Flask, request
 from flask_cors import CORS
 
 from routes import makeRoutes
+from app.lib.perfilador import init_perfilador
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("nbAdminServer")
 
 port = os.environ.get('nbti.nbAdminServer-port') or 6001
 ctypes.windll.kernel32.SetConsoleTitleW(f"Servidor nbAdminServer {port}")
@@ -14,5 +19,9 @@ CORS(app)
 
 makeRoutes(app)
 
+perfilador = init_perfilador(app)
+if perfilador:
+    logger.info("Perfilador de requisições ativo em %s", perfilador.diretorio)
+
 app.run(host='0.0.0.0', port=port)
 
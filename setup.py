@@ -16,5 +16,9 @@ setup(
         'python-dotenv>=1.0.0',
         'pytest>=7.0.0',
     ],
+    extras_require={
+        # Servidor gevent (SERVER_WORKER=gevent) para muitas conexões no /api/stream
+        'gevent': ['gevent>=23.9.0'],
+    },
     python_requires='>=3.8',
 )
\ No newline at end of file
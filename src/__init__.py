@@ -1,15 +1,29 @@
 """
 Pacote principal do processador de dados
+
+As classes exportadas são importadas no primeiro acesso, para que importar
+um submódulo leve (ex.: src.config) não carregue pandas e os clientes do
+Google.
 """
+import importlib
 
-from .core.data_processor import ProcessadorDados
-from .core.sheets_client import GoogleSheetsClient
-from .core.dashboard_manager import DashboardManager
-from .filter_manager import FiltrosDashboard
+_EXPORTACOES = {
+    'ProcessadorDados': '.core.data_processor',
+    'GoogleSheetsClient': '.core.sheets_client',
+    'DashboardManager': '.core.dashboard_manager',
+    'FiltrosDashboard': '.filter_manager'
+}
 
 __all__ = [
     'ProcessadorDados',
     'GoogleSheetsClient',
     'DashboardManager',
     'FiltrosDashboard'
-]
\ No newline at end of file
+]
+
+def __getattr__(nome):
+    if nome not in _EXPORTACOES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(_EXPORTACOES[nome], __name__), nome)
+    globals()[nome] = valor
+    return valor
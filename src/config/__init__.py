@@ -1,6 +1,13 @@
 """
 Pacote de configurações
+
+O .env é carregado aqui, uma única vez, antes de qualquer módulo de
+configuração ler as variáveis de ambiente.
 """
+from dotenv import load_dotenv
+
+load_dotenv()
+
 from .campos_config import (
     CAMPOS_CONFIGURACAO,
     MAPEAMENTO_COLUNAS,
@@ -9,7 +16,12 @@ from .campos_config import (
     get_valores_default,
     validar_cabecalho,
     get_campos_visiveis,
-    get_campos_filtraveis
+    get_campos_registro_padrao,
+    get_campos_ordenaveis,
+    get_campos_filtraveis,
+    get_campos_pesquisaveis,
+    get_graficos,
+    get_fontes_planilha
 )
 
 __all__ = [
@@ -20,5 +32,10 @@ __all__ = [
     'get_valores_default',
     'validar_cabecalho',
     'get_campos_visiveis',
-    'get_campos_filtraveis'
+    'get_campos_registro_padrao',
+    'get_campos_ordenaveis',
+    'get_campos_filtraveis',
+    'get_campos_pesquisaveis',
+    'get_graficos',
+    'get_fontes_planilha'
 ]
@@ -1,13 +1,10 @@
 """
 Configuração centralizada dos campos do dashboard
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from zoneinfo import ZoneInfo
+import json
 import os
-from dotenv import load_dotenv
-
-# Carrega variáveis de ambiente
-load_dotenv()
 
 # Timezone padrão
 TIMEZONE = ZoneInfo(os.getenv('TZ', "America/Sao_Paulo"))
@@ -25,7 +22,27 @@ GOOGLE_SHEETS_CONFIG = {
     "timezone": TIMEZONE,
     "date_format": os.getenv('DATE_FORMAT', "%d/%m/%Y %H:%M:%S"),
     "default_start_time": os.getenv('DEFAULT_START_TIME', "00:00:00"),
-    "default_end_time": os.getenv('DEFAULT_END_TIME', "23:59:59.999999")
+    "default_end_time": os.getenv('DEFAULT_END_TIME', "23:59:59.999999"),
+    "snapshot_ttl": int(os.getenv('SNAPSHOT_TTL', '0')),  # 0 relê a planilha a cada requisição
+    "background_refresh": os.getenv('SNAPSHOT_BACKGROUND_REFRESH', '0') == '1',
+    "snapshot_history": int(os.getenv('SNAPSHOT_HISTORY', '10')),  # versões mantidas para deltas
+    "records_per_page": int(os.getenv('RECORDS_PER_PAGE', '50')),
+    "max_records_per_page": int(os.getenv('MAX_RECORDS_PER_PAGE', '1000')),  # limite de per_page em /api/records e /api/search
+    "stream_keepalive": int(os.getenv('STREAM_KEEPALIVE', '15')),  # segundos entre comentários no /api/stream
+    "stream_max_connections": int(os.getenv('STREAM_MAX_CONNECTIONS', '0')),  # 0: padrão do servidor (ver app.py)
+    "async_reader": os.getenv('SHEETS_ASYNC_READER', '0') == '1',  # requer aiohttp
+    "http_pool_size": int(os.getenv('SHEETS_HTTP_POOL_SIZE', '10')),
+    "http_timeout": int(os.getenv('SHEETS_HTTP_TIMEOUT', '30')),
+    "max_retries": int(os.getenv('GOOGLE_SHEETS_MAX_RETRIES', '3')),
+    "retry_delay": int(os.getenv('GOOGLE_SHEETS_RETRY_DELAY', '5')),
+    "change_probe": os.getenv('SHEETS_CHANGE_PROBE', '1') == '1',  # consulta a versão no Drive antes de ler
+    "sources": os.getenv('GOOGLE_SHEETS_SOURCES'),  # lista JSON de planilhas (ver get_fontes_planilha)
+    "processing_workers": int(os.getenv('PROCESSING_WORKERS', '0')),  # 0 processa na própria thread
+    "parallel_min_rows": int(os.getenv('PROCESSING_PARALLEL_MIN_ROWS', '50000')),  # linhas para dividir entre processos
+    "stream_reader": os.getenv('SHEETS_STREAM_READER', '0') == '1',  # lê a planilha em blocos de linhas
+    "stream_chunk_rows": int(os.getenv('SHEETS_STREAM_CHUNK_ROWS', '5000')),
+    "log_queue_size": int(os.getenv('LOG_QUEUE_SIZE', '10000')),  # registros aguardando escrita
+    "log_format": os.getenv('LOG_FORMAT', 'texto')  # 'json' escreve um objeto JSON por linha
 }
 
 # Mapeamento de nomes das colunas da planilha para nomes internos
@@ -163,6 +180,7 @@ CAMPOS_CONFIGURACAO = {
         "tipo_filtro": "select",
         "label": "Relato",
         "visivel": True,
+        "pesquisavel": True,
         "campos_concatenados": ["relato_detalhado_1", "relato_detalhado_2", "relato_detalhado_3", "relato_detalhado_4", "relato_detalhado_5"]
     },
     "Descrição do atendimento realizado:": {
@@ -172,7 +190,8 @@ CAMPOS_CONFIGURACAO = {
         "valor_default": VALORES_DEFAULT['descricao_atendimento'],
         "permite_filtro": False,
         "label": "Descrição",
-        "visivel": True
+        "visivel": True,
+        "pesquisavel": True
     },
     "Status do atendimento:": {
         "nome_interno": "status_atendimento",
@@ -217,6 +236,35 @@ CAMPOS_CONFIGURACAO = {
     }
 }
 
+# Gráficos do dashboard, calculados pelo motor de agregação (src/core/agregacao.py)
+#   campo: nome interno da coluna agregada
+#   limite: quantidade de categorias mais frequentes enviadas (None: todas;
+#           a API envia todas, pois os filtros do frontend usam os rótulos)
+#   granularidade: período de agrupamento de campos de data ('dia')
+GRAFICOS_CONFIGURACAO = {
+    'status': {'campo': 'status_atendimento', 'limite': None},
+    'tipo': {'campo': 'tipo_atendimento', 'limite': None},
+    'funcionario': {'campo': 'funcionario', 'limite': None},
+    'cliente': {'campo': 'cliente', 'limite': None},
+    'sistema': {'campo': 'sistema', 'limite': None},
+    'canal': {'campo': 'canal_atendimento', 'limite': None},
+    'timeline': {'campo': 'data_hora', 'granularidade': 'dia'},
+    'relato': {'campo': 'solicitacao_cliente', 'limite': None},
+    'solicitacao': {'campo': 'tipo_atendimento', 'limite': None},
+    'relatosDetalhados': {'campo': 'solicitacao_cliente', 'limite': None}
+}
+
+# Limites aplicados pelo DashboardManager sobre GRAFICOS_CONFIGURACAO
+# (as 10 categorias mais frequentes, como antes do motor de agregação)
+LIMITES_GRAFICOS_DASHBOARD = {
+    'tipo': 10,
+    'funcionario': 10,
+    'cliente': 10,
+    'sistema': 10,
+    'relato': 10,
+    'solicitacao': 10
+}
+
 def get_mapeamento_colunas() -> Dict[str, str]:
     """Retorna o mapeamento de colunas da planilha para nomes internos."""
     return MAPEAMENTO_COLUNAS
@@ -232,6 +280,15 @@ def get_campos_visiveis() -> Dict[str, Dict[str, Any]]:
         if config.get('visivel', False)
     }
 
+def get_campos_registro_padrao() -> List[str]:
+    """Retorna os campos enviados por padrão em cada registro da API: o id e os visíveis."""
+    return ['id_registro'] + [config['nome_interno'] for config in get_campos_visiveis().values()]
+
+def get_campos_ordenaveis() -> List[str]:
+    """Retorna os nomes internos dos campos que podem ser usados na ordenação server-side."""
+    campos = [config['nome_interno'] for config in get_campos_visiveis().values()]
+    return campos + ['id_registro']
+
 def get_campos_filtraveis() -> Dict[str, Dict[str, Any]]:
     """Retorna apenas os campos que permitem filtro."""
     return {
@@ -239,6 +296,56 @@ def get_campos_filtraveis() -> Dict[str, Dict[str, Any]]:
         if config.get('permite_filtro', False)
     }
 
+def get_graficos(limites: Optional[Dict[str, int]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Retorna a definição de cada gráfico do dashboard, pelo nome.
+
+    Args:
+        limites: Limite de categorias por gráfico, sobrepondo o da configuração
+    """
+    if not limites:
+        return GRAFICOS_CONFIGURACAO
+    return {
+        nome: {**definicao, 'limite': limites[nome]} if nome in limites else definicao
+        for nome, definicao in GRAFICOS_CONFIGURACAO.items()
+    }
+
+def get_campos_pesquisaveis() -> Dict[str, Dict[str, Any]]:
+    """Retorna apenas os campos indexados pela busca textual."""
+    return {
+        nome: config for nome, config in CAMPOS_CONFIGURACAO.items()
+        if config.get('pesquisavel', False)
+    }
+
+def get_fontes_planilha() -> List[Dict[str, str]]:
+    """
+    Retorna as planilhas lidas pelo dashboard, na ordem em que são combinadas.
+    
+    GOOGLE_SHEETS_SOURCES aceita uma lista JSON de objetos com `nome`, `url`
+    e, opcionalmente, `range` (ex.: uma planilha de formulário por equipe).
+    Sem ela, usa apenas GOOGLE_SHEETS_URL, com o nome 'principal'.
+    
+    Raises:
+        ValueError: Se a lista for inválida ou tiver nomes repetidos
+    """
+    range_padrao = GOOGLE_SHEETS_CONFIG["default_range"]
+    if not GOOGLE_SHEETS_CONFIG["sources"]:
+        return [{'nome': 'principal', 'url': GOOGLE_SHEETS_CONFIG["sheet_url"], 'range': range_padrao}]
+    
+    try:
+        fontes = json.loads(GOOGLE_SHEETS_CONFIG["sources"])
+        fontes = [
+            {'nome': str(fonte['nome']), 'url': fonte['url'], 'range': fonte.get('range') or range_padrao}
+            for fonte in fontes
+        ]
+    except (TypeError, KeyError, json.JSONDecodeError) as e:
+        raise ValueError(f"GOOGLE_SHEETS_SOURCES inválido: {str(e)}")
+    
+    nomes = [fonte['nome'] for fonte in fontes]
+    if not fontes or len(set(nomes)) != len(nomes):
+        raise ValueError("GOOGLE_SHEETS_SOURCES deve listar ao menos uma planilha, sem nomes repetidos")
+    return fontes
+
 def validar_cabecalho(cabecalho: list) -> bool:
     """Valida se o cabeçalho da planilha corresponde à configuração."""
     campos_obrigatorios = {
@@ -3,15 +3,11 @@ Configurações específicas para integração com Google Sheets
 """
 import os
 from zoneinfo import ZoneInfo
-from dotenv import load_dotenv
 import logging
 
 # Configura logging
 logger = logging.getLogger(__name__)
 
-# Carrega variáveis de ambiente
-load_dotenv()
-
 # Configurações do Google Sheets
 GOOGLE_SHEETS_CONFIG = {
     "credentials_path": os.getenv('GOOGLE_CREDENTIALS_PATH'),
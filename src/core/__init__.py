@@ -1,17 +1,34 @@
 """
 Pacote principal do processador de dados
-"""
 
-from .data_processor import ProcessadorDados
-from .sheets_client import GoogleSheetsClient
-from .dashboard_manager import DashboardManager
-from ..filter_manager import FiltrosDashboard
+Logs e métricas são importados de imediato; as demais classes, no primeiro
+acesso (ver src/__init__.py).
+"""
+import importlib
 from .logger import log_manager
+from .metricas import metricas
+
+_EXPORTACOES = {
+    'ProcessadorDados': '.data_processor',
+    'MotorAgregacao': '.agregacao',
+    'GoogleSheetsClient': '.sheets_client',
+    'DashboardManager': '.dashboard_manager',
+    'FiltrosDashboard': '..filter_manager'
+}
 
 __all__ = [
     'ProcessadorDados',
+    'MotorAgregacao',
     'GoogleSheetsClient',
     'DashboardManager',
     'FiltrosDashboard',
-    'log_manager'
-]
\ No newline at end of file
+    'log_manager',
+    'metricas'
+]
+
+def __getattr__(nome):
+    if nome not in _EXPORTACOES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(_EXPORTACOES[nome], __name__), nome)
+    globals()[nome] = valor
+    return valor
@@ -0,0 +1,285 @@
+"""
+Motor de agregação do dashboard (KPIs e gráficos)
+
+ProcessadorDados, DashboardManager e FiltrosDashboard calculam KPIs e
+gráficos por aqui, a partir das definições de GRAFICOS_CONFIGURACAO
+(campos_config): campo agregado, limite de categorias e granularidade das
+datas.
+
+A agregação é feita por coluna: cada campo é contado uma única vez, pelos
+códigos de `pd.factorize`, mesmo quando usado por mais de um gráfico. O
+resultado (`AgregadosParciais`) guarda apenas contagens e extremos, de modo
+que partes podem ser combinadas: as dos processos de trabalho ou, entre
+snapshots, as linhas acrescentadas à planilha desde a última agregação.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+import numpy as np
+import pandas as pd
+from ..config.campos_config import get_graficos
+from ..utils.date_utils import TIMESTAMP_AUSENTE, day_start_timestamps
+from .logger import log_manager
+from .metricas import metricas
+
+logger = log_manager.get_logger(__name__)
+
+# Período de agrupamento -> função que leva cada timestamp (ms) ao início do período
+GRANULARIDADES = {
+    'dia': day_start_timestamps
+}
+
+# Campos usados pelos KPIs
+CAMPO_STATUS = 'status_atendimento'
+CAMPO_FUNCIONARIO = 'funcionario'
+CAMPO_DATA = 'data_hora'
+
+Periodo = Tuple[str, str]
+
+def kpis_vazios() -> Dict[str, Any]:
+    """KPIs de um conjunto sem registros."""
+    return {
+        'total_registros': 0,
+        'total_concluidos': 0,
+        'total_pendentes': 0,
+        'taxa_conclusao': 0.0,
+        'tempo_medio': 0.0
+    }
+
+def _somar(contagens: Sequence[pd.Series]) -> pd.Series:
+    """Soma contagens indexadas pelo valor, mantendo a ordem da primeira ocorrência."""
+    contagens = [contagem for contagem in contagens if len(contagem)]
+    if len(contagens) <= 1:
+        return contagens[0] if contagens else pd.Series(dtype=np.int64)
+    return pd.concat(contagens).groupby(level=0, sort=False).sum()
+
+def _serie_grafico(contagem: Optional[pd.Series], limite: Optional[int] = None) -> Dict[str, List]:
+    """Categorias da mais para a menos frequente (empates na ordem de ocorrência)."""
+    if contagem is None or not len(contagem):
+        return {'labels': [], 'values': []}
+    quantidades = contagem.to_numpy()
+    ordem = np.argsort(-quantidades, kind='stable')
+    if limite:
+        ordem = ordem[:limite]
+    return {
+        'labels': contagem.index[ordem].tolist(),
+        'values': quantidades[ordem].astype(np.int64).tolist()
+    }
+
+
+class AgregadosParciais:
+    """
+    Contagens e extremos de uma parte do DataFrame processado.
+
+    Partes combinadas com `combinar` produzem os mesmos KPIs e gráficos
+    que a agregação do DataFrame inteiro, sem precisar dele.
+    """
+
+    def __init__(self):
+        self.total = 0
+        # Campo -> quantidade de registros por valor
+        self.contagens: Dict[str, pd.Series] = {}
+        # (campo, granularidade) -> quantidade de registros por início do período
+        self.periodos: Dict[Periodo, pd.Series] = {}
+        # Primeiro e último registro (ms) de cada funcionário, para o tempo médio
+        self.extremos: Optional[pd.DataFrame] = None
+
+    def copiar(self) -> "AgregadosParciais":
+        """Cópia que pode ser combinada sem alterar esta instância."""
+        copia = AgregadosParciais()
+        copia.total = self.total
+        copia.contagens = dict(self.contagens)
+        copia.periodos = dict(self.periodos)
+        copia.extremos = self.extremos
+        return copia
+
+    def combinar(self, outro: "AgregadosParciais") -> "AgregadosParciais":
+        """
+        Acumula os agregados de outra parte nesta instância e a retorna.
+
+        As partes devem ser combinadas na ordem das linhas, para que os
+        empates nos gráficos sigam a ordem de ocorrência.
+        """
+        self.total += outro.total
+        for campo, contagem in outro.contagens.items():
+            self.contagens[campo] = _somar([self.contagens.get(campo, pd.Series(dtype=np.int64)), contagem])
+        for periodo, contagem in outro.periodos.items():
+            self.periodos[periodo] = _somar([self.periodos.get(periodo, pd.Series(dtype=np.int64)), contagem])
+        if outro.extremos is not None:
+            if self.extremos is None:
+                self.extremos = outro.extremos
+            else:
+                self.extremos = pd.concat([self.extremos, outro.extremos]).groupby(level=0, sort=False).agg(
+                    {'min': 'min', 'max': 'max'}
+                )
+        return self
+
+
+class MotorAgregacao:
+    """Calcula KPIs e gráficos a partir das definições de gráficos configuradas."""
+
+    def __init__(self, graficos: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            graficos: Definições dos gráficos (padrão: GRAFICOS_CONFIGURACAO)
+
+        Raises:
+            ValueError: Se algum gráfico usar uma granularidade desconhecida
+        """
+        self.definicoes = graficos or get_graficos()
+        for nome, definicao in self.definicoes.items():
+            granularidade = definicao.get('granularidade')
+            if granularidade is not None and granularidade not in GRANULARIDADES:
+                raise ValueError(f"Granularidade inválida no gráfico {nome}: {granularidade}")
+        # Último snapshot agregado, base da agregação incremental
+        self._ultimo = None
+        self._lock = threading.Lock()
+
+    def agregar(self, df: pd.DataFrame, nomes: Optional[Iterable[str]] = None, kpis: bool = True) -> AgregadosParciais:
+        """
+        Agrega o DataFrame para os gráficos informados e, opcionalmente, os KPIs.
+
+        Args:
+            nomes: Gráficos calculados (padrão: todos)
+            kpis: Se False, não calcula o que só os KPIs usam
+
+        Raises:
+            KeyError: Se algum gráfico não existir
+        """
+        definicoes = [self.definicoes[nome] for nome in (self.definicoes if nomes is None else nomes)]
+        campos = [definicao['campo'] for definicao in definicoes if not definicao.get('granularidade')]
+        periodos = [(definicao['campo'], definicao['granularidade']) for definicao in definicoes if definicao.get('granularidade')]
+        if kpis:
+            campos.append(CAMPO_STATUS)
+        return self._agregar(df, list(dict.fromkeys(campos)), list(dict.fromkeys(periodos)), kpis)
+
+    def agregar_snapshot(self, snapshot) -> AgregadosParciais:
+        """
+        Agregados de todos os gráficos e KPIs do snapshot, calculados uma vez por snapshot.
+
+        Quando o snapshot apenas acrescentou linhas ao último snapshot
+        agregado (ver `Snapshot.posicao_delta`), só as linhas novas são
+        agregadas e combinadas com os agregados anteriores.
+        """
+        def agregar():
+            with self._lock:
+                anterior = self._ultimo
+            inicio = snapshot.posicao_delta(anterior[0]) if anterior is not None else None
+            if inicio is None:
+                agregados = self.agregar(snapshot.df)
+            else:
+                logger.debug(f"Agregação incremental: {len(snapshot) - inicio} registros novos")
+                agregados = anterior[1].copiar().combinar(self.agregar(snapshot.df.iloc[inicio:]))
+            with self._lock:
+                if self._ultimo is None or self._ultimo[0].versao < snapshot.versao:
+                    self._ultimo = (snapshot.resumo(), agregados)
+            return agregados
+
+        return snapshot.get_cache('agregados', agregar)
+
+    def kpis(self, agregados: AgregadosParciais) -> Dict[str, Any]:
+        """KPIs principais do dashboard."""
+        if not agregados.total:
+            return kpis_vazios()
+
+        status = agregados.contagens.get(CAMPO_STATUS, pd.Series(dtype=np.int64))
+        concluidos = int(status.get('Concluído', 0))
+        pendentes = int(status.get('Pendente', 0))
+
+        # Tempo médio: intervalo entre o primeiro e o último registro de cada funcionário, em minutos
+        tempo_medio = 0.0
+        if agregados.extremos is not None and len(agregados.extremos):
+            duracoes = (agregados.extremos['max'] - agregados.extremos['min']) / (1000 * 60)
+            if duracoes.notna().any():
+                tempo_medio = float(duracoes.mean())
+
+        return {
+            'total_registros': agregados.total,
+            'total_concluidos': concluidos,
+            'total_pendentes': pendentes,
+            'taxa_conclusao': round(concluidos / agregados.total * 100, 1),
+            'tempo_medio': round(tempo_medio, 1)
+        }
+
+    def grafico(self, agregados: AgregadosParciais, nome: str) -> Dict[str, List]:
+        """
+        Dados de um gráfico ({'labels', 'values'}).
+
+        Raises:
+            KeyError: Se o gráfico não existir
+        """
+        definicao = self.definicoes[nome]
+        granularidade = definicao.get('granularidade')
+        if granularidade:
+            contagem = agregados.periodos.get((definicao['campo'], granularidade))
+            if contagem is None or not len(contagem):
+                return {'labels': [], 'values': []}
+            contagem = contagem.sort_index()
+            return {'labels': contagem.index.tolist(), 'values': contagem.to_numpy().astype(np.int64).tolist()}
+        return _serie_grafico(agregados.contagens.get(definicao['campo']), definicao.get('limite'))
+
+    def graficos(self, agregados: AgregadosParciais) -> Dict[str, Dict[str, List]]:
+        """Dados de todos os gráficos configurados (vazios se não houver registros)."""
+        return {nome: self.grafico(agregados, nome) for nome in self.definicoes}
+
+    def contar(self, df: pd.DataFrame, campos: Iterable[str], limite: Optional[int] = None) -> Dict[str, Dict[str, List]]:
+        """
+        Contagem de valores de campos quaisquer, no formato dos gráficos.
+
+        Args:
+            campos: Nomes internos das colunas
+            limite: Quantidade de categorias mais frequentes (None: todas)
+        """
+        campos = list(dict.fromkeys(campos))
+        agregados = self._agregar(df, campos, [], kpis=False)
+        return {campo: _serie_grafico(agregados.contagens.get(campo), limite) for campo in campos}
+
+    def _agregar(self, df: pd.DataFrame, campos: List[str], periodos: List[Periodo], kpis: bool) -> AgregadosParciais:
+        agregados = AgregadosParciais()
+        agregados.total = len(df)
+        if df.empty:
+            return agregados
+
+        with metricas.medir('agregacao'):
+            fatorados: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+            datas: Dict[str, np.ndarray] = {}
+
+            def fatorar(campo):
+                # Códigos inteiros por valor, reaproveitados entre contagens e KPIs
+                if campo not in fatorados:
+                    fatorados[campo] = pd.factorize(df[campo])
+                return fatorados[campo]
+
+            def timestamps(campo):
+                # Datas ausentes ficam fora da timeline e do tempo médio
+                if campo not in datas:
+                    valores = pd.to_numeric(df[campo], errors='coerce').to_numpy(dtype=np.float64, copy=True)
+                    valores[valores == TIMESTAMP_AUSENTE] = np.nan
+                    datas[campo] = valores
+                return datas[campo]
+
+            ausentes = [campo for campo in campos + [campo for campo, _ in periodos] if campo not in df.columns]
+            if ausentes:
+                logger.warning(f"Colunas não encontradas no DataFrame: {', '.join(dict.fromkeys(ausentes))}")
+
+            for campo in campos:
+                if campo in df.columns:
+                    codigos, valores = fatorar(campo)
+                    # Códigos -1 são valores nulos, ignorados como em value_counts
+                    quantidades = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+                    agregados.contagens[campo] = pd.Series(quantidades, index=valores)
+
+            for campo, granularidade in periodos:
+                if campo in df.columns:
+                    inicios = GRANULARIDADES[granularidade](timestamps(campo))
+                    inicios = inicios[~np.isnan(inicios)].astype(np.int64)
+                    unicos, quantidades = np.unique(inicios, return_counts=True)
+                    agregados.periodos[(campo, granularidade)] = pd.Series(quantidades, index=unicos)
+
+            if kpis and CAMPO_DATA in df.columns and CAMPO_FUNCIONARIO in df.columns:
+                codigos, valores = fatorar(CAMPO_FUNCIONARIO)
+                validos = codigos >= 0
+                extremos = pd.Series(timestamps(CAMPO_DATA)[validos]).groupby(codigos[validos]).agg(['min', 'max'])
+                extremos.index = valores[extremos.index]
+                agregados.extremos = extremos
+
+        return agregados
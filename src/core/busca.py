@@ -0,0 +1,196 @@
+"""
+Índice de busca textual sobre os relatos e descrições dos atendimentos
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+# Palavras muito frequentes em português que não ajudam a distinguir registros
+STOPWORDS = frozenset("""
+a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas
+pelo pelos por que se sem um uma umas uns
+""".split())
+
+# Parâmetros do ranking BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Peso de um termo que casa apenas como prefixo do termo da consulta
+PESO_PREFIXO = 0.5
+
+# Tamanho mínimo para um termo da consulta ser expandido como prefixo
+TAMANHO_MINIMO_PREFIXO = 3
+
+_PADRAO_TOKEN = re.compile(r'\w+')
+
+def normalizar_texto(texto: str) -> str:
+    """Converte para minúsculas e remove acentos ('Instalação' -> 'instalacao')."""
+    decomposto = unicodedata.normalize('NFKD', str(texto).lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+def _nfc(texto: str) -> str:
+    # Em NFC, acentos não interrompem as palavras (\w) antes da normalização
+    if not unicodedata.is_normalized('NFC', texto):
+        texto = unicodedata.normalize('NFC', texto)
+    return texto
+
+@lru_cache(maxsize=100_000)
+def _termos_token(token: str) -> Tuple[str, ...]:
+    """Termos de uma palavra do texto: minúsculos, sem acentos e sem stopwords."""
+    return tuple(termo for termo in _PADRAO_TOKEN.findall(normalizar_texto(token)) if termo not in STOPWORDS)
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Divide o texto em termos normalizados, descartando stopwords.
+
+    As palavras são separadas antes da normalização, que é feita uma vez
+    por palavra distinta; o índice usa o mesmo procedimento.
+    """
+    return [
+        termo for token in _PADRAO_TOKEN.findall(_nfc(str(texto)))
+        for termo in _termos_token(token)
+    ]
+
+
+class IndiceBusca:
+    """
+    Índice invertido com ranking BM25 e expansão por prefixo.
+
+    Para cada termo guarda as linhas do DataFrame em que ele aparece e o peso
+    BM25 já calculado de cada ocorrência; a consulta só soma pesos.
+    """
+
+    def __init__(self, df: pd.DataFrame, campos: Sequence[str], valores_ignorados: Iterable[str] = ()):
+        """
+        Args:
+            df: DataFrame processado do snapshot
+            campos: Colunas de texto indexadas (concatenadas por registro)
+            valores_ignorados: Valores default que não devem ser indexados
+        """
+        self.total = len(df)
+        self.ids = df['id_registro'].to_numpy() if 'id_registro' in df.columns else np.arange(self.total)
+        ignorados = list(valores_ignorados)
+
+        # Ocorrências (termo, linha) de todas as colunas; cada valor distinto
+        # de uma coluna é tokenizado uma única vez
+        valores = []
+        for campo in campos:
+            if campo in df.columns:
+                coluna = df[campo].astype(str)
+                valores.append(coluna.where(~coluna.isin(ignorados), ''))
+        codigos, linhas, vocabulario = self._termos(valores)
+
+        # Frequência de cada par (termo, linha), ordenado por termo e linha
+        base = max(self.total, 1)
+        pares, frequencias = np.unique(codigos * base + linhas, return_counts=True)
+        codigos, linhas = np.divmod(pares, base)
+        frequencias = frequencias.astype(np.float64)
+
+        tamanhos = np.bincount(linhas, weights=frequencias, minlength=self.total)
+        tamanho_medio = tamanhos.mean() if self.total and tamanhos.any() else 1.0
+        normalizacao = BM25_K1 * (1 - BM25_B + BM25_B * tamanhos / tamanho_medio)
+
+        documentos = np.bincount(codigos, minlength=len(vocabulario))
+        idf = np.log(1 + (self.total - documentos + 0.5) / (documentos + 0.5))
+        pesos = idf[codigos] * frequencias * (BM25_K1 + 1) / (frequencias + normalizacao[linhas])
+        pesos = pesos.astype(np.float32)
+
+        # Postings de cada termo: fatias contíguas dos arrays ordenados
+        limites = np.concatenate(([0], np.cumsum(documentos)))
+        self._vocabulario: List[str] = vocabulario
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            termo: (linhas[inicio:fim], pesos[inicio:fim])
+            for termo, inicio, fim in zip(vocabulario, limites[:-1].tolist(), limites[1:].tolist())
+        }
+
+    @staticmethod
+    def _termos(colunas: List[pd.Series]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Ocorrências de termos nas colunas indexadas.
+
+        Os valores de cada coluna são fatorados e só os distintos passam por
+        `tokenizar`; cada um dá zero, um ou mais termos, repetidos nas
+        linhas em que o valor aparece.
+
+        Returns:
+            Tupla (código do termo no vocabulário, linha, vocabulário ordenado)
+        """
+        fatorados = [pd.factorize(coluna, use_na_sentinel=False) for coluna in colunas]
+        termos_valores = [[tokenizar(valor) for valor in distintos] for _, distintos in fatorados]
+        vocabulario = sorted({
+            termo for termos_coluna in termos_valores for termos in termos_coluna for termo in termos
+        })
+        posicao = {termo: indice for indice, termo in enumerate(vocabulario)}
+
+        blocos_codigos, blocos_linhas = [], []
+        for (codigos, _), termos_coluna in zip(fatorados, termos_valores):
+            quantidades = np.fromiter((len(termos) for termos in termos_coluna), dtype=np.int64, count=len(termos_coluna))
+            planos = np.fromiter(
+                (posicao[termo] for termos in termos_coluna for termo in termos),
+                dtype=np.int64, count=int(quantidades.sum())
+            )
+            inicios = np.cumsum(quantidades) - quantidades
+
+            # Repete cada linha pela quantidade de termos do seu valor
+            repeticoes = quantidades[codigos]
+            deslocamentos = np.cumsum(repeticoes) - repeticoes
+            indices = np.repeat(inicios[codigos] - deslocamentos, repeticoes) + np.arange(int(repeticoes.sum()))
+            blocos_codigos.append(planos[indices])
+            blocos_linhas.append(np.repeat(np.arange(len(codigos)), repeticoes))
+
+        if not blocos_codigos:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), vocabulario
+        return np.concatenate(blocos_codigos), np.concatenate(blocos_linhas), vocabulario
+
+    def buscar(self, consulta: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca os registros que contêm todos os termos da consulta.
+
+        Cada termo casa exatamente ou como prefixo (a partir de
+        TAMANHO_MINIMO_PREFIXO caracteres), com peso menor no segundo caso.
+
+        Returns:
+            Tupla (linhas, pontuações) em ordem decrescente de relevância
+        """
+        termos = tokenizar(consulta)
+        if not termos or not self.total:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        pontuacao = np.zeros(self.total, dtype=np.float32)
+        candidatos = np.ones(self.total, dtype=bool)
+
+        for termo in dict.fromkeys(termos):
+            pontuacao_termo = np.zeros(self.total, dtype=np.float32)
+            for expansao, peso in self._expandir(termo):
+                linhas, pesos = self._postings[expansao]
+                pontuacao_termo[linhas] += pesos * peso
+            candidatos &= pontuacao_termo > 0
+            pontuacao += pontuacao_termo
+
+        linhas = np.flatnonzero(candidatos)
+        # Maior pontuação primeiro; empate pelo id do registro
+        ordem = np.lexsort((self.ids[linhas], -pontuacao[linhas]))
+        linhas = linhas[ordem]
+        return linhas, pontuacao[linhas]
+
+    def buscar_ids(self, consulta: str) -> np.ndarray:
+        """Retorna os `id_registro` encontrados, em ordem de relevância."""
+        linhas, _ = self.buscar(consulta)
+        return self.ids[linhas]
+
+    def _expandir(self, termo: str) -> List[Tuple[str, float]]:
+        """Termos do vocabulário que casam com o termo da consulta e seus pesos."""
+        if len(termo) < TAMANHO_MINIMO_PREFIXO:
+            return [(termo, 1.0)] if termo in self._postings else []
+
+        expansoes = []
+        posicao = bisect_left(self._vocabulario, termo)
+        while posicao < len(self._vocabulario) and self._vocabulario[posicao].startswith(termo):
+            candidato = self._vocabulario[posicao]
+            expansoes.append((candidato, 1.0 if candidato == termo else PESO_PREFIXO))
+            posicao += 1
+        return expansoes
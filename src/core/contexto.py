@@ -0,0 +1,114 @@
+"""
+Contexto da requisição em andamento (contextvars)
+
+Guarda o id da requisição, incluído em todos os registros de log (ver
+src/core/logger.py), e o resumo que ela acumula ao passar pelo pipeline:
+durações das etapas medidas com `metricas.medir`, linhas lidas e
+processadas e uso dos caches do snapshot. O app escreve o resumo em um
+único registro ao final da requisição.
+
+Threads novas não herdam o contexto: use `propagar` ao submeter trabalho a
+um executor. Corrotinas enviadas com `asyncio.run_coroutine_threadsafe`
+já recebem uma cópia do contexto de quem as enviou.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+import contextvars
+import functools
+import threading
+
+
+class ResumoRequisicao:
+    """Durações, contadores e campos acumulados durante uma requisição."""
+
+    def __init__(self):
+        self.etapas: Dict[str, float] = {}
+        self.cache: Dict[str, Dict[str, int]] = {}
+        self.campos: Dict[str, Any] = {}
+        # Etapas podem rodar em threads do carregador ao mesmo tempo
+        self._lock = threading.Lock()
+
+    def registrar_etapa(self, etapa: str, duracao: float) -> None:
+        with self._lock:
+            self.etapas[etapa] = self.etapas.get(etapa, 0.0) + duracao
+
+    def registrar_cache(self, cache: str, acerto: bool) -> None:
+        with self._lock:
+            contagem = self.cache.setdefault(cache, {'acertos': 0, 'falhas': 0})
+            contagem['acertos' if acerto else 'falhas'] += 1
+
+    def somar(self, campo: str, valor: int) -> None:
+        with self._lock:
+            self.campos[campo] = self.campos.get(campo, 0) + valor
+
+    def anotar(self, **campos) -> None:
+        with self._lock:
+            self.campos.update(campos)
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Resumo serializável, com as durações em milissegundos."""
+        with self._lock:
+            return {
+                **self.campos,
+                'etapas_ms': {etapa: round(duracao * 1000, 2) for etapa, duracao in self.etapas.items()},
+                'cache': {cache: dict(contagem) for cache, contagem in self.cache.items()}
+            }
+
+
+_id_requisicao: ContextVar[Optional[str]] = ContextVar('id_requisicao', default=None)
+_resumo: ContextVar[Optional[ResumoRequisicao]] = ContextVar('resumo_requisicao', default=None)
+
+def iniciar(id_requisicao: str) -> Tuple[contextvars.Token, contextvars.Token]:
+    """
+    Inicia o contexto de uma requisição.
+
+    Returns:
+        Tokens a passar para `encerrar`
+    """
+    return _id_requisicao.set(id_requisicao), _resumo.set(ResumoRequisicao())
+
+def encerrar(tokens: Tuple[contextvars.Token, contextvars.Token]) -> None:
+    token_id, token_resumo = tokens
+    _resumo.reset(token_resumo)
+    _id_requisicao.reset(token_id)
+
+def id_requisicao() -> Optional[str]:
+    return _id_requisicao.get()
+
+def resumo() -> Optional[ResumoRequisicao]:
+    """Resumo da requisição em andamento (None fora de uma requisição)."""
+    return _resumo.get()
+
+def registrar_etapa(etapa: str, duracao: float) -> None:
+    atual = _resumo.get()
+    if atual is not None:
+        atual.registrar_etapa(etapa, duracao)
+
+def registrar_cache(cache: str, acerto: bool) -> None:
+    atual = _resumo.get()
+    if atual is not None:
+        atual.registrar_cache(cache, acerto)
+
+def somar(campo: str, valor: int) -> None:
+    atual = _resumo.get()
+    if atual is not None:
+        atual.somar(campo, valor)
+
+def anotar(**campos) -> None:
+    atual = _resumo.get()
+    if atual is not None:
+        atual.anotar(**campos)
+
+def propagar(funcao: Callable) -> Callable:
+    """
+    Envolve `funcao` para que execute, em outra thread, com o contexto atual.
+
+    Cada chamada usa uma cópia do contexto, de modo que várias threads podem
+    executá-la ao mesmo tempo; o resumo é o mesmo objeto em todas.
+    """
+    contexto = contextvars.copy_context()
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        return contexto.copy().run(funcao, *args, **kwargs)
+    return envoltorio
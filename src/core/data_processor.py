@@ -1,97 +1,331 @@
 """
 Processador de dados otimizado para o dashboard
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 import pandas as pd
 import numpy as np
-import logging
-from datetime import datetime
+import os
 from ..config.campos_config import (
     CAMPOS_CONFIGURACAO,
+    GOOGLE_SHEETS_CONFIG,
     get_mapeamento_colunas,
     get_valores_default,
-    get_campos_filtraveis
+    get_campos_registro_padrao
 )
 from ..utils.date_utils import (
-    TIMEZONE,
-    format_date_range,
     format_timestamp,
-    format_display_date,
-    get_current_time
+    get_current_time,
+    parse_datetimes,
+    TIMESTAMP_AUSENTE
 )
-from functools import lru_cache
+from .agregacao import AgregadosParciais, MotorAgregacao, kpis_vazios
+from .ingestao import BufferColunas
 from .logger import log_manager
+from .metricas import metricas
 
 logger = log_manager.get_logger(__name__)
 
+# Formatos aceitos para a lista de registros na API
+FORMATOS_REGISTROS = ('records', 'columnar')
+
+# Colunas de texto com até esta fração de valores distintos são enviadas
+# codificadas por dicionário no formato colunar
+LIMITE_CARDINALIDADE_DICIONARIO = 0.5
+
+def nucleos_disponiveis() -> int:
+    """Núcleos que este processo pode usar (afinidade de CPU, quando disponível)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 class ProcessadorDados:
-    def __init__(self, config=None):
-        """Inicializa o processador com configurações."""
+    def __init__(self, config=None, processos: int = 0, minimo_linhas_paralelo: Optional[int] = None):
+        """
+        Inicializa o processador com configurações.
+        
+        Args:
+            config: Configuração dos campos (padrão: CAMPOS_CONFIGURACAO)
+            processos: Processos usados para planilhas grandes (0 ou 1 processa
+                       tudo na thread que chamou); limitado aos núcleos
+                       disponíveis
+            minimo_linhas_paralelo: Linhas a partir das quais o processamento
+                                    é dividido entre os processos
+        """
         self.config = config or CAMPOS_CONFIGURACAO
         self.mapeamento_colunas = get_mapeamento_colunas()
         self.valores_default = get_valores_default()
+        # Com mais processos que núcleos, as partes disputam a CPU e o envio
+        # dos DataFrames de volta (pickle) torna o resultado mais lento que o serial
+        self.processos = min(processos, nucleos_disponiveis())
+        if self.processos < processos:
+            logger.info(f"Processos de trabalho limitados a {self.processos} (núcleos disponíveis)")
+        self.minimo_linhas_paralelo = (
+            GOOGLE_SHEETS_CONFIG["parallel_min_rows"]
+            if minimo_linhas_paralelo is None else minimo_linhas_paralelo
+        )
+        self._paralelo = None
         self._cache = {}
+        # KPIs e gráficos (ver GRAFICOS_CONFIGURACAO em campos_config)
+        self.motor = MotorAgregacao()
         logger.debug("ProcessadorDados inicializado com sucesso")
 
-    def processar_dados(self, dados_brutos: List[List]) -> Dict[str, Any]:
-        """Processa dados brutos e retorna estrutura completa para o dashboard."""
+    def processar_dados(self, dados_brutos: List[List], fields: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Processa dados brutos e retorna estrutura completa para o dashboard.
+        
+        Args:
+            dados_brutos: Linhas da planilha, com o cabeçalho na primeira
+            fields: Campos de cada registro (ver `resolver_campos`)
+        """
         try:
-            if not dados_brutos or len(dados_brutos) < 2:
-                logger.warning("Dados brutos vazios ou insuficientes")
-                return self._get_estrutura_vazia()
-
-            # Debug: Mostrar primeiras linhas dos dados brutos
-            logger.debug("Primeiras 5 linhas dos dados brutos:")
-            for i, linha in enumerate(dados_brutos[1:6]):
-                if len(linha) > 0:
-                    logger.debug(f"Linha {i+1} - data_hora bruto: {linha[0]}")
-
-            # Cria DataFrame inicial
-            df = pd.DataFrame(dados_brutos[1:], columns=dados_brutos[0])
-            df = df.rename(columns=self.mapeamento_colunas)
+            if self._usar_paralelo(dados_brutos):
+                # KPIs e gráficos vêm dos agregados combinados das partes
+                df, agregados = self.get_paralelo().processar(dados_brutos)
+            else:
+                df, agregados = self.preparar_dataframe(dados_brutos), None
+            return self.gerar_resultado(df, self.resolver_campos(df, fields), agregados=agregados)
             
-            # Debug: Mostrar dados do campo data_hora após criar DataFrame
-            if 'data_hora' in df.columns:
-                logger.debug("Valores de data_hora após criar DataFrame:")
-                logger.debug(df['data_hora'].head().to_list())
+        except Exception as e:
+            logger.error(f"Erro ao processar dados: {str(e)}", exc_info=True)
+            return self._get_estrutura_vazia()
+
+    def preparar_dataframe(self, dados_brutos: List[List], primeiro_id: int = 2) -> pd.DataFrame:
+        """
+        Converte os dados brutos da planilha no DataFrame normalizado.
+        
+        Cada registro recebe um `id_registro` igual ao número da linha na
+        planilha (o cabeçalho é a linha 1). Como o formulário só acrescenta
+        linhas, o id é estável entre leituras.
+        
+        Planilhas com `minimo_linhas_paralelo` linhas ou mais são divididas
+        entre os processos configurados (ver `ProcessamentoParalelo`).
+        
+        Args:
+            dados_brutos: Linhas da planilha, com o cabeçalho na primeira
+            primeiro_id: Id da primeira linha de dados (usado ao processar partes)
+        """
+        if not dados_brutos or len(dados_brutos) < 2:
+            logger.warning("Dados brutos vazios ou insuficientes")
+            return pd.DataFrame()
+        
+        if self._usar_paralelo(dados_brutos):
+            return self.get_paralelo().processar(dados_brutos, agregar=False)[0]
+
+        # Debug: Mostrar primeiras linhas dos dados brutos
+        logger.debug("Primeiras 5 linhas dos dados brutos:")
+        for i, linha in enumerate(dados_brutos[1:6]):
+            if len(linha) > 0:
+                logger.debug(f"Linha {i+1} - data_hora bruto: {linha[0]}")
+
+        # Cria DataFrame inicial, já com os nomes internos das colunas
+        buffer = BufferColunas(self.mapeamento_colunas)
+        with metricas.medir('ingestao'):
+            buffer.adicionar(dados_brutos)
+        return self.preparar_dataframe_colunas(buffer, primeiro_id)
+
+    def preparar_dataframe_em_blocos(self, blocos: Iterable[List[List]], primeiro_id: int = 2) -> pd.DataFrame:
+        """
+        Como `preparar_dataframe`, mas consumindo a planilha em blocos de linhas.
+        
+        Os blocos (ex.: de `GoogleSheetsClient.iterar_planilha`) vão direto
+        para os buffers por coluna, sem que a lista completa de linhas
+        precise existir em memória.
+        
+        Args:
+            blocos: Blocos de linhas; o primeiro começa pelo cabeçalho
+        """
+        return self.preparar_dataframe_colunas(
+            BufferColunas.de_blocos(blocos, self.mapeamento_colunas), primeiro_id
+        )
+
+    def preparar_dataframe_colunas(self, buffer: BufferColunas, primeiro_id: int = 2) -> pd.DataFrame:
+        """Finaliza o buffer e normaliza o DataFrame (ver `preparar_dataframe`)."""
+        if buffer.total_linhas == 0:
+            logger.warning("Dados brutos vazios ou insuficientes")
+            return pd.DataFrame()
+
+        with metricas.medir('dataframe'):
+            df = buffer.finalizar()
+            df['id_registro'] = np.arange(primeiro_id, primeiro_id + len(df), dtype=np.int64)
+        metricas.linhas_processadas.inc(len(df))
+        return self.normalizar_dataframe(df)
+
+    def normalizar_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica valores default e validações dos campos, concatena os relatos
+        e converte as datas em timestamps (ms).
+        
+        Args:
+            df: DataFrame com os nomes internos das colunas
+        """
+        # Debug: Mostrar dados do campo data_hora após criar DataFrame
+        if 'data_hora' in df.columns:
+            logger.debug("Valores de data_hora após criar DataFrame:")
+            logger.debug(df['data_hora'].head().to_list())
 
+        with metricas.medir('normalizacao'):
             # Aplica valores default e validações para cada campo
             df = self._processar_campos(df)
             
             # Concatena os campos de relato após processar os campos
             df = self._concatenar_campos_relato(df)
-            
-            # Debug: Mostrar dados após processar campos
-            if 'data_hora' in df.columns:
-                logger.debug("Valores de data_hora após processar campos:")
-                logger.debug(df['data_hora'].head().to_list())
+        
+        # Debug: Mostrar dados após processar campos
+        if 'data_hora' in df.columns:
+            logger.debug("Valores de data_hora após processar campos:")
+            logger.debug(df['data_hora'].head().to_list())
 
-            # Processa datas com tratamento de erro específico
+        # Processa datas com tratamento de erro específico
+        with metricas.medir('datas'):
             df = self._processar_datas(df)
-            
-            # Debug: Mostrar dados após processar datas
-            if 'data_hora' in df.columns:
-                logger.debug("Valores de data_hora após processar datas:")
-                logger.debug(df['data_hora'].head().to_list())
-
-            resultado = {
-                'kpis': self._calcular_kpis(df),
-                'graficos': self._gerar_dados_graficos(df),
-                'registros': df.to_dict('records'),
-                'ultima_atualizacao': format_timestamp(get_current_time())
-            }
-            
-            # Debug: Mostrar amostra dos registros finais
-            logger.debug("Amostra dos registros finais:")
-            for i, registro in enumerate(resultado['registros'][:5]):
-                logger.debug(f"Registro {i+1} - data_hora: {registro.get('data_hora')}")
+        
+        # Debug: Mostrar dados após processar datas
+        if 'data_hora' in df.columns:
+            logger.debug("Valores de data_hora após processar datas:")
+            logger.debug(df['data_hora'].head().to_list())
 
-            logger.info(f"Dados processados: {len(resultado['registros'])} registros")
+        return df
+
+    def encerrar(self) -> None:
+        """Finaliza os processos de trabalho, se houver."""
+        if self._paralelo is not None:
+            self._paralelo.encerrar()
+            self._paralelo = None
+
+    def _usar_paralelo(self, dados_brutos: List[List]) -> bool:
+        return self.processos > 1 and len(dados_brutos) - 1 >= max(self.minimo_linhas_paralelo, self.processos)
+
+    def get_paralelo(self):
+        """
+        Pool de processos de trabalho (`ProcessamentoParalelo`), criado no
+        primeiro uso e compartilhado com quem mais processa em paralelo
+        (ex.: `CarregadorFederado`).
+        """
+        if self._paralelo is None:
+            # Importado aqui: o módulo depende deste (ProcessadorDados)
+            from .processamento_paralelo import ProcessamentoParalelo
+            self._paralelo = ProcessamentoParalelo(self.processos)
+        return self._paralelo
+
+    def resolver_campos(self, df: pd.DataFrame, fields: Optional[str] = None) -> List[str]:
+        """
+        Resolve o parâmetro `fields` da API na lista de colunas dos registros.
+        
+        Os campos informados seguem a ordem canônica (a dos campos padrão e
+        depois a do DataFrame), sem repetições: a mesma projeção tem uma
+        única representação e uma única entrada nos caches de corpo.
+        
+        Args:
+            df: DataFrame processado
+            fields: None para os campos visíveis, '*' para todos ou nomes
+                    internos separados por vírgula
+        
+        Raises:
+            ValueError: Se algum campo solicitado não existir
+        """
+        padrao = [campo for campo in get_campos_registro_padrao() if campo in df.columns]
+        if fields is None:
+            return padrao
+        
+        if fields.strip() == '*':
+            campos = set(df.columns)
+        else:
+            campos = {campo.strip() for campo in fields.split(',') if campo.strip()}
+            desconhecidos = sorted(campos.difference(df.columns))
+            if desconhecidos:
+                raise ValueError(f"Campos desconhecidos: {', '.join(desconhecidos)}")
+        return [campo for campo in dict.fromkeys([*padrao, *df.columns]) if campo in campos]
+
+    def gerar_resultado(
+        self,
+        df: pd.DataFrame,
+        campos: Optional[List[str]] = None,
+        formato: str = 'records',
+        inicio: int = 0,
+        agregados=None
+    ) -> Dict[str, Any]:
+        """
+        Monta a estrutura do dashboard a partir do DataFrame processado.
+        
+        Args:
+            df: DataFrame processado
+            campos: Colunas incluídas em cada registro (None para todas). A
+                    projeção é feita antes da conversão para dicionários.
+            formato: 'records' (lista de dicionários) ou 'columnar'
+                     (ver `gerar_registros_colunares`)
+            inicio: Posição do primeiro registro incluído em `registros`;
+                    KPIs e gráficos consideram sempre todo o DataFrame
+            agregados: `AgregadosParciais` já combinados do DataFrame (ex.:
+                       `MotorAgregacao.agregar_snapshot`); se omitidos, o
+                       DataFrame é agregado aqui
+        """
+        if formato not in FORMATOS_REGISTROS:
+            raise ValueError(f"Formato inválido: {formato}")
+
+        if df.empty:
+            resultado = self._get_estrutura_vazia()
+            if formato == 'columnar':
+                resultado['registros'] = self.gerar_registros_colunares(df, campos or [])
             return resultado
-            
-        except Exception as e:
-            logger.error(f"Erro ao processar dados: {str(e)}", exc_info=True)
-            return self._get_estrutura_vazia()
+
+        registros = df if campos is None else df[campos]
+        if inicio:
+            registros = registros.iloc[inicio:]
+        if agregados is None:
+            agregados = self.motor.agregar(df)
+        kpis = self.motor.kpis(agregados)
+        graficos = self.motor.graficos(agregados)
+        with metricas.medir('registros'):
+            registros = (
+                self.gerar_registros_colunares(registros)
+                if formato == 'columnar' else registros.to_dict('records')
+            )
+        resultado = {
+            'kpis': kpis,
+            'graficos': graficos,
+            'registros': registros,
+            'ultima_atualizacao': format_timestamp(get_current_time())
+        }
+
+        logger.debug(f"Dados processados: {len(df)} registros")
+        return resultado
+
+    def gerar_registros_colunares(self, df: pd.DataFrame, campos: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Serializa os registros por coluna, sem criar um dicionário por linha.
+        
+        Colunas de texto com poucos valores distintos são codificadas por
+        dicionário: `data[coluna]` traz os códigos e `dictionaries[coluna]`
+        os valores, de modo que cada valor é enviado uma única vez.
+        
+        Returns:
+            {'columns': [...], 'total': n, 'data': {coluna: [...]},
+             'dictionaries': {coluna: [...]}}
+        """
+        campos = list(df.columns) if campos is None else [c for c in campos if c in df.columns]
+        total = len(df)
+        data = {}
+        dictionaries = {}
+
+        for campo in campos:
+            serie = df[campo]
+            if pd.api.types.is_numeric_dtype(serie):
+                data[campo] = serie.to_numpy().tolist()
+                continue
+
+            codigos, valores = pd.factorize(serie, use_na_sentinel=False)
+            if len(valores) <= total * LIMITE_CARDINALIDADE_DICIONARIO:
+                data[campo] = codigos.tolist()
+                dictionaries[campo] = valores.tolist()
+            else:
+                data[campo] = serie.tolist()
+
+        return {
+            'columns': campos,
+            'total': total,
+            'data': data,
+            'dictionaries': dictionaries
+        }
 
     def _concatenar_campos_relato(self, df: pd.DataFrame) -> pd.DataFrame:
         """Concatena os campos de relato detalhado em um único campo."""
@@ -172,35 +406,31 @@ class ProcessadorDados:
                 logger.warning(f"Campo de data {campo_data} não encontrado")
                 return df_processado
             
-            def converter_data(valor):
-                if pd.isna(valor) or valor == data_config["valor_default"]:
-                    logger.debug(f"Valor nulo ou default encontrado: {valor}")
-                    return format_timestamp(get_current_time())
-                
-                try:
-                    # Debug do valor antes da conversão
-                    logger.debug(f"Convertendo valor: {valor} (tipo: {type(valor)})")
-                    
-                    # Tenta converter diretamente se for timestamp
-                    if isinstance(valor, (int, float)):
-                        logger.debug(f"Valor numérico encontrado: {valor}")
-                        return valor
-                    
-                    # Se for string, tenta converter para timestamp
-                    data = datetime.strptime(str(valor).strip(), "%d/%m/%Y %H:%M:%S")
-                    timestamp = int(data.timestamp() * 1000)
-                    logger.debug(f"String '{valor}' convertida para timestamp: {timestamp}")
-                    return timestamp
-                    
-                except Exception as e:
-                    logger.warning(f"Erro ao converter data '{valor}': {str(e)}")
-                    return format_timestamp(get_current_time())
+            valores = df_processado[campo_data]
             
             # Debug antes da conversão
             logger.debug("Amostra de datas antes da conversão:")
-            logger.debug(df_processado[campo_data].head().to_list())
+            logger.debug(valores.head().to_list())
             
-            df_processado[campo_data] = df_processado[campo_data].apply(converter_data)
+            # Valores já numéricos são timestamps; textos no formato
+            # dd/mm/aaaa HH:MM:SS são convertidos no horário de São Paulo
+            numericos = valores.map(type).isin((int, float)).to_numpy()
+            timestamps = np.where(
+                numericos,
+                pd.to_numeric(valores.where(numericos), errors='coerce').to_numpy(dtype=np.float64),
+                parse_datetimes(valores.where(~numericos))
+            )
+            
+            # Vazios, o valor default e datas inválidas recebem TIMESTAMP_AUSENTE
+            ausentes = (valores.isna() | (valores == data_config["valor_default"])).to_numpy()
+            invalidos = np.isnan(timestamps) & ~ausentes
+            if invalidos.any():
+                logger.warning(
+                    f"{int(invalidos.sum())} datas não puderam ser convertidas "
+                    f"(ex.: {valores[invalidos].head(3).to_list()})"
+                )
+            timestamps[np.isnan(timestamps) | ausentes] = TIMESTAMP_AUSENTE
+            df_processado[campo_data] = timestamps.astype(np.int64)
             
             # Debug após a conversão
             logger.debug("Amostra de datas após conversão:")
@@ -212,142 +442,24 @@ class ProcessadorDados:
             logger.error(f"Erro ao processar datas: {str(e)}")
             return df
 
-    def _calcular_kpis(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calcula KPIs principais do dashboard."""
-        try:
-            total_registros = len(df)
-            
-            if total_registros == 0:
-                return self._get_kpis_vazios()
-
-            # Status
-            status_counts = df['status_atendimento'].value_counts()
-            concluidos = status_counts.get('Concluído', 0)
-            pendentes = status_counts.get('Pendente', 0)
-            
-            # Taxa de conclusão
-            taxa_conclusao = (concluidos / total_registros * 100) if total_registros > 0 else 0
-            
-            # Tempo médio
-            tempo_medio = 0
-            if 'data_hora' in df.columns:
-                tempo_medio = df.groupby('funcionario')['data_hora'].agg(
-                    lambda x: (x.max() - x.min()) / (1000 * 60)  # Convertendo de ms para minutos
-                ).mean()
-
-            return {
-                'total_registros': total_registros,
-                'total_concluidos': int(concluidos),
-                'total_pendentes': int(pendentes),
-                'taxa_conclusao': round(taxa_conclusao, 1),
-                'tempo_medio': round(float(tempo_medio if pd.notnull(tempo_medio) else 0), 1)
-            }
-            
-        except Exception as e:
-            logger.error(f"Erro ao calcular KPIs: {str(e)}")
-            return self._get_kpis_vazios()
+    def gerar_kpis(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Calcula apenas os KPIs do dashboard."""
+        return self.motor.kpis(self.motor.agregar(df, nomes=()))
 
-    def _gerar_dados_graficos(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Gera dados para todos os gráficos do dashboard."""
-        try:
-            graficos = {
-                'status': self._contar_por_coluna(df, 'status_atendimento'),
-                'tipo': self._contar_por_coluna(df, 'tipo_atendimento'),
-                'funcionario': self._contar_por_coluna(df, 'funcionario'),
-                'cliente': self._contar_por_coluna(df, 'cliente'),
-                'sistema': self._contar_por_coluna(df, 'sistema'),
-                'canal': self._contar_por_coluna(df, 'canal_atendimento'),
-                'timeline': self._gerar_timeline(df),
-                'relato': self._contar_por_coluna(df, 'solicitacao_cliente'),
-                'solicitacao': self._contar_por_coluna(df, 'tipo_atendimento'),
-                'relatosDetalhados': self._contar_por_coluna(df, 'solicitacao_cliente')
-            }
-        
-            logger.debug("Dados dos gráficos gerados com sucesso")
-            return graficos
+    def gerar_grafico(self, df: pd.DataFrame, nome: str) -> Dict[str, List]:
+        """
+        Calcula os dados de um único gráfico do dashboard.
         
-        except Exception as e:
-            logger.error(f"Erro ao gerar dados dos gráficos: {str(e)}")
-            return self._get_graficos_vazios()
-
-    def _get_graficos_vazios(self) -> Dict[str, List]:
-        """Retorna estrutura vazia de gráficos."""
-        return {
-            'status': {'labels': [], 'values': []},
-            'tipo': {'labels': [], 'values': []},
-            'funcionario': {'labels': [], 'values': []},
-            'cliente': {'labels': [], 'values': []},
-            'sistema': {'labels': [], 'values': []},
-            'canal': {'labels': [], 'values': []},
-            'timeline': {'labels': [], 'values': []},
-            'relato': {'labels': [], 'values': []},
-            'solicitacao': {'labels': [], 'values': []},
-            'relatosDetalhados': {'labels': [], 'values': []}
-        }
-
-    def _contar_por_coluna(self, df: pd.DataFrame, coluna: str) -> Dict[str, List]:
-        """Conta ocorrências em uma coluna."""
-        try:
-            if coluna not in df.columns:
-                logger.warning(f"Coluna {coluna} não encontrada no DataFrame")
-                return {'labels': [], 'values': []}
-                
-            contagem = df[coluna].value_counts()
-            return {
-                'labels': contagem.index.tolist(),
-                'values': contagem.values.tolist()
-            }
-        except Exception as e:
-            logger.error(f"Erro ao contar valores da coluna {coluna}: {str(e)}")
-            return {'labels': [], 'values': []}
-
-    def _gerar_timeline(self, df: pd.DataFrame) -> Dict[str, List]:
-        """Gera dados para o gráfico de timeline."""
-        try:
-            if 'data_hora' not in df.columns:
-                return {'labels': [], 'values': []}
-                
-            df_timeline = df.copy()
-            df_timeline['data'] = pd.to_datetime(df_timeline['data_hora'], unit='ms').dt.date
-            contagem_diaria = df_timeline.groupby('data').size()
-            
-            return {
-                'labels': [format_timestamp(pd.Timestamp(d).tz_localize(TIMEZONE)) for d in contagem_diaria.index],
-                'values': contagem_diaria.values.tolist()
-            }
-        except Exception as e:
-            logger.error(f"Erro ao gerar timeline: {str(e)}")
-            return {'labels': [], 'values': []}
+        Raises:
+            KeyError: Se o gráfico não existir em GRAFICOS_CONFIGURACAO
+        """
+        return self.motor.grafico(self.motor.agregar(df, nomes=[nome], kpis=False), nome)
 
     def _get_estrutura_vazia(self) -> Dict[str, Any]:
         """Retorna estrutura vazia do dashboard."""
         return {
-            'kpis': self._get_kpis_vazios(),
-            'graficos': self._get_graficos_vazios(),
+            'kpis': kpis_vazios(),
+            'graficos': self.motor.graficos(AgregadosParciais()),
             'registros': [],
             'ultima_atualizacao': format_timestamp(get_current_time())
         }
-
-    def _get_kpis_vazios(self) -> Dict[str, Any]:
-        """Retorna estrutura vazia de KPIs."""
-        return {
-            'total_registros': 0,
-            'total_concluidos': 0,
-            'total_pendentes': 0,
-            'taxa_conclusao': 0.0,
-            'tempo_medio': 0.0
-        }
-
-    def _get_graficos_vazios(self) -> Dict[str, List]:
-        """Retorna estrutura vazia de gráficos."""
-        return {
-            'status': {'labels': [], 'values': []},
-            'tipo': {'labels': [], 'values': []},
-            'funcionario': {'labels': [], 'values': []},
-            'cliente': {'labels': [], 'values': []},
-            'sistema': {'labels': [], 'values': []},
-            'canal': {'labels': [], 'values': []},
-            'timeline': {'labels': [], 'values': []},
-            'relato': {'labels': [], 'values': []},
-            'solicitacao': {'labels': [], 'values': []}
-        }
\ No newline at end of file
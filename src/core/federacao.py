@@ -0,0 +1,175 @@
+"""
+Leitura de várias planilhas e combinação em um único DataFrame
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import pandas as pd
+from . import contexto
+from .data_processor import ProcessadorDados
+from .ingestao import BufferColunas, HashLinhas
+from .logger import log_manager
+
+logger = log_manager.get_logger(__name__)
+
+# Os ids de cada fonte começam em indice_fonte * MULTIPLICADOR_ID, o que os
+# mantém únicos entre planilhas (a primeira fonte conserva o número da linha)
+MULTIPLICADOR_ID = 10_000_000
+
+# Leitor de uma fonte: recebe a configuração ({nome, url, range}) e a versão
+# da última leitura (ou None) e retorna (versão, linhas da planilha com o
+# cabeçalho na primeira). As linhas vêm None quando a versão não mudou e
+# podem vir como um iterável de blocos de linhas (leitura em blocos).
+DadosFonte = Union[List[List], Iterable[List[List]]]
+LeitorFonte = Callable[[Dict[str, str], Optional[str]], Tuple[Optional[str], Optional[DadosFonte]]]
+
+_processador_worker: Optional[ProcessadorDados] = None
+
+def _preparar(processador: ProcessadorDados, dados_brutos: Union[List[List], BufferColunas]) -> pd.DataFrame:
+    if isinstance(dados_brutos, BufferColunas):
+        return processador.preparar_dataframe_colunas(dados_brutos)
+    return processador.preparar_dataframe(dados_brutos)
+
+def _preparar_em_processo(dados_brutos: Union[List[List], BufferColunas]) -> pd.DataFrame:
+    """Executado nos processos de trabalho: converte os dados brutos de uma fonte."""
+    global _processador_worker
+    if _processador_worker is None:
+        _processador_worker = ProcessadorDados()
+    return _preparar(_processador_worker, dados_brutos)
+
+def hash_dados_brutos(dados_brutos: List[List]) -> str:
+    """Hash das linhas lidas de uma planilha, usado para detectar mudanças."""
+    hash_linhas = HashLinhas()
+    hash_linhas.atualizar(dados_brutos)
+    return hash_linhas.hexdigest()
+
+
+class CarregadorFederado:
+    """
+    Lê várias planilhas em paralelo e as combina em um único DataFrame.
+
+    Cada fonte é processada separadamente por `ProcessadorDados` e guardada
+    com o hash dos seus dados brutos e a versão lida; nas leituras seguintes só as planilhas
+    que mudaram são processadas de novo. Fontes cuja versão não mudou nem são
+    lidas (ver `GoogleSheetsClient.ler_planilha_se_alterada`), e se nenhuma
+    mudou `carregar` retorna o mesmo DataFrame da chamada anterior. O
+    resultado ganha a coluna `fonte` (nome da planilha) e ids de registro
+    únicos entre as fontes.
+    """
+
+    def __init__(
+        self,
+        fontes: Sequence[Dict[str, str]],
+        ler_fonte: LeitorFonte,
+        processador: Optional[ProcessadorDados] = None
+    ):
+        """
+        Args:
+            fontes: Planilhas configuradas (ver `get_fontes_planilha`)
+            ler_fonte: Função que lê uma fonte
+            processador: Processador das fontes; com `processos` > 1, as fontes
+                         alteradas são processadas em paralelo no pool de
+                         processos dele
+        """
+        self.fontes = list(fontes)
+        self.ler_fonte = ler_fonte
+        self.processador = processador or ProcessadorDados()
+        self._cache: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        self._versoes: Dict[str, Optional[str]] = {}
+        self._combinado: Optional[pd.DataFrame] = None
+
+    def carregar(self) -> pd.DataFrame:
+        """
+        Lê todas as fontes e retorna o DataFrame combinado, na ordem configurada.
+
+        Se a leitura de uma fonte falhar, usa a última versão processada dela;
+        sem versão anterior, o erro é propagado. Sem alterações em nenhuma
+        fonte, retorna o mesmo objeto da chamada anterior.
+        """
+        brutos = self._ler_fontes()
+
+        alteradas = []
+        for fonte, (versao, dados_brutos) in zip(self.fontes, brutos):
+            if dados_brutos is None:
+                continue
+            if isinstance(dados_brutos, BufferColunas):
+                hash_fonte = dados_brutos.hash_conteudo
+            else:
+                hash_fonte = hash_dados_brutos(dados_brutos)
+            em_cache = self._cache.get(fonte['nome'])
+            if em_cache is None or em_cache[0] != hash_fonte:
+                alteradas.append((fonte, dados_brutos, hash_fonte))
+            else:
+                self._versoes[fonte['nome']] = versao
+
+        if alteradas:
+            logger.debug(f"Processando fontes alteradas: {', '.join(f['nome'] for f, _, _ in alteradas)}")
+            processados = self._processar([dados_brutos for _, dados_brutos, _ in alteradas])
+            contexto.anotar(fontes_alteradas=[fonte['nome'] for fonte, _, _ in alteradas])
+            contexto.somar('linhas_processadas', sum(len(df) for df in processados))
+            for (fonte, _, hash_fonte), df in zip(alteradas, processados):
+                indice = self.fontes.index(fonte)
+                self._cache[fonte['nome']] = (hash_fonte, self._marcar_fonte(df, indice, fonte['nome']))
+                # Só agora a versão conta como lida: se o processamento falhar,
+                # a próxima leitura não é dispensada pela versão
+                self._versoes[fonte['nome']] = brutos[indice][0]
+        elif self._combinado is not None:
+            return self._combinado
+
+        partes = [self._cache[fonte['nome']][1] for fonte in self.fontes]
+        partes = [df for df in partes if not df.empty]
+        self._combinado = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+        return self._combinado
+
+    def _ler_fontes(self) -> List[Tuple[Optional[str], Optional[Union[List[List], BufferColunas]]]]:
+        """
+        Lê as fontes em paralelo.
+
+        Fontes lidas em blocos são consumidas aqui, na thread de leitura,
+        direto para um `BufferColunas`.
+
+        Returns:
+            Tupla (versão, dados brutos) por fonte; dados None indicam que a
+            versão em cache da fonte continua valendo (não mudou ou a leitura
+            falhou)
+        """
+        def ler(fonte):
+            nome = fonte['nome']
+            versao_conhecida = self._versoes.get(nome) if nome in self._cache else None
+            try:
+                versao, dados_brutos = self.ler_fonte(fonte, versao_conhecida)
+                if dados_brutos is not None and not isinstance(dados_brutos, list):
+                    dados_brutos = BufferColunas.de_blocos(dados_brutos, self.processador.mapeamento_colunas)
+            except Exception as e:
+                if nome not in self._cache:
+                    raise
+                logger.error(f"Erro ao ler a fonte {nome}, mantendo a última versão: {str(e)}")
+                return versao_conhecida, None
+            if dados_brutos is None and nome not in self._cache:
+                raise ValueError(f"A fonte {nome} não retornou dados")
+            if isinstance(dados_brutos, BufferColunas):
+                contexto.somar('linhas_lidas', dados_brutos.total_linhas)
+            elif dados_brutos:
+                contexto.somar('linhas_lidas', len(dados_brutos) - 1)  # sem o cabeçalho
+            return versao, dados_brutos
+
+        if len(self.fontes) == 1:
+            return [ler(self.fontes[0])]
+        with ThreadPoolExecutor(max_workers=len(self.fontes), thread_name_prefix="fonte") as executor:
+            # As threads de leitura registram no contexto da requisição que as disparou
+            return list(executor.map(contexto.propagar(ler), self.fontes))
+
+    def _processar(self, lista_brutos: List[Union[List[List], BufferColunas]]) -> List[pd.DataFrame]:
+        """Converte os dados brutos de cada fonte, em processos separados se configurado."""
+        if self.processador.processos <= 1 or len(lista_brutos) < 2:
+            return [_preparar(self.processador, dados_brutos) for dados_brutos in lista_brutos]
+        return self.processador.get_paralelo().mapear(_preparar_em_processo, lista_brutos)
+
+    @staticmethod
+    def _marcar_fonte(df: pd.DataFrame, indice: int, nome: str) -> pd.DataFrame:
+        """Acrescenta a coluna `fonte` e desloca os ids para a faixa da fonte."""
+        if df.empty:
+            return df
+        df = df.copy()
+        df['fonte'] = nome
+        df['id_registro'] = df['id_registro'] + indice * MULTIPLICADOR_ID
+        return df
@@ -0,0 +1,166 @@
+"""
+Ingestão da planilha em blocos de linhas, direto para buffers por coluna
+"""
+from typing import Dict, Iterable, Iterator, List, Optional
+import hashlib
+import itertools
+import re
+import numpy as np
+import pandas as pd
+
+# "'Aba'!A1:Z1000", "Aba!A:Z" ou "A2:F" (linhas omitidas vão até o fim)
+PADRAO_RANGE = re.compile(
+    r"^(?:(?P<aba>'(?:[^']|'')*'|[^!']+)!)?"
+    r"(?P<coluna_inicial>[A-Z]+)(?P<linha_inicial>\d+)?:(?P<coluna_final>[A-Z]+)(?P<linha_final>\d+)?$",
+    re.IGNORECASE
+)
+
+# Colunas lidas quando o range não é informado; as linhas vão até o fim da aba
+COLUNAS_PADRAO = ('A', 'Z')
+
+def range_aba(titulo: str) -> str:
+    """Range aberto (todas as linhas) das colunas padrão de uma aba: "'Aba'!A:Z"."""
+    inicial, final = COLUNAS_PADRAO
+    return "'{}'!{}:{}".format(titulo.replace("'", "''"), inicial, final)
+
+def intervalos_blocos(range_name: str, linhas_por_bloco: int) -> Iterator[str]:
+    """
+    Divide um range A1 em ranges consecutivos de até `linhas_por_bloco` linhas.
+
+    Sem linha final ("'Aba'!A:Z"), gera blocos indefinidamente; cabe a quem
+    lê parar no primeiro bloco incompleto.
+
+    Raises:
+        ValueError: Se o range não estiver na notação A1 com colunas
+    """
+    partes = PADRAO_RANGE.match(range_name.strip())
+    if partes is None or linhas_por_bloco < 1:
+        raise ValueError(f"Range inválido para leitura em blocos: {range_name}")
+
+    prefixo = f"{partes['aba']}!" if partes['aba'] else ''
+    inicio = int(partes['linha_inicial'] or 1)
+    fim = int(partes['linha_final']) if partes['linha_final'] else None
+    while fim is None or inicio <= fim:
+        ultima = inicio + linhas_por_bloco - 1
+        if fim is not None:
+            ultima = min(ultima, fim)
+        yield f"{prefixo}{partes['coluna_inicial']}{inicio}:{partes['coluna_final']}{ultima}"
+        inicio = ultima + 1
+
+
+class HashLinhas:
+    """
+    Hash incremental de linhas da planilha (listas de células).
+
+    As células de cada bloco são concatenadas em uma única str, sem
+    serializar as linhas em JSON; os tamanhos das linhas e das células vão
+    para digests separados, o que mantém o hash inequívoco e independente de
+    como as linhas foram divididas em blocos.
+    """
+
+    def __init__(self):
+        self._linhas = hashlib.blake2b(digest_size=16)
+        self._celulas = hashlib.blake2b(digest_size=16)
+        self._texto = hashlib.blake2b(digest_size=16)
+
+    def atualizar(self, linhas: List[List]) -> None:
+        """Acrescenta um bloco de linhas."""
+        celulas = list(itertools.chain.from_iterable(linhas))
+        try:
+            texto = ''.join(celulas)
+        except TypeError:
+            # Valores não textuais (ex.: leitura não formatada) com marcador próprio
+            celulas = [celula if isinstance(celula, str) else '\x00' + repr(celula) for celula in celulas]
+            texto = ''.join(celulas)
+        self._linhas.update(np.fromiter(map(len, linhas), dtype=np.int64, count=len(linhas)).tobytes())
+        self._celulas.update(np.fromiter(map(len, celulas), dtype=np.int64, count=len(celulas)).tobytes())
+        self._texto.update(texto.encode('utf-8', 'surrogatepass'))
+
+    def hexdigest(self) -> str:
+        final = hashlib.blake2b(digest_size=16)
+        for parcial in (self._linhas, self._celulas, self._texto):
+            final.update(parcial.digest())
+        return final.hexdigest()
+
+
+class BufferColunas:
+    """
+    Acumula blocos de linhas da planilha em uma lista por coluna.
+
+    A primeira linha do primeiro bloco é o cabeçalho; as colunas já ficam com
+    os nomes internos (`mapeamento`). Cada bloco pode ser descartado assim que
+    adicionado, e `finalizar` monta o DataFrame uma única vez, sem a cópia
+    intermediária de `pd.DataFrame(lista_de_linhas)` seguida de `rename`.
+
+    O buffer também calcula, bloco a bloco, o mesmo hash que
+    `hash_dados_brutos` daria para a lista completa de linhas.
+    """
+
+    def __init__(self, mapeamento: Optional[Dict[str, str]] = None):
+        self.mapeamento = mapeamento or {}
+        self.cabecalho: Optional[List[str]] = None
+        self.colunas: List[List] = []
+        self.total_linhas = 0
+        self._hash = HashLinhas()
+
+    @classmethod
+    def de_blocos(cls, blocos: Iterable[List[List]], mapeamento: Optional[Dict[str, str]] = None) -> "BufferColunas":
+        """Consome todos os blocos de um iterador."""
+        buffer = cls(mapeamento)
+        for bloco in blocos:
+            buffer.adicionar(bloco)
+        return buffer
+
+    def adicionar(self, linhas: List[List]) -> None:
+        """Acrescenta um bloco de linhas (o primeiro começa pelo cabeçalho)."""
+        if not linhas:
+            return
+
+        self._hash.atualizar(linhas)
+
+        if self.cabecalho is None:
+            self.cabecalho = list(linhas[0])
+            self.colunas = [[] for _ in self.cabecalho]
+            linhas = linhas[1:]
+
+        largura = len(self.colunas)
+        for linha in linhas:
+            # A API omite as células vazias no fim da linha
+            for indice in range(largura):
+                self.colunas[indice].append(linha[indice] if indice < len(linha) else None)
+        self.total_linhas += len(linhas)
+
+    def __getstate__(self):
+        # Objetos hashlib não são serializáveis; ao enviar o buffer para
+        # outro processo só as colunas interessam
+        estado = self.__dict__.copy()
+        estado['_hash'] = None
+        return estado
+
+    @property
+    def hash_conteudo(self) -> str:
+        """Hash das linhas adicionadas, igual ao de `hash_dados_brutos`."""
+        return self._hash.hexdigest()
+
+    def finalizar(self) -> pd.DataFrame:
+        """
+        Monta o DataFrame com as colunas renomeadas e esvazia o buffer.
+
+        Cada coluna vira um array de objetos e a lista correspondente é
+        liberada em seguida, de modo que o pico de memória fica próximo do
+        tamanho final do DataFrame.
+        """
+        if self.cabecalho is None:
+            return pd.DataFrame()
+
+        dados = {}
+        for nome, coluna in zip(self.cabecalho, self.colunas):
+            valores = np.empty(len(coluna), dtype=object)
+            valores[:] = coluna
+            coluna.clear()
+            nome = self.mapeamento.get(nome, nome)
+            if nome in dados:
+                raise ValueError(f"Coluna repetida no cabeçalho da planilha: {nome}")
+            dados[nome] = valores
+        self.colunas = []
+        return pd.DataFrame(dados, copy=False)
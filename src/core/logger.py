@@ -1,50 +1,245 @@
 """
 Sistema centralizado de logs para o projeto
+
+As threads das requisições apenas enfileiram os registros (HandlerFila, na
+raiz); uma única thread (QueueListener) formata e escreve no arquivo e no
+console. A fila é limitada: cheia, descarta registros abaixo de WARNING de
+imediato e, os demais, após uma espera curta, contando os descartes. Na
+saída do processo a fila é esvaziada antes de fechar os arquivos.
+
+A fila e os arquivos só existem depois de `log_manager.iniciar()`, chamado
+por `setup_logging()` (create_app). Até lá, importar os módulos não abre
+arquivos nem inicia threads: os registros de WARNING ou acima ficam em um
+buffer limitado (HandlerEspera) e são escritos quando o log é iniciado.
+
+Processos de trabalho não escrevem nos arquivos: iniciados com
+`configurar_processo`, enviam seus registros por uma fila entre processos
+(`LoggerManager.fila_processos`) ao processo principal.
+
+Cada registro leva o id da requisição em andamento (src/core/contexto.py).
+Com LOG_FORMAT=json, arquivo e console recebem um objeto JSON por linha; o
+registro de resumo de cada requisição traz o campo `resumo`.
 """
+import atexit
+import json
 import logging
 import logging.handlers
-import os
+import multiprocessing
+import queue
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+from ..config.campos_config import GOOGLE_SHEETS_CONFIG
+from . import contexto
+from .metricas import metricas
+
+# Espera máxima (s) por espaço na fila para registros WARNING ou acima
+ESPERA_ALERTAS = 0.05
+
+# Registros guardados até o log ser iniciado (os mais antigos são descartados)
+LIMITE_ESPERA = 1000
+
+
+class HandlerEspera(logging.Handler):
+    """Guarda os últimos registros até `LoggerManager.iniciar` instalar a fila."""
+
+    def __init__(self, limite: int = LIMITE_ESPERA):
+        super().__init__()
+        self.registros = deque(maxlen=limite)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record.id_requisicao = contexto.id_requisicao() or '-'
+        self.registros.append(record)
+
+
+class HandlerFila(logging.handlers.QueueHandler):
+    """QueueHandler com fila limitada e política de descarte."""
+
+    def __init__(self, fila: queue.Queue, espera_alertas: float = ESPERA_ALERTAS):
+        super().__init__(fila)
+        self.espera_alertas = espera_alertas
+        self.descartados = metricas.contador(
+            'dashboard_logs_descartados_total', 'Registros de log descartados com a fila cheia, por nível'
+        )
+        self._pendentes = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Mesmo processo: o registro segue inteiro e a formatação (inclusive
+        # do traceback) fica com a thread de escrita. O id da requisição é
+        # lido aqui, na thread que registrou, exceto nos registros guardados
+        # antes do início do log, que já o trazem
+        if getattr(record, 'id_requisicao', None) is None:
+            record.id_requisicao = contexto.id_requisicao() or '-'
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING or not self._aguardar(record):
+                self.descartados.inc(nivel=record.levelname)
+                with self._lock:
+                    self._pendentes += 1
+                return
+
+        if self._pendentes:
+            self._avisar_descartes()
+
+    def _aguardar(self, record: logging.LogRecord) -> bool:
+        try:
+            self.queue.put(record, timeout=self.espera_alertas)
+            return True
+        except queue.Full:
+            return False
+
+    def _avisar_descartes(self, bloquear: bool = False) -> None:
+        """Enfileira um aviso com a quantidade de registros descartados."""
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, 0
+        aviso = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"{pendentes} registros de log descartados (fila cheia)", None, None
+        )
+        try:
+            self.queue.put(aviso, block=bloquear)
+        except queue.Full:
+            with self._lock:
+                self._pendentes += pendentes
+
+
+class HandlerProcesso(logging.handlers.QueueHandler):
+    """Envia os registros de um processo de trabalho ao processo principal."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Outro processo: a mensagem e o traceback seguem já formatados
+        record.id_requisicao = contexto.id_requisicao() or '-'
+        return super().prepare(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Fila cheia: o processo de trabalho não espera pelo log
+
+
+class HandlerRepasse(logging.Handler):
+    """Entrega os registros vindos dos processos de trabalho aos loggers locais."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+        return True
+
+
+def configurar_processo(fila, nivel: int) -> None:
+    """
+    Inicializador dos processos de trabalho (ProcessPoolExecutor).
+
+    Substitui os handlers da raiz por um que envia os registros para a fila
+    do processo principal, de modo que só ele escreve nos arquivos de log.
+
+    Args:
+        fila: Fila retornada por `LoggerManager.fila_processos`
+        nivel: Nível mínimo dos registros enviados
+    """
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    raiz.addHandler(HandlerProcesso(fila))
+    raiz.setLevel(nivel)
+
+
+class FiltroContexto(logging.Filter):
+    """Preenche `id_requisicao` nos registros que chegam sem ele."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'id_requisicao', None) is None:
+            record.id_requisicao = contexto.id_requisicao() or '-'
+        return True
+
+
+class FormatadorTexto(logging.Formatter):
+    """Formato de texto; o resumo da requisição, se houver, segue em JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        mensagem = super().format(record)
+        resumo = getattr(record, 'resumo', None)
+        if resumo:
+            mensagem += ' ' + json.dumps(resumo, ensure_ascii=False, separators=(',', ':'), default=str)
+        return mensagem
+
+
+class FormatadorJSON(logging.Formatter):
+    """Um objeto JSON por registro, com o traceback em um único campo."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            'momento': datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensagem': record.getMessage(),
+            'id_requisicao': getattr(record, 'id_requisicao', '-'),
+            'modulo': record.module,
+            'funcao': record.funcName,
+            'linha': record.lineno,
+            'thread': record.threadName
+        }
+        resumo = getattr(record, 'resumo', None)
+        if resumo:
+            dados['resumo'] = resumo
+        if record.exc_info:
+            dados['excecao'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            dados['excecao'] = record.exc_text
+        if record.stack_info:
+            dados['pilha'] = self.formatStack(record.stack_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class OuvinteFila(logging.handlers.QueueListener):
+    """QueueListener cuja parada espera espaço na fila para o sentinela."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
 
 class LoggerManager:
     def __init__(self):
-        self.log_dir = Path(__file__).resolve().parent.parent.parent / 'logs'
-        self.log_dir.mkdir(exist_ok=True)
+        # Diretório e arquivos de log, definidos em `iniciar`
+        self.log_dir = None
+        self.app_log = None
+        self.api_log = None
         
-        # Arquivos de log
-        self.app_log = self.log_dir / f'app_{datetime.now():%Y%m}.log'
-        self.api_log = self.log_dir / f'api_{datetime.now():%Y%m}.log'
+        # Formatos de log: JSON (LOG_FORMAT=json) ou texto detalhado
+        self.json = GOOGLE_SHEETS_CONFIG["log_format"] == 'json'
+        if self.json:
+            self.file_format = self.console_format = FormatadorJSON()
+        else:
+            self.file_format = FormatadorTexto(
+                '[%(asctime)s] %(levelname)-8s [%(id_requisicao)s] [%(name)s:%(funcName)s:%(lineno)d] %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
+            self.console_format = FormatadorTexto(
+                '[%(asctime)s] %(levelname)-8s [%(id_requisicao)s] [%(name)s] %(message)s',
+                datefmt='%H:%M:%S'
+            )
         
-        # Formatos de log detalhados
-        self.file_format = logging.Formatter(
-            '[%(asctime)s] %(levelname)-8s [%(name)s:%(funcName)s:%(lineno)d] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.console_format = logging.Formatter(
-            '[%(asctime)s] %(levelname)-8s [%(name)s] %(message)s',
-            datefmt='%H:%M:%S'
-        )
+        self.fila = None
+        self.handler = None
+        self.ouvinte = None
+        self._fila_processos = None
+        self._ouvinte_processos = None
+        self._lock = threading.Lock()
         
-        # Configuração global
-        logging.getLogger().setLevel(logging.DEBUG)
+        # Até `iniciar`, os registros ficam guardados (raiz em WARNING, o padrão)
+        self.espera = HandlerEspera()
+        logging.getLogger().addHandler(self.espera)
 
-    def get_logger(self, name: str) -> logging.Logger:
-        """
-        Retorna um logger configurado para o módulo especificado.
-        
-        Args:
-            name: Nome do módulo/logger
-            
-        Returns:
-            Logger configurado com handlers de arquivo e console
-        """
-        logger = logging.getLogger(name)
-        
-        # Evita duplicação de handlers
-        if logger.handlers:
-            return logger
-            
+    def _criar_handlers(self):
+        """Handlers de arquivo e console, usados apenas pela thread de escrita."""
         # Handler de arquivo com rotação
         file_handler = logging.handlers.RotatingFileHandler(
             self.app_log,
@@ -55,28 +250,106 @@ class LoggerManager:
         file_handler.setFormatter(self.file_format)
         file_handler.setLevel(logging.DEBUG)
         
-        # Handler específico para API
-        if name.startswith('api'):
-            api_handler = logging.handlers.RotatingFileHandler(
-                self.api_log,
-                maxBytes=5 * 1024 * 1024,
-                backupCount=5,
-                encoding='utf-8'
-            )
-            api_handler.setFormatter(self.file_format)
-            api_handler.setLevel(logging.DEBUG)
-            logger.addHandler(api_handler)
+        # Handler específico para API (loggers 'api*')
+        api_handler = logging.handlers.RotatingFileHandler(
+            self.api_log,
+            maxBytes=5 * 1024 * 1024,
+            backupCount=5,
+            encoding='utf-8',
+            delay=True
+        )
+        api_handler.setFormatter(self.file_format)
+        api_handler.setLevel(logging.DEBUG)
+        api_handler.addFilter(lambda record: record.name.startswith('api'))
         
-        # Handler de console com cores
-        console_handler = ColoredConsoleHandler()
+        # Handler de console com cores (sem cores em JSON, para não quebrar as linhas)
+        console_handler = logging.StreamHandler() if self.json else ColoredConsoleHandler()
         console_handler.setFormatter(self.console_format)
         console_handler.setLevel(logging.INFO)
         
-        # Adiciona handlers
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # Registros que não passaram pelos handlers de fila (ex.: emitidos
+        # direto nestes handlers) recebem o id aqui
+        for handler in (file_handler, api_handler, console_handler):
+            handler.addFilter(FiltroContexto())
+
+        return file_handler, api_handler, console_handler
+
+    def iniciar(self, diretorio) -> None:
+        """
+        Instala o handler da fila na raiz e inicia a thread de escrita.
+        
+        Chamadas repetidas não têm efeito; a fila é esvaziada na saída do
+        processo (atexit).
+
+        Args:
+            diretorio: Diretório dos arquivos de log (LOG_DIR)
+        """
+        with self._lock:
+            if self.ouvinte is not None:
+                return
+            self.log_dir = Path(diretorio)
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self.app_log = self.log_dir / f'app_{datetime.now():%Y%m}.log'
+            self.api_log = self.log_dir / f'api_{datetime.now():%Y%m}.log'
+            self.fila = queue.Queue(maxsize=max(1, GOOGLE_SHEETS_CONFIG["log_queue_size"]))
+            self.handler = HandlerFila(self.fila)
+            self.ouvinte = OuvinteFila(self.fila, *self._criar_handlers(), respect_handler_level=True)
+            self.ouvinte.start()
+            raiz = logging.getLogger()
+            raiz.setLevel(logging.DEBUG)
+            raiz.removeHandler(self.espera)
+            while self.espera.registros:
+                self.handler.handle(self.espera.registros.popleft())
+            raiz.addHandler(self.handler)
+            atexit.register(self.parar)
+
+    def fila_processos(self):
+        """
+        Fila pela qual os processos de trabalho enviam seus registros.
+
+        Criada na primeira chamada, com uma thread que os repassa aos
+        loggers deste processo (e, por eles, à fila de escrita).
+        """
+        with self._lock:
+            if self._fila_processos is None:
+                self._fila_processos = multiprocessing.get_context('spawn').Queue(
+                    maxsize=max(1, GOOGLE_SHEETS_CONFIG["log_queue_size"])
+                )
+                self._ouvinte_processos = logging.handlers.QueueListener(self._fila_processos, HandlerRepasse())
+                self._ouvinte_processos.start()
+            return self._fila_processos
+
+    def parar(self) -> None:
+        """Escreve os registros ainda na fila e fecha os arquivos."""
+        with self._lock:
+            if self._ouvinte_processos is not None:
+                self._ouvinte_processos.stop()
+                self._ouvinte_processos = None
+                self._fila_processos = None
+            if self.ouvinte is None:
+                return
+            logging.getLogger().removeHandler(self.handler)
+            if self.handler._pendentes:
+                self.handler._avisar_descartes(bloquear=True)
+            self.ouvinte.stop()
+            for handler in self.ouvinte.handlers:
+                handler.close()
+            self.ouvinte = None
+
+    def get_logger(self, name: str) -> logging.Logger:
+        """
+        Retorna um logger configurado para o módulo especificado.
+        
+        Não inicia o log (ver `iniciar`): antes disso, os registros ficam
+        guardados em memória.
         
-        return logger
+        Args:
+            name: Nome do módulo/logger
+            
+        Returns:
+            Logger cujos registros seguem, pela raiz, para a fila de escrita
+        """
+        return logging.getLogger(name)
 
 class ColoredConsoleHandler(logging.StreamHandler):
     """Handler personalizado para console com cores"""
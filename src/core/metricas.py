@@ -0,0 +1,244 @@
+"""
+Métricas do pipeline do dashboard (tempos por etapa, contadores e medidores)
+no formato de texto do Prometheus
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import functools
+import math
+import threading
+import time
+from . import contexto
+
+# Limites (em segundos) dos buckets dos histogramas de duração
+BUCKETS_DURACAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Limites (em bytes) dos buckets do histograma de tamanho das respostas
+BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+def _rotulos(rotulos: Dict[str, object]) -> Rotulos:
+    return tuple(sorted((nome, str(valor)) for nome, valor in rotulos.items()))
+
+def _formatar_rotulos(rotulos: Rotulos, extra: Optional[Tuple[str, str]] = None) -> str:
+    pares = list(rotulos) + ([extra] if extra else [])
+    if not pares:
+        return ''
+    escapar = lambda valor: valor.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+    return '{' + ','.join(f'{nome}="{escapar(valor)}"' for nome, valor in pares) + '}'
+
+def _formatar_valor(valor: float) -> str:
+    if math.isinf(valor):
+        return '+Inf' if valor > 0 else '-Inf'
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+class _Metrica:
+    tipo = ''
+
+    def __init__(self, nome: str, descricao: str):
+        self.nome = nome
+        self.descricao = descricao
+        self._lock = threading.Lock()
+
+    def linhas(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} {self.tipo}"] + self._amostras()
+
+    def _amostras(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Contador(_Metrica):
+    """Valor que só cresce (ex.: linhas processadas, bytes enviados)."""
+    tipo = 'counter'
+
+    def __init__(self, nome: str, descricao: str):
+        super().__init__(nome, descricao)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def inc(self, valor: float = 1, **rotulos) -> None:
+        chave = _rotulos(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos) -> float:
+        return self._valores.get(_rotulos(rotulos), 0)
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            valores = sorted(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(r)} {_formatar_valor(v)}" for r, v in valores]
+
+
+class Medidor(_Metrica):
+    """Valor atual, que pode subir ou descer (ex.: linhas do snapshot)."""
+    tipo = 'gauge'
+
+    def __init__(self, nome: str, descricao: str, calcular: Optional[Callable[[], Dict[Rotulos, float]]] = None):
+        """
+        Args:
+            calcular: Função chamada a cada exportação que retorna os valores
+                      por rótulos (em vez de `definir`)
+        """
+        super().__init__(nome, descricao)
+        self._valores: Dict[Rotulos, float] = {}
+        self._calcular = calcular
+
+    def definir(self, valor: float, **rotulos) -> None:
+        with self._lock:
+            self._valores[_rotulos(rotulos)] = valor
+
+    def _amostras(self) -> List[str]:
+        if self._calcular is not None:
+            valores = sorted(self._calcular().items())
+        else:
+            with self._lock:
+                valores = sorted(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(r)} {_formatar_valor(v)}" for r, v in valores]
+
+
+class Histograma(_Metrica):
+    """Distribuição de observações em buckets cumulativos (ex.: durações)."""
+    tipo = 'histogram'
+
+    def __init__(self, nome: str, descricao: str, buckets: Sequence[float] = BUCKETS_DURACAO):
+        super().__init__(nome, descricao)
+        self.buckets = tuple(sorted(buckets))
+        # Por rótulos: [contagem por bucket (+Inf no fim), soma]
+        self._series: Dict[Rotulos, list] = {}
+
+    def observar(self, valor: float, **rotulos) -> None:
+        chave = _rotulos(rotulos)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def contagem(self, **rotulos) -> int:
+        serie = self._series.get(_rotulos(rotulos))
+        return sum(serie[0]) if serie else 0
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            series = sorted((r, (list(contagens), soma)) for r, (contagens, soma) in self._series.items())
+        linhas = []
+        for rotulos, (contagens, soma) in series:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (math.inf,), contagens):
+                acumulado += contagem
+                le = ('le', _formatar_valor(limite))
+                linhas.append(f"{self.nome}_bucket{_formatar_rotulos(rotulos, le)} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_formatar_rotulos(rotulos)} {_formatar_valor(soma)}")
+            linhas.append(f"{self.nome}_count{_formatar_rotulos(rotulos)} {acumulado}")
+        return linhas
+
+
+class RegistroMetricas:
+    """
+    Métricas do processo, exportadas em `/metrics`.
+
+    As etapas do pipeline são medidas com `medir` (gerenciador de contexto)
+    ou `@cronometrar` (decorador), que alimentam o histograma
+    `dashboard_etapa_duracao_segundos` com o rótulo `etapa`.
+    """
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+
+        self.duracao_etapas = self.histograma(
+            'dashboard_etapa_duracao_segundos',
+            'Duração de cada etapa da leitura e do processamento da planilha'
+        )
+        self.linhas_processadas = self.contador(
+            'dashboard_linhas_processadas_total', 'Linhas da planilha convertidas em registros'
+        )
+        self.linhas_snapshot = self.medidor(
+            'dashboard_snapshot_linhas', 'Registros no snapshot publicado'
+        )
+        self.versao_snapshot = self.medidor(
+            'dashboard_snapshot_versao', 'Número sequencial do snapshot publicado'
+        )
+        self.bytes_resposta = self.histograma(
+            'dashboard_resposta_bytes', 'Tamanho do corpo enviado por rota e codificação', BUCKETS_BYTES
+        )
+        self.cache = self.contador(
+            'dashboard_cache_consultas_total', 'Consultas aos caches do snapshot por resultado (acerto/falha)'
+        )
+        self.medidor(
+            'dashboard_cache_taxa_acerto', 'Fração de acertos de cada cache desde o início do processo',
+            calcular=self._taxas_acerto
+        )
+
+    def _registrar(self, metrica: _Metrica) -> _Metrica:
+        with self._lock:
+            return self._metricas.setdefault(metrica.nome, metrica)
+
+    def contador(self, nome: str, descricao: str) -> Contador:
+        return self._registrar(Contador(nome, descricao))
+
+    def medidor(self, nome: str, descricao: str, calcular=None) -> Medidor:
+        return self._registrar(Medidor(nome, descricao, calcular))
+
+    def histograma(self, nome: str, descricao: str, buckets: Sequence[float] = BUCKETS_DURACAO) -> Histograma:
+        return self._registrar(Histograma(nome, descricao, buckets))
+
+    @contextmanager
+    def medir(self, etapa: str) -> Iterator[None]:
+        """
+        Mede a duração do bloco (inclusive quando ele lança exceção).
+
+        A duração também é somada ao resumo da requisição em andamento.
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.duracao_etapas.observar(duracao, etapa=etapa)
+            contexto.registrar_etapa(etapa, duracao)
+
+    def cronometrar(self, etapa: str):
+        """Decorador equivalente a `medir` em torno da função."""
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def envoltorio(*args, **kwargs):
+                with self.medir(etapa):
+                    return funcao(*args, **kwargs)
+            return envoltorio
+        return decorador
+
+    def registrar_cache(self, cache: str, acerto: bool) -> None:
+        self.cache.inc(cache=cache, resultado='acerto' if acerto else 'falha')
+        contexto.registrar_cache(cache, acerto)
+
+    def _taxas_acerto(self) -> Dict[Rotulos, float]:
+        totais: Dict[str, List[float]] = {}
+        for rotulos, valor in list(self.cache._valores.items()):
+            dados = dict(rotulos)
+            par = totais.setdefault(dados['cache'], [0, 0])
+            par[0 if dados['resultado'] == 'acerto' else 1] += valor
+        return {
+            (('cache', cache),): acertos / (acertos + falhas)
+            for cache, (acertos, falhas) in totais.items() if acertos + falhas
+        }
+
+    def exportar(self) -> str:
+        """Todas as métricas no formato de texto do Prometheus (versão 0.0.4)."""
+        with self._lock:
+            metricas = list(self._metricas.values())
+        linhas = []
+        for metrica in metricas:
+            linhas.extend(metrica.linhas())
+        return '\n'.join(linhas) + '\n'
+
+
+# Instância global, compartilhada pelos módulos do processo
+metricas = RegistroMetricas()
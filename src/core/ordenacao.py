@@ -0,0 +1,163 @@
+"""
+Ordenação server-side dos registros de um snapshot
+"""
+from typing import Any, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Especificação de ordenação: sequência de (campo, decrescente)
+EspecOrdenacao = Tuple[Tuple[str, bool], ...]
+
+def parse_ordenacao(sort: str) -> EspecOrdenacao:
+    """
+    Converte o parâmetro `sort` da API em uma especificação de ordenação.
+
+    Args:
+        sort: Campos separados por vírgula; prefixo '-' indica ordem decrescente
+              (ex.: 'cliente,-data_hora')
+
+    Raises:
+        ValueError: Se nenhum campo for informado ou houver campo repetido
+    """
+    espec = []
+    for parte in (sort or '').split(','):
+        parte = parte.strip()
+        if not parte:
+            continue
+        decrescente = parte.startswith('-')
+        espec.append((parte.lstrip('+-'), decrescente))
+
+    if not espec:
+        raise ValueError("Nenhum campo de ordenação informado")
+
+    campos = [campo for campo, _ in espec]
+    if len(set(campos)) != len(campos):
+        raise ValueError(f"Campo de ordenação repetido: {sort}")
+
+    return tuple(espec)
+
+def format_ordenacao(espec: EspecOrdenacao) -> str:
+    """Converte uma especificação de ordenação de volta ao formato da API."""
+    return ','.join(f"-{campo}" if decrescente else campo for campo, decrescente in espec)
+
+def _valores_ordenaveis(serie: pd.Series) -> np.ndarray:
+    """Converte a coluna em um array com tipo único, comparável elemento a elemento."""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.to_numpy()
+    return serie.astype(str).to_numpy(dtype=object)
+
+def _valor_nativo(valor: Any) -> Any:
+    """Converte escalares NumPy em tipos nativos (serializáveis em JSON)."""
+    return valor.item() if hasattr(valor, 'item') else valor
+
+
+class IndiceColuna:
+    """
+    Permutação `argsort` e ranks densos de uma coluna.
+
+    O rank de cada linha é a posição do seu valor entre os valores distintos
+    da coluna, o que permite combinar colunas de tipos diferentes (e em
+    direções diferentes) com um `lexsort` sobre inteiros.
+    """
+
+    def __init__(self, serie: pd.Series):
+        self.valores = _valores_ordenaveis(serie)
+        self.permutacao = np.argsort(self.valores, kind='stable')
+
+        ordenados = self.valores[self.permutacao]
+        novo_valor = np.ones(len(ordenados), dtype=bool)
+        if len(ordenados) > 1:
+            novo_valor[1:] = ordenados[1:] != ordenados[:-1]
+
+        self.valores_unicos = ordenados[novo_valor]
+        self.rank = np.empty(len(ordenados), dtype=np.int64)
+        self.rank[self.permutacao] = np.cumsum(novo_valor) - 1
+
+    def rank_de(self, valor: Any) -> float:
+        """
+        Rank de um valor arbitrário na coluna.
+
+        Valores ausentes recebem um rank fracionário entre os vizinhos, o que
+        mantém a posição correta de um cursor cujo registro não existe mais.
+
+        Raises:
+            ValueError: Se o valor não for comparável com os da coluna
+        """
+        try:
+            posicao = int(np.searchsorted(self.valores_unicos, valor, side='left'))
+            encontrado = posicao < len(self.valores_unicos) and self.valores_unicos[posicao] == valor
+        except TypeError as e:
+            raise ValueError(f"Valor incompatível com o campo de ordenação: {valor!r}") from e
+        return float(posicao) if encontrado else posicao - 0.5
+
+
+class Ordenacao:
+    """Ordem dos registros de um snapshot segundo uma especificação de ordenação."""
+
+    def __init__(self, espec: EspecOrdenacao, indices: Sequence[IndiceColuna], ids: np.ndarray):
+        """
+        Args:
+            espec: Especificação de ordenação
+            indices: Índice de cada campo da especificação, na mesma ordem
+            ids: Ids dos registros (critério final de desempate, crescente)
+        """
+        self.espec = espec
+        self.sort = format_ordenacao(espec)
+        self._indices = list(indices)
+
+        chaves = [
+            -indice.rank if decrescente else indice.rank
+            for indice, (_, decrescente) in zip(self._indices, espec)
+        ]
+
+        if len(espec) == 1 and not espec[0][1] and _crescente(ids):
+            # Os ids acompanham a ordem das linhas, então o argsort estável da
+            # coluna já é a ordem final
+            self.permutacao = self._indices[0].permutacao
+        else:
+            self.permutacao = np.lexsort([ids] + chaves[::-1])
+
+        self._chaves_ordenadas = [chave[self.permutacao] for chave in chaves]
+        self.ids_ordenados = ids[self.permutacao]
+
+    def __len__(self) -> int:
+        return len(self.permutacao)
+
+    def valores_em(self, posicao: int) -> List[Any]:
+        """Valores originais dos campos de ordenação na posição ordenada informada."""
+        linha = self.permutacao[posicao]
+        return [_valor_nativo(indice.valores[linha]) for indice in self._indices]
+
+    def posicao(self, valores: Sequence[Any], id_registro: int, lado: str = 'left') -> int:
+        """
+        Localiza (valores, id) na ordem por busca binária.
+
+        Args:
+            valores: Valores dos campos de ordenação
+            id_registro: Id do registro
+            lado: 'left' retorna a posição do próprio registro; 'right', a seguinte
+
+        Raises:
+            ValueError: Se a quantidade ou o tipo dos valores não corresponder
+        """
+        if len(valores) != len(self._indices):
+            raise ValueError("Quantidade de valores não corresponde à ordenação")
+
+        alvo = tuple(
+            -indice.rank_de(valor) if decrescente else indice.rank_de(valor)
+            for indice, valor, (_, decrescente) in zip(self._indices, valores, self.espec)
+        ) + (id_registro,)
+
+        inicio, fim = 0, len(self)
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            atual = tuple(chave[meio] for chave in self._chaves_ordenadas) + (self.ids_ordenados[meio],)
+            if atual < alvo or (lado == 'right' and atual == alvo):
+                inicio = meio + 1
+            else:
+                fim = meio
+        return inicio
+
+
+def _crescente(valores: np.ndarray) -> bool:
+    return len(valores) < 2 or bool(np.all(valores[1:] > valores[:-1]))
@@ -0,0 +1,183 @@
+"""
+Processamento em paralelo de planilhas grandes, dividido em partes (chunks)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import multiprocessing
+import pandas as pd
+from . import contexto
+from .agregacao import AgregadosParciais
+from .data_processor import ProcessadorDados
+from .logger import configurar_processo, log_manager
+
+logger = log_manager.get_logger(__name__)
+
+# Separadores usados para transportar as linhas em memória compartilhada
+SEPARADOR_CELULA = '\x1f'
+SEPARADOR_LINHA = '\x1e'
+
+def codificar_linhas(linhas: List[List]) -> Optional[bytes]:
+    """
+    Codifica as linhas em um único buffer UTF-8, com separadores de controle.
+
+    Returns:
+        O buffer, ou None se alguma célula não for texto ou contiver um
+        dos separadores (nesse caso as linhas seguem por pickle)
+    """
+    partes = []
+    for linha in linhas:
+        for celula in linha:
+            if not isinstance(celula, str) or SEPARADOR_CELULA in celula or SEPARADOR_LINHA in celula:
+                return None
+        partes.append(SEPARADOR_CELULA.join(linha))
+    return SEPARADOR_LINHA.join(partes).encode('utf-8')
+
+def decodificar_linhas(buffer: bytes) -> List[List[str]]:
+    """Inverso de `codificar_linhas` (uma linha vazia volta como lista vazia)."""
+    if not buffer:
+        return []
+    return [
+        linha.split(SEPARADOR_CELULA) if linha else []
+        for linha in buffer.decode('utf-8').split(SEPARADOR_LINHA)
+    ]
+
+
+_processador_worker: Optional[ProcessadorDados] = None
+
+def _processar_chunk(tarefa: Dict[str, Any]) -> Tuple[pd.DataFrame, Optional[AgregadosParciais]]:
+    """
+    Executado nos processos de trabalho: processa uma parte das linhas.
+
+    As linhas vêm da memória compartilhada (`shm`, `inicio`, `fim`) ou,
+    quando não puderam ser codificadas, da própria tarefa (`linhas`).
+    """
+    global _processador_worker
+    if _processador_worker is None:
+        _processador_worker = ProcessadorDados()
+
+    # Registros do processo com o id da requisição que disparou a tarefa
+    tokens = contexto.iniciar(tarefa['id_requisicao']) if tarefa.get('id_requisicao') else None
+    try:
+        return _preparar_chunk(tarefa)
+    finally:
+        if tokens is not None:
+            contexto.encerrar(tokens)
+
+def _executar_com_contexto(tarefa: Tuple[Callable[[Any], Any], Optional[str], Any]) -> Any:
+    """Executado nos processos de trabalho: aplica a função de `mapear` a um item."""
+    funcao, id_requisicao, item = tarefa
+    tokens = contexto.iniciar(id_requisicao) if id_requisicao else None
+    try:
+        return funcao(item)
+    finally:
+        if tokens is not None:
+            contexto.encerrar(tokens)
+
+def _preparar_chunk(tarefa: Dict[str, Any]) -> Tuple[pd.DataFrame, Optional[AgregadosParciais]]:
+    linhas = tarefa.get('linhas')
+    if linhas is None:
+        memoria = shared_memory.SharedMemory(name=tarefa['shm'])
+        try:
+            linhas = decodificar_linhas(bytes(memoria.buf[tarefa['inicio']:tarefa['fim']]))
+        finally:
+            memoria.close()
+
+    df = _processador_worker.preparar_dataframe([tarefa['cabecalho']] + linhas, primeiro_id=tarefa['primeiro_id'])
+    agregados = _processador_worker.motor.agregar(df) if tarefa['agregar'] else None
+    return df, agregados
+
+
+class ProcessamentoParalelo:
+    """Divide as linhas da planilha em partes processadas por um pool de processos."""
+
+    def __init__(self, processos: int):
+        """
+        Args:
+            processos: Quantidade de processos de trabalho (e de partes)
+        """
+        self.processos = processos
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def processar(self, dados_brutos: List[List], agregar: bool = True) -> Tuple[pd.DataFrame, Optional[AgregadosParciais]]:
+        """
+        Processa os dados brutos em partes e junta o resultado.
+
+        Args:
+            dados_brutos: Linhas da planilha, com o cabeçalho na primeira
+            agregar: Se True, também retorna os agregados combinados das partes
+
+        Returns:
+            Tupla (DataFrame igual ao de `preparar_dataframe`, agregados ou None)
+        """
+        cabecalho, linhas = dados_brutos[0], dados_brutos[1:]
+        tamanho = -(-len(linhas) // self.processos)
+        limites = [(inicio, min(inicio + tamanho, len(linhas))) for inicio in range(0, len(linhas), tamanho)]
+
+        partes = [codificar_linhas(linhas[inicio:fim]) for inicio, fim in limites]
+        memoria = None
+        try:
+            if all(parte is not None for parte in partes):
+                memoria = shared_memory.SharedMemory(create=True, size=max(1, sum(len(p) for p in partes)))
+                tarefas, posicao = [], 0
+                for (inicio, _), parte in zip(limites, partes):
+                    memoria.buf[posicao:posicao + len(parte)] = parte
+                    tarefas.append({'shm': memoria.name, 'inicio': posicao, 'fim': posicao + len(parte)})
+                    posicao += len(parte)
+            else:
+                logger.debug("Linhas não codificáveis em texto; partes enviadas por pickle")
+                tarefas = [{'linhas': linhas[inicio:fim]} for inicio, fim in limites]
+
+            for tarefa, (inicio, _) in zip(tarefas, limites):
+                tarefa.update(
+                    cabecalho=cabecalho, primeiro_id=inicio + 2, agregar=agregar,
+                    id_requisicao=contexto.id_requisicao()
+                )
+
+            resultados = list(self._get_pool().map(_processar_chunk, tarefas))
+        finally:
+            if memoria is not None:
+                memoria.close()
+                memoria.unlink()
+
+        df = pd.concat([parte for parte, _ in resultados], ignore_index=True)
+        if not agregar:
+            return df, None
+        agregados = AgregadosParciais()
+        for _, parcial in resultados:
+            agregados.combinar(parcial)
+        return df, agregados
+
+    def mapear(self, funcao: Callable[[Any], Any], itens: Iterable[Any]) -> List[Any]:
+        """
+        Aplica `funcao` a cada item no mesmo pool de processos das partes.
+
+        Args:
+            funcao: Função de nível de módulo (serializável por pickle)
+            itens: Argumentos, um por chamada
+
+        Returns:
+            Resultados na ordem dos itens
+        """
+        id_requisicao = contexto.id_requisicao()
+        tarefas = [(funcao, id_requisicao, item) for item in itens]
+        return list(self._get_pool().map(_executar_com_contexto, tarefas))
+
+    def encerrar(self) -> None:
+        """Finaliza os processos de trabalho."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 'spawn' evita herdar locks de outras threads do servidor no fork;
+            # os processos enviam o log ao principal, que escreve nos arquivos
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processos,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=configurar_processo,
+                initargs=(log_manager.fila_processos(), logging.getLogger().getEffectiveLevel())
+            )
+        return self._pool
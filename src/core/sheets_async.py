@@ -0,0 +1,378 @@
+"""
+Leitor assíncrono da API REST do Google Sheets
+"""
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+import asyncio
+import concurrent.futures
+import threading
+from google.oauth2 import service_account
+from google.auth.transport.requests import Request
+from ..config.campos_config import GOOGLE_SHEETS_CONFIG, validar_cabecalho
+from .ingestao import intervalos_blocos, range_aba
+from .logger import log_manager
+from .metricas import metricas
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depende do ambiente
+    aiohttp = None
+
+logger = log_manager.get_logger(__name__)
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3/files"
+
+# Respostas que justificam nova tentativa (cota excedida e falhas do servidor)
+STATUS_RETENTATIVA = frozenset({429, 500, 502, 503, 504})
+
+def extrair_spreadsheet_id(sheet_url: str) -> str:
+    """Extrai o ID da planilha da URL (".../spreadsheets/d/<id>/edit")."""
+    try:
+        return sheet_url.split('/')[5]
+    except (AttributeError, IndexError):
+        raise ValueError(f"URL da planilha inválida: {sheet_url}")
+
+
+class AsyncSheetsClient:
+    """
+    Cliente asyncio dos endpoints `values.get` e `values.batchGet`.
+
+    Usa uma única sessão HTTP com pool de conexões keep-alive e o token da
+    conta de serviço, de modo que várias leituras (ranges ou planilhas)
+    acontecem em paralelo sem ocupar threads. Deve ser usado como
+    gerenciador de contexto assíncrono:
+
+        async with AsyncSheetsClient() as cliente:
+            dados = await cliente.ler_varios([(id_a, range_a), (id_b, range_b)])
+
+    A partir de código síncrono (ex.: a thread de atualização do snapshot),
+    use `ler_planilha` ou `ler_planilhas`, que rodam em um event loop
+    dedicado do cliente.
+    """
+
+    def __init__(
+        self,
+        credentials=None,
+        limite_conexoes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        base_url: str = SHEETS_API_URL,
+        drive_url: str = DRIVE_API_URL
+    ):
+        """
+        Args:
+            credentials: Credenciais google-auth (carregadas do arquivo
+                         configurado se omitidas)
+            limite_conexoes: Máximo de conexões simultâneas do pool
+            timeout: Tempo máximo de cada requisição, em segundos
+            base_url: URL base da API (alterável para testes)
+            drive_url: URL base da API de arquivos do Drive
+        """
+        if aiohttp is None:
+            raise ImportError("O leitor assíncrono requer o pacote aiohttp")
+
+        self.config = GOOGLE_SHEETS_CONFIG
+        self.credentials = credentials or self._carregar_credenciais()
+        self.limite_conexoes = limite_conexoes or self.config["http_pool_size"]
+        self.timeout = timeout or self.config["http_timeout"]
+        self.base_url = base_url.rstrip('/')
+        self.drive_url = drive_url.rstrip('/')
+        self._sessao: Optional["aiohttp.ClientSession"] = None
+        self._lock_token: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock_loop = threading.Lock()
+
+    def _carregar_credenciais(self):
+        return service_account.Credentials.from_service_account_file(
+            self.config["credentials_path"],
+            scopes=self.config["scopes"]
+        )
+
+    async def __aenter__(self) -> "AsyncSheetsClient":
+        conector = aiohttp.TCPConnector(limit=self.limite_conexoes, keepalive_timeout=60)
+        self._sessao = aiohttp.ClientSession(
+            connector=conector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            raise_for_status=False
+        )
+        self._lock_token = asyncio.Lock()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.fechar()
+
+    async def fechar(self) -> None:
+        """Fecha a sessão HTTP e as conexões do pool."""
+        if self._sessao is not None:
+            await self._sessao.close()
+            self._sessao = None
+
+    async def _token(self) -> str:
+        """Retorna um token de acesso válido, renovando-o fora do event loop se necessário."""
+        async with self._lock_token:
+            if not self.credentials.valid:
+                loop = asyncio.get_running_loop()
+                with metricas.medir('sheets_credenciais'):
+                    await loop.run_in_executor(None, self.credentials.refresh, Request())
+            return self.credentials.token
+
+    async def _get(self, caminho: str, params=None, base_url: Optional[str] = None) -> dict:
+        """GET autenticado na API, com novas tentativas para 429 e erros 5xx."""
+        if self._sessao is None:
+            raise RuntimeError("AsyncSheetsClient deve ser usado com 'async with'")
+
+        url = f"{base_url or self.base_url}/{caminho}"
+        tentativas = max(1, self.config["max_retries"])
+        for tentativa in range(1, tentativas + 1):
+            headers = {'Authorization': f"Bearer {await self._token()}"}
+            async with self._sessao.get(url, params=params, headers=headers) as resposta:
+                if resposta.status == 200:
+                    return await resposta.json(content_type=None)
+                corpo = await resposta.text()
+
+            if resposta.status not in STATUS_RETENTATIVA or tentativa == tentativas:
+                raise RuntimeError(
+                    f"Erro {resposta.status} da API do Google Sheets em {caminho}: {corpo[:200]}"
+                )
+            espera = self.config["retry_delay"] * 2 ** (tentativa - 1)
+            logger.warning(f"API do Google Sheets retornou {resposta.status}; nova tentativa em {espera}s")
+            await asyncio.sleep(espera)
+
+    async def versao_arquivo(self, spreadsheet_id: str) -> Optional[str]:
+        """
+        Versão do arquivo no Drive (`files.get`), sem ler os valores.
+
+        Returns:
+            Identificador que muda a cada edição, ou None se a consulta falhar
+        """
+        try:
+            with metricas.medir('sheets_versao'):
+                metadados = await self._get(
+                    spreadsheet_id,
+                    params={'fields': 'version,modifiedTime', 'supportsAllDrives': 'true'},
+                    base_url=self.drive_url
+                )
+            return f"{metadados.get('version')}@{metadados.get('modifiedTime')}"
+        except Exception as e:
+            logger.warning(f"Não foi possível consultar a versão da planilha no Drive: {str(e)}")
+            return None
+
+    async def titulo_primeira_aba(self, spreadsheet_id: str) -> str:
+        """Título da primeira aba da planilha (usado para montar o range padrão)."""
+        with metricas.medir('sheets_metadados'):
+            dados = await self._get(spreadsheet_id, params={'fields': 'sheets.properties.title'})
+        return dados['sheets'][0]['properties']['title']
+
+    async def ler_range(self, spreadsheet_id: str, range_name: str) -> List[List[str]]:
+        """Lê um range com `values.get`."""
+        with metricas.medir('sheets_valores'):
+            dados = await self._get(f"{spreadsheet_id}/values/{quote(range_name, safe='')}")
+        return dados.get('values', [])
+
+    async def ler_ranges(self, spreadsheet_id: str, ranges: Sequence[str]) -> Dict[str, List[List[str]]]:
+        """
+        Lê vários ranges da mesma planilha em uma única chamada `values.batchGet`.
+
+        Returns:
+            Valores de cada range, na chave em que foi solicitado
+        """
+        with metricas.medir('sheets_valores'):
+            dados = await self._get(
+                f"{spreadsheet_id}/values:batchGet",
+                params=[('ranges', range_name) for range_name in ranges]
+            )
+        valores = dados.get('valueRanges', [])
+        return {
+            range_name: (valores[i].get('values', []) if i < len(valores) else [])
+            for i, range_name in enumerate(ranges)
+        }
+
+    async def ler_varios(self, pedidos: Iterable[Tuple[str, str]]) -> List[List[List[str]]]:
+        """
+        Lê vários (spreadsheet_id, range) em paralelo.
+
+        Ranges da mesma planilha são agrupados em um único `batchGet`.
+
+        Returns:
+            Valores de cada pedido, na ordem recebida
+        """
+        pedidos = list(pedidos)
+        por_planilha: Dict[str, List[str]] = {}
+        for spreadsheet_id, range_name in pedidos:
+            ranges = por_planilha.setdefault(spreadsheet_id, [])
+            if range_name not in ranges:
+                ranges.append(range_name)
+
+        async def ler(spreadsheet_id, ranges):
+            if len(ranges) == 1:
+                return spreadsheet_id, {ranges[0]: await self.ler_range(spreadsheet_id, ranges[0])}
+            return spreadsheet_id, await self.ler_ranges(spreadsheet_id, ranges)
+
+        resultados = dict(await asyncio.gather(
+            *(ler(spreadsheet_id, ranges) for spreadsheet_id, ranges in por_planilha.items())
+        ))
+        return [resultados[spreadsheet_id][range_name] for spreadsheet_id, range_name in pedidos]
+
+    async def resolver_range(self, spreadsheet_id: str, range_name: Optional[str] = None) -> str:
+        """
+        Qualifica o range com o título da primeira aba, como o cliente síncrono.
+
+        O range resultante não tem linha final ("'Aba'!A:Z"): a API devolve
+        até a última linha preenchida, qualquer que seja o tamanho da aba.
+        """
+        range_name = range_name or self.config["default_range"]
+        if range_name.startswith("'"):
+            return range_name
+        return range_aba(await self.titulo_primeira_aba(spreadsheet_id))
+
+    async def ler_planilha_async(self, spreadsheet_id: Optional[str] = None, range_name: Optional[str] = None) -> List[List[str]]:
+        """
+        Equivalente assíncrono de `GoogleSheetsClient.ler_planilha`.
+
+        Sem um range qualificado pela aba ("'Aba'!A:Z"), lê a primeira
+        aba da planilha, como o cliente síncrono.
+
+        Raises:
+            ValueError: Se o cabeçalho não corresponder ao mapeamento configurado
+        """
+        spreadsheet_id = spreadsheet_id or extrair_spreadsheet_id(self.config["sheet_url"])
+        range_name = await self.resolver_range(spreadsheet_id, range_name)
+
+        dados = await self.ler_range(spreadsheet_id, range_name)
+        if not dados:
+            logger.warning("Nenhum dado encontrado na planilha")
+            return []
+        if not validar_cabecalho(dados[0]):
+            raise ValueError("Cabeçalho da planilha não corresponde ao mapeamento configurado")
+
+        logger.debug(f"Total de linhas lidas (assíncrono): {len(dados)}")
+        return dados
+
+    def ler_planilha(self, range_name: Optional[str] = None, spreadsheet_id: Optional[str] = None) -> List[List[str]]:
+        """
+        Lê a planilha (a configurada, por padrão) a partir de código síncrono.
+
+        A leitura roda no event loop dedicado do cliente; a thread chamadora
+        (ex.: a atualização periódica do snapshot) apenas aguarda o resultado.
+        Chamadas simultâneas de várias threads são executadas em paralelo.
+        """
+        # Título da aba + valores
+        return self._executar(lambda: self.ler_planilha_async(spreadsheet_id, range_name), requisicoes=2)
+
+    def ler_planilha_se_alterada(
+        self,
+        range_name: Optional[str] = None,
+        spreadsheet_id: Optional[str] = None,
+        versao_conhecida: Optional[str] = None,
+        em_blocos: bool = False
+    ) -> Tuple[Optional[str], Optional[Union[List[List[str]], Iterator[List[List[str]]]]]]:
+        """
+        Lê a planilha apenas se ela mudou desde `versao_conhecida`.
+
+        Args:
+            em_blocos: Se True, os dados vêm como o gerador de `iterar_planilha`
+
+        Returns:
+            Tupla (versão, dados); `dados` é None quando a versão não mudou
+        """
+        spreadsheet_id = spreadsheet_id or extrair_spreadsheet_id(self.config["sheet_url"])
+
+        async def ler():
+            versao = await self.versao_arquivo(spreadsheet_id) if self.config["change_probe"] else None
+            if versao is not None and versao == versao_conhecida:
+                logger.debug(f"Planilha sem alterações (versão {versao}), leitura dos valores ignorada")
+                return versao, None
+            if em_blocos:
+                # Os blocos são lidos à medida que o gerador é consumido
+                return versao, self.iterar_planilha(range_name, spreadsheet_id)
+            return versao, await self.ler_planilha_async(spreadsheet_id, range_name)
+
+        # Versão no Drive + título da aba + valores
+        return self._executar(ler, requisicoes=3)
+
+    def iterar_planilha(
+        self,
+        range_name: Optional[str] = None,
+        spreadsheet_id: Optional[str] = None,
+        linhas_por_bloco: Optional[int] = None
+    ) -> Iterator[List[List[str]]]:
+        """
+        Lê a planilha em blocos de linhas (ver `GoogleSheetsClient.iterar_planilha`).
+
+        Cada bloco é um `values.get` no event loop dedicado; o próximo só é
+        pedido quando quem consome o gerador termina o anterior.
+        """
+        spreadsheet_id = spreadsheet_id or extrair_spreadsheet_id(self.config["sheet_url"])
+        linhas_por_bloco = linhas_por_bloco or self.config["stream_chunk_rows"]
+        range_name = self._executar(lambda: self.resolver_range(spreadsheet_id, range_name))
+
+        total_linhas = 0
+        for intervalo in intervalos_blocos(range_name, linhas_por_bloco):
+            bloco = self._executar(lambda: self.ler_range(spreadsheet_id, intervalo))
+            if total_linhas == 0:
+                if not bloco:
+                    logger.warning("Nenhum dado encontrado na planilha")
+                    return
+                if not validar_cabecalho(bloco[0]):
+                    raise ValueError("Cabeçalho da planilha não corresponde ao mapeamento configurado")
+
+            total_linhas += len(bloco)
+            if bloco:
+                yield bloco
+            if len(bloco) < linhas_por_bloco:
+                break
+
+        logger.debug(f"Total de linhas lidas em blocos (assíncrono): {total_linhas}")
+
+    def ler_planilhas(self, pedidos: Iterable[Tuple[str, str]]) -> List[List[List[str]]]:
+        """Versão síncrona de `ler_varios`."""
+        pedidos = list(pedidos)
+        return self._executar(lambda: self.ler_varios(pedidos))
+
+    def encerrar(self) -> None:
+        """Fecha a sessão HTTP e finaliza o event loop dedicado."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.fechar(), self._loop).result(timeout=self.timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    def _prazo_requisicao(self) -> float:
+        """Tempo máximo de uma requisição de `_get`, somadas as novas tentativas e as esperas."""
+        tentativas = max(1, self.config["max_retries"])
+        return self.timeout * tentativas + self.config["retry_delay"] * (2 ** (tentativas - 1) - 1)
+
+    def _executar(self, fabrica_corotina: Callable[[], Awaitable[Any]], requisicoes: int = 1) -> Any:
+        """
+        Executa a corrotina no event loop dedicado, criado no primeiro uso.
+
+        O loop e a sessão HTTP são criados juntos e mantidos entre as
+        chamadas, de modo que as conexões keep-alive são reaproveitadas de
+        uma leitura para outra.
+
+        Args:
+            requisicoes: Requisições feitas em sequência pela corrotina (define
+                         o prazo de espera, `requisicoes * _prazo_requisicao()`)
+
+        Raises:
+            TimeoutError: Se a corrotina não terminar no prazo (ela é cancelada)
+        """
+        with self._lock_loop:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="sheets-async", daemon=True).start()
+                try:
+                    asyncio.run_coroutine_threadsafe(self.__aenter__(), loop).result(timeout=self.timeout)
+                except BaseException:
+                    loop.call_soon_threadsafe(loop.stop)
+                    raise
+                self._loop = loop
+            loop = self._loop
+
+        prazo = requisicoes * self._prazo_requisicao()
+        futuro = asyncio.run_coroutine_threadsafe(fabrica_corotina(), loop)
+        try:
+            return futuro.result(timeout=prazo)
+        except concurrent.futures.TimeoutError:
+            futuro.cancel()
+            raise TimeoutError(f"Leitura da API do Google Sheets excedeu {prazo:.0f}s")
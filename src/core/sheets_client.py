@@ -9,6 +9,8 @@ from ..config.campos_config import (
     validar_cabecalho,
     get_mapeamento_colunas
 )
+from .ingestao import intervalos_blocos, range_aba
+from .metricas import metricas
 from ..utils.date_utils import (
     TIMEZONE,
     format_timestamp,
@@ -17,47 +19,39 @@ from ..utils.date_utils import (
 import logging
 import os
 import json
-import traceback
-from dotenv import load_dotenv
-
-# Carrega variáveis de ambiente
-load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 class GoogleSheetsClient:
-    def __init__(self):
-        logger.info("=== Inicializando Google Sheets Client ===")
+    def __init__(self, sheet_url=None):
+        """
+        Args:
+            sheet_url: URL da planilha lida (padrão: GOOGLE_SHEETS_URL)
+        """
+        logger.debug("Inicializando Google Sheets Client")
         
         try:
             # Carrega configurações
             self.config = GOOGLE_SHEETS_CONFIG
-            logger.info(f"********{GOOGLE_SHEETS_CONFIG}")
-            logger.info("Configurações carregadas:")
-            for key, value in self.config.items():
-                if key != "scopes":  # Evita log muito extenso
-                    logger.info(f"{key}: {value}")
+            self.sheet_url = sheet_url or self.config["sheet_url"]
             
             # Inicializa componentes
             self.credentials = self._get_credentials()
             self.service = self._create_service()
             self.spreadsheet_id = self._extract_spreadsheet_id()
             self.mapeamento_colunas = get_mapeamento_colunas()
-            logger.info(f"Cliente inicializado com ID da planilha: {self.spreadsheet_id}")
+            logger.debug(f"Cliente inicializado com ID da planilha: {self.spreadsheet_id}")
             
         except Exception as e:
-            logger.error("Erro ao inicializar GoogleSheetsClient:")
-            logger.error(f"Tipo do erro: {type(e).__name__}")
-            logger.error(f"Mensagem: {str(e)}")
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"Erro ao inicializar GoogleSheetsClient: {type(e).__name__}: {str(e)}")
             raise
 
+    @metricas.cronometrar('sheets_credenciais')
     def _get_credentials(self):
         """Obtém as credenciais do Google Sheets."""
         try:
             credentials_path = self.config["credentials_path"]
-            logger.info(f"Tentando carregar credenciais de: {credentials_path}")
+            logger.debug(f"Tentando carregar credenciais de: {credentials_path}")
             
             if not os.path.exists(credentials_path):
                 error_msg = f"Arquivo de credenciais não encontrado em: {credentials_path}"
@@ -68,12 +62,12 @@ class GoogleSheetsClient:
             try:
                 with open(credentials_path, 'r') as f:
                     credentials_content = f.read()
-                    logger.info(f"✓ Arquivo de credenciais lido: {len(credentials_content)} bytes")
+                    logger.debug(f"✓ Arquivo de credenciais lido: {len(credentials_content)} bytes")
                     
                     # Valida JSON
                     try:
                         creds_json = json.loads(credentials_content)
-                        logger.info("✓ Conteúdo do arquivo é um JSON válido")
+                        logger.debug("✓ Conteúdo do arquivo é um JSON válido")
                         
                         # Verifica campos obrigatórios
                         required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 'client_email']
@@ -83,7 +77,7 @@ class GoogleSheetsClient:
                             logger.error(f"✗ Campos obrigatórios ausentes: {missing_fields}")
                             raise ValueError(f"Credenciais inválidas: campos ausentes {missing_fields}")
                             
-                        logger.info("✓ Todos os campos obrigatórios presentes")
+                        logger.debug("✓ Todos os campos obrigatórios presentes")
                         
                     except json.JSONDecodeError as e:
                         logger.error(f"✗ Arquivo não é um JSON válido: {str(e)}")
@@ -99,69 +93,175 @@ class GoogleSheetsClient:
                 scopes=self.config["scopes"]
             )
             
-            logger.info("✓ Credenciais carregadas com sucesso")
+            logger.debug("✓ Credenciais carregadas com sucesso")
             return credentials
             
         except Exception as e:
             logger.error(f"Erro ao obter credenciais: {str(e)}")
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
             raise
 
+    @metricas.cronometrar('sheets_discovery')
     def _create_service(self):
         """Cria o serviço do Google Sheets."""
         try:
-            logger.info("Criando serviço do Google Sheets")
             service = build('sheets', 'v4', credentials=self.credentials)
-            logger.info("✓ Serviço do Google Sheets criado com sucesso")
+            logger.debug("✓ Serviço do Google Sheets criado com sucesso")
             return service
         except Exception as e:
             logger.error(f"✗ Erro ao criar serviço do Google Sheets: {str(e)}")
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
             raise
 
     def _extract_spreadsheet_id(self):
         """Extrai o ID da planilha da URL."""
         try:
-            spreadsheet_id = self.config["sheet_url"].split('/')[5]
-            logger.info(f"✓ ID da planilha extraído com sucesso: {spreadsheet_id}")
+            spreadsheet_id = self.sheet_url.split('/')[5]
+            logger.debug(f"✓ ID da planilha extraído com sucesso: {spreadsheet_id}")
             return spreadsheet_id
         except IndexError:
-            error_msg = f"✗ URL da planilha inválida: {self.config['sheet_url']}"
+            error_msg = f"✗ URL da planilha inválida: {self.sheet_url}"
             logger.error(error_msg)
             raise ValueError(error_msg)
         except Exception as e:
-            error_msg = f"✗ Erro ao extrair ID da planilha: {str(e)}"
-            logger.error(error_msg)
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro ao extrair ID da planilha: {str(e)}")
             raise
 
+    def _get_drive_service(self):
+        """Cria (no primeiro uso) o serviço do Google Drive, usado para detectar alterações."""
+        if getattr(self, '_drive_service', None) is None:
+            with metricas.medir('drive_discovery'):
+                self._drive_service = build('drive', 'v3', credentials=self.credentials, cache_discovery=False)
+        return self._drive_service
+
+    def get_versao_arquivo(self):
+        """
+        Consulta a versão do arquivo da planilha no Drive, sem ler os valores.
+        
+        Returns:
+            Identificador que muda a cada edição (`version` e `modifiedTime`
+            do Drive), ou None se a consulta falhar
+        """
+        try:
+            servico = self._get_drive_service()
+            with metricas.medir('sheets_versao'):
+                metadados = servico.files().get(
+                    fileId=self.spreadsheet_id,
+                    fields='version,modifiedTime',
+                    supportsAllDrives=True
+                ).execute()
+            return f"{metadados.get('version')}@{metadados.get('modifiedTime')}"
+        except Exception as e:
+            logger.warning(f"Não foi possível consultar a versão da planilha no Drive: {str(e)}")
+            return None
+
+    def ler_planilha_se_alterada(self, range_name=None, versao_conhecida=None, em_blocos=False):
+        """
+        Lê a planilha apenas se ela mudou desde `versao_conhecida`.
+        
+        A consulta ao Drive (`files.get`) é bem mais barata que a leitura dos
+        valores; se ela falhar, a planilha é lida normalmente.
+        
+        Args:
+            em_blocos: Se True, os dados vêm como o gerador de `iterar_planilha`
+        
+        Returns:
+            Tupla (versão, dados); `dados` é None quando a versão não mudou
+        """
+        versao = self.get_versao_arquivo() if self.config["change_probe"] else None
+        if versao is not None and versao == versao_conhecida:
+            logger.debug(f"✓ Planilha sem alterações (versão {versao}), leitura dos valores ignorada")
+            return versao, None
+        if em_blocos:
+            return versao, self.iterar_planilha(range_name)
+        return versao, self.ler_planilha(range_name)
+
+    def iterar_planilha(self, range_name=None, linhas_por_bloco=None):
+        """
+        Lê a planilha em blocos de linhas, um `values.get` por bloco.
+        
+        O primeiro bloco começa pelo cabeçalho, que é validado antes de
+        seguir. A leitura termina no fim do range ou no primeiro bloco
+        incompleto. Usado com `ProcessadorDados.preparar_dataframe_em_blocos`,
+        evita manter a planilha inteira como lista de linhas.
+        
+        Args:
+            range_name: Range lido (padrão: o mesmo de `ler_planilha`)
+            linhas_por_bloco: Linhas por requisição (padrão: SHEETS_STREAM_CHUNK_ROWS)
+        
+        Yields:
+            Listas de linhas da planilha
+        """
+        range_name = self._resolver_range(range_name)
+        linhas_por_bloco = linhas_por_bloco or self.config["stream_chunk_rows"]
+        logger.debug(f"Iniciando leitura em blocos de {linhas_por_bloco} linhas: {range_name}")
+        
+        total_linhas = 0
+        for intervalo in intervalos_blocos(range_name, linhas_por_bloco):
+            try:
+                with metricas.medir('sheets_valores'):
+                    bloco = self.service.spreadsheets().values().get(
+                        spreadsheetId=self.spreadsheet_id,
+                        range=intervalo
+                    ).execute().get('values', [])
+            except HttpError as e:
+                logger.error(f"✗ Erro de API do Google Sheets no bloco {intervalo}: {str(e)}")
+                raise
+            
+            if total_linhas == 0:
+                if not bloco:
+                    logger.warning("✗ Nenhum dado encontrado na planilha")
+                    return
+                if not validar_cabecalho(bloco[0]):
+                    error_msg = "✗ Cabeçalho da planilha não corresponde ao mapeamento configurado"
+                    logger.error(error_msg)
+                    raise ValueError(error_msg)
+            
+            total_linhas += len(bloco)
+            if bloco:
+                yield bloco
+            if len(bloco) < linhas_por_bloco:
+                break
+        
+        logger.debug(f"✓ Total de linhas lidas em blocos: {total_linhas}")
+
+    def _resolver_range(self, range_name=None):
+        """Qualifica o range com o título da primeira aba, como em `ler_planilha`."""
+        range_name = range_name or self.config["default_range"]
+        if range_name.startswith("'"):
+            return range_name
+        with metricas.medir('sheets_metadados'):
+            sheet_info = self.service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties.title'
+            ).execute()
+        range_name = range_aba(sheet_info['sheets'][0]['properties']['title'])
+        logger.debug(f"Range ajustado para: {range_name}")
+        return range_name
+
     def ler_planilha(self, range_name=None):
         """Lê dados da planilha do Google Sheets."""
         try:
             range_name = range_name or self.config["default_range"]
-            logger.info(f"Iniciando leitura do range: {range_name}")
+            logger.debug(f"Iniciando leitura do range: {range_name}")
             
             # Obtém informações da planilha
-            logger.info("Obtendo informações da planilha...")
-            sheet_info = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
-            ).execute()
+            with metricas.medir('sheets_metadados'):
+                sheet_info = self.service.spreadsheets().get(
+                    spreadsheetId=self.spreadsheet_id
+                ).execute()
             
             sheet_title = sheet_info['sheets'][0]['properties']['title']
-            logger.info(f"✓ Título da planilha: {sheet_title}")
+            logger.debug(f"✓ Título da planilha: {sheet_title}")
             
             # Ajusta o range com o nome correto da planilha
             if not range_name.startswith("'"):
-                range_name = f"'{sheet_title}'!A1:Z1000"
-                logger.info(f"Range ajustado para: {range_name}")
+                range_name = range_aba(sheet_title)
+                logger.debug(f"Range ajustado para: {range_name}")
             
-            logger.info("Executando requisição para obter dados...")
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=range_name
-            ).execute()
+            with metricas.medir('sheets_valores'):
+                result = self.service.spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=range_name
+                ).execute()
             
             dados = result.get('values', [])
             total_linhas = len(dados)
@@ -170,7 +270,7 @@ class GoogleSheetsClient:
                 logger.warning("✗ Nenhum dado encontrado na planilha")
                 return []
             
-            logger.info(f"✓ Total de linhas lidas: {total_linhas}")
+            logger.debug(f"✓ Total de linhas lidas: {total_linhas}")
             
             # Valida o cabeçalho da planilha
             cabecalho = dados[0]
@@ -186,24 +286,15 @@ class GoogleSheetsClient:
                     if len(linha) > 0:
                         logger.debug(f"Linha {i+1}: {linha}")
             
-            logger.info("✓ Dados lidos com sucesso")
             return dados
             
+        # As exceções seguem para quem pediu a leitura, que registra o traceback
         except HttpError as e:
-            error_msg = f"✗ Erro de API do Google Sheets: {str(e)}"
-            logger.error(error_msg)
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro de API do Google Sheets: {str(e)}")
             raise
         except ValueError as e:
-            error_msg = f"✗ Erro de estrutura da planilha: {str(e)}"
-            logger.error(error_msg)
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro de estrutura da planilha: {str(e)}")
             raise
         except Exception as e:
-            error_msg = f"✗ Erro ao ler planilha: {str(e)}"
-            logger.error(error_msg)
-            logger.error("Stack trace:")
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Erro ao ler planilha: {str(e)}")
             raise
\ No newline at end of file
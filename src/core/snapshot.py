@@ -0,0 +1,449 @@
+"""
+Snapshot dos dados processados e gerenciamento da sua atualização
+"""
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+import hashlib
+import itertools
+import threading
+import time
+import numpy as np
+import pandas as pd
+from ..config.campos_config import get_campos_pesquisaveis
+from .busca import IndiceBusca
+from .ordenacao import EspecOrdenacao, IndiceColuna, Ordenacao
+from ..utils.date_utils import format_timestamp, get_current_time
+from . import contexto
+from .logger import log_manager
+from .metricas import metricas
+
+logger = log_manager.get_logger(__name__)
+
+# Ordenações distintas guardadas por snapshot (as menos usadas são descartadas)
+LIMITE_ORDENACOES = 16
+
+class VersaoSnapshot(NamedTuple):
+    """Resumo de um snapshot publicado, guardado para o cálculo de deltas."""
+    versao: int
+    colunas: Tuple[str, ...]
+    hashes_linhas: np.ndarray
+
+
+class Snapshot:
+    """
+    Visão imutável do DataFrame processado de uma leitura da planilha.
+
+    Estruturas derivadas (ordenações, resultados agregados, etc.) são
+    calculadas sob demanda e guardadas no próprio snapshot, de modo que
+    são descartadas junto com ele quando uma nova leitura o substitui.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        versao: int,
+        hash_conteudo: Optional[str] = None,
+        hashes_linhas: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            df: DataFrame processado
+            versao: Número sequencial do snapshot
+            hash_conteudo: Hash do conteúdo de `df` (calculado se omitido)
+            hashes_linhas: Hash de cada linha de `df` (calculado se omitido)
+        """
+        self.df = df
+        self.versao = versao
+        self.hashes_linhas = calcular_hashes_linhas(df) if hashes_linhas is None else hashes_linhas
+        self.hash_conteudo = hash_conteudo or calcular_hash_conteudo(df, self.hashes_linhas)
+        self.criado_em = format_timestamp(get_current_time())
+        # Precisão de segundos, como no cabeçalho HTTP Last-Modified
+        self.modificado_em = datetime.now(timezone.utc).replace(microsecond=0)
+        self._cache: Dict[Any, Any] = {}
+        # Valores em cálculo: quem pede a mesma chave espera o mesmo Future
+        self._calculando: Dict[Any, Future] = {}
+        # Chaves dos tipos com limite, da menos para a mais recentemente usada
+        self._recentes: Dict[Any, OrderedDict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def resumo(self) -> VersaoSnapshot:
+        """Retorna o resumo usado para calcular deltas a partir deste snapshot."""
+        return VersaoSnapshot(self.versao, tuple(self.df.columns), self.hashes_linhas)
+
+    def posicao_delta(self, base: VersaoSnapshot) -> Optional[int]:
+        """
+        Verifica se este snapshot apenas acrescentou linhas ao snapshot base.
+
+        Returns:
+            Posição da primeira linha nova, ou None se alguma linha do base
+            foi alterada ou removida (o delta não representa a mudança)
+        """
+        def comparar():
+            inicio = len(base.hashes_linhas)
+            if base.colunas != tuple(self.df.columns) or inicio > len(self.df):
+                return None
+            if not np.array_equal(self.hashes_linhas[:inicio], base.hashes_linhas):
+                return None
+            return inicio
+
+        return self.get_cache(('delta', base.versao), comparar)
+
+    def get_etag(self, *variante: Any) -> str:
+        """
+        Retorna a ETag de uma representação dos dados deste snapshot.
+
+        Args:
+            variante: Parâmetros que mudam a representação (campos, formato...)
+        """
+        if not variante:
+            return self.hash_conteudo
+        sufixo = hashlib.blake2b(repr(variante).encode('utf-8'), digest_size=4).hexdigest()
+        return f"{self.hash_conteudo}-{sufixo}"
+
+    def get_cache(self, chave: Any, fabrica: Callable[[], Any], limite: Optional[int] = None) -> Any:
+        """
+        Retorna o valor derivado associado à chave, calculando-o na primeira vez.
+
+        O cálculo roda fora do lock do snapshot: chamadas simultâneas para a
+        mesma chave esperam um único cálculo, e as demais chaves não esperam
+        por ele. Se `fabrica` falhar, a exceção chega a todos que esperavam
+        e a próxima chamada tenta de novo.
+
+        Args:
+            chave: Identificador do valor derivado; em tuplas, o primeiro
+                   elemento é o tipo do valor
+            fabrica: Função sem argumentos que calcula o valor
+            limite: Quantidade máxima de valores guardados desse tipo; acima
+                    dela, descarta o usado há mais tempo (None: sem limite)
+        """
+        tipo = chave[0] if isinstance(chave, tuple) else chave
+        try:
+            valor = self._cache[chave]
+            metricas.registrar_cache(tipo, True)
+            if limite is not None:
+                self._usar(tipo, chave)
+            return valor
+        except KeyError:
+            pass
+
+        with self._lock:
+            if chave in self._cache:
+                metricas.registrar_cache(tipo, True)
+                return self._cache[chave]
+            futuro = self._calculando.get(chave)
+            calcular = futuro is None
+            if calcular:
+                futuro = self._calculando[chave] = Future()
+
+        if not calcular:
+            # Calculado por outra thread: conta como acerto
+            metricas.registrar_cache(tipo, True)
+            return futuro.result()
+
+        try:
+            valor = fabrica()
+        except BaseException as e:
+            with self._lock:
+                del self._calculando[chave]
+            futuro.set_exception(e)
+            raise
+        with self._lock:
+            self._cache[chave] = valor
+            del self._calculando[chave]
+            if limite is not None:
+                recentes = self._recentes.setdefault(tipo, OrderedDict())
+                recentes[chave] = None
+                while len(recentes) > limite:
+                    antiga, _ = recentes.popitem(last=False)
+                    self._cache.pop(antiga, None)
+        futuro.set_result(valor)
+        metricas.registrar_cache(tipo, False)
+        return valor
+
+    def _usar(self, tipo: Any, chave: Any) -> None:
+        """Marca a chave como a usada mais recentemente entre as do seu tipo."""
+        with self._lock:
+            recentes = self._recentes.get(tipo)
+            if recentes is not None and chave in recentes:
+                recentes.move_to_end(chave)
+
+    def get_indice_coluna(self, campo: str) -> IndiceColuna:
+        """
+        Retorna a permutação `argsort` e os ranks de uma coluna, criados no primeiro uso.
+
+        Raises:
+            KeyError: Se o campo não existir no snapshot
+        """
+        if campo not in self.df.columns:
+            raise KeyError(campo)
+        return self.get_cache(('indice', campo), lambda: IndiceColuna(self.df[campo]))
+
+    def get_ordenacao(self, espec: EspecOrdenacao) -> Ordenacao:
+        """
+        Retorna a ordem dos registros para a especificação informada.
+
+        A ordem é calculada a partir dos índices das colunas (guardados por
+        campo) e reaproveitada enquanto estiver entre as LIMITE_ORDENACOES
+        especificações usadas mais recentemente.
+
+        Raises:
+            KeyError: Se algum campo não existir no snapshot
+        """
+        # Os ids são únicos e desempatam em ordem crescente: campos depois de
+        # id_registro nunca decidem, e id_registro crescente no fim é implícito
+        campos = [campo for campo, _ in espec]
+        if 'id_registro' in campos:
+            espec = espec[:campos.index('id_registro') + 1]
+            if len(espec) > 1 and espec[-1] == ('id_registro', False):
+                espec = espec[:-1]
+
+        def ordenar():
+            indices = [self.get_indice_coluna(campo) for campo, _ in espec]
+            return Ordenacao(espec, indices, self.df['id_registro'].to_numpy())
+
+        return self.get_cache(('ordenacao', espec), ordenar, limite=LIMITE_ORDENACOES)
+
+    def get_registro(self, id_registro: int) -> Optional[Dict[str, Any]]:
+        """Retorna todos os campos de um registro pelo id, ou None se não existir."""
+        if 'id_registro' not in self.df.columns:
+            return None
+        posicoes = self.get_cache('posicoes_id', lambda: pd.Index(self.df['id_registro']))
+        try:
+            posicao = posicoes.get_loc(id_registro)
+        except KeyError:
+            return None
+        return self.df.iloc[[posicao]].to_dict('records')[0]
+
+    def get_indice_busca(self) -> IndiceBusca:
+        """Retorna o índice de busca textual dos campos pesquisáveis, criado no primeiro uso."""
+        def indexar():
+            campos = get_campos_pesquisaveis().values()
+            return IndiceBusca(
+                self.df,
+                [config['nome_interno'] for config in campos],
+                valores_ignorados=[config['valor_default'] for config in campos]
+            )
+
+        return self.get_cache('indice_busca', indexar)
+
+
+def calcular_hashes_linhas(df: pd.DataFrame) -> np.ndarray:
+    """Calcula um hash (uint64) dos valores de cada linha do DataFrame, sem o índice."""
+    if not len(df):
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def calcular_hash_conteudo(df: pd.DataFrame, hashes_linhas: Optional[np.ndarray] = None) -> str:
+    """Calcula um hash do conteúdo do DataFrame (colunas e valores, sem o índice)."""
+    if hashes_linhas is None:
+        hashes_linhas = calcular_hashes_linhas(df)
+    digest = hashlib.blake2b(digest_size=10)
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(hashes_linhas.tobytes())
+    return digest.hexdigest()
+
+
+class SnapshotManager:
+    """Mantém o snapshot atual e controla quando ele é recarregado."""
+
+    def __init__(
+        self,
+        carregador: Callable[[], pd.DataFrame],
+        ttl: int = 0,
+        preparar: Optional[Callable[[Snapshot], None]] = None,
+        historico: int = 10,
+        aquecer: Optional[Callable[[Snapshot], None]] = None
+    ):
+        """
+        Args:
+            carregador: Função que lê a planilha e retorna o DataFrame processado
+            ttl: Segundos em que um snapshot é reaproveitado (0 recarrega sempre)
+            preparar: Função chamada pela atualização periódica com o novo
+                      snapshot antes de publicá-lo (ex.: construir índices)
+            historico: Quantidade de versões recentes mantidas para deltas
+            aquecer: Função executada em segundo plano com cada snapshot
+                     publicado sem preparo (recarga feita por uma requisição)
+        """
+        self.carregador = carregador
+        self.ttl = ttl
+        self.preparar = preparar
+        self.aquecer = aquecer
+        self._snapshot: Optional[Snapshot] = None
+        self._historico: Deque[VersaoSnapshot] = deque(maxlen=max(1, historico))
+        self._carregado_em = 0.0
+        self._versoes = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._intervalo = 0
+        self._parar = threading.Event()
+        self._publicado = threading.Condition()
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """Snapshot atual, sem disparar recarga."""
+        return self._snapshot
+
+    @property
+    def atualizacao_periodica_ativa(self) -> bool:
+        """Indica se a thread de atualização periódica está em execução."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def aguardar_snapshot(self, versao: Optional[int], timeout: float) -> Optional[Snapshot]:
+        """
+        Aguarda a publicação de um snapshot diferente da versão informada.
+
+        Não dispara recarga: quem publica é a atualização periódica (ou
+        outra requisição).
+
+        Args:
+            versao: Versão que o chamador já conhece
+            timeout: Tempo máximo de espera, em segundos
+
+        Returns:
+            O snapshot atual, se sua versão for outra; None ao fim do timeout
+        """
+        with self._publicado:
+            self._publicado.wait_for(
+                lambda: self._snapshot is not None and self._snapshot.versao != versao,
+                timeout=timeout
+            )
+            snapshot = self._snapshot
+        if snapshot is None or snapshot.versao == versao:
+            return None
+        return snapshot
+
+    def get_versao(self, versao: int) -> Optional[VersaoSnapshot]:
+        """Resumo de uma versão recente, ou None se ela não estiver mais no histórico."""
+        for resumo in list(self._historico):
+            if resumo.versao == versao:
+                return resumo
+        return None
+
+    def get_snapshot(self, forcar: bool = False) -> Snapshot:
+        """
+        Retorna o snapshot atual, recarregando-o se expirado.
+
+        Args:
+            forcar: Se True, ignora o ttl e relê a planilha
+        """
+        snapshot = self._snapshot
+        recarregado = snapshot is None or forcar or self._expirado()
+        if recarregado:
+            snapshot = self.atualizar(somente_expirado=not forcar)
+        contexto.anotar(snapshot_versao=snapshot.versao, snapshot_linhas=len(snapshot), snapshot_recarregado=recarregado)
+        return snapshot
+
+    def atualizar(self, preparar: bool = False, somente_expirado: bool = False) -> Snapshot:
+        """
+        Lê a planilha e substitui o snapshot atual.
+
+        Args:
+            preparar: Se True, executa `self.preparar` antes de publicar o snapshot
+            somente_expirado: Se True, não relê a planilha quando outra thread
+                              já publicou um snapshot válido enquanto esta
+                              aguardava o lock
+        """
+        with self._lock:
+            atual = self._snapshot
+            if somente_expirado and atual is not None and not self._expirado():
+                return atual
+            df = self.carregador()
+            if atual is not None and df is atual.df:
+                # O carregador reaproveitou o DataFrame: nada mudou na planilha
+                self._carregado_em = time.monotonic()
+                return atual
+
+            with metricas.medir('snapshot_hash'):
+                hashes_linhas = calcular_hashes_linhas(df)
+                hash_conteudo = calcular_hash_conteudo(df, hashes_linhas)
+            self._carregado_em = time.monotonic()
+
+            # Conteúdo inalterado: mantém o snapshot (e tudo que já foi calculado nele)
+            if atual is not None and atual.hash_conteudo == hash_conteudo:
+                logger.debug(f"Snapshot v{atual.versao} inalterado após releitura")
+                return atual
+
+            snapshot = Snapshot(df, next(self._versoes), hash_conteudo, hashes_linhas)
+            if preparar and self.preparar is not None:
+                with metricas.medir('snapshot_preparo'):
+                    self.preparar(snapshot)
+            self._snapshot = snapshot
+            metricas.linhas_snapshot.definir(len(snapshot))
+            metricas.versao_snapshot.definir(snapshot.versao)
+            self._historico.append(snapshot.resumo())
+            with self._publicado:
+                self._publicado.notify_all()
+            logger.info(f"Snapshot v{snapshot.versao} carregado: {len(snapshot)} registros")
+            if not preparar and self.aquecer is not None:
+                threading.Thread(
+                    target=self._aquecer, args=(snapshot,), name="snapshot-aquecer", daemon=True
+                ).start()
+            return snapshot
+
+    def _aquecer(self, snapshot: Snapshot) -> None:
+        # Um snapshot já substituído não é mais servido: não vale o trabalho
+        if self._snapshot is not snapshot:
+            return
+        tokens = contexto.iniciar(f"aquecimento-v{snapshot.versao}")
+        try:
+            with metricas.medir('snapshot_aquecimento'):
+                self.aquecer(snapshot)
+        except Exception as e:
+            logger.error(f"Erro ao aquecer o snapshot v{snapshot.versao}: {str(e)}", exc_info=True)
+        finally:
+            contexto.encerrar(tokens)
+
+    def segundos_ate_expirar(self) -> int:
+        """Segundos até o snapshot atual poder ser substituído (0 se já expirado)."""
+        if self.atualizacao_periodica_ativa:
+            validade = self._intervalo
+        else:
+            validade = self.ttl
+        return max(0, int(validade - (time.monotonic() - self._carregado_em)))
+
+    def iniciar_atualizacao_periodica(self, intervalo: int) -> None:
+        """
+        Inicia uma thread que recarrega o snapshot a cada `intervalo` segundos.
+
+        Args:
+            intervalo: Intervalo entre leituras, em segundos
+        """
+        if self.atualizacao_periodica_ativa:
+            return
+
+        def executar():
+            for ciclo in itertools.count(1):
+                if self._parar.wait(intervalo):
+                    break
+                # Cada ciclo tem seu id nos logs, como uma requisição
+                tokens = contexto.iniciar(f"atualizacao-{ciclo}")
+                try:
+                    self.atualizar(preparar=True)
+                except Exception as e:
+                    logger.error(f"Erro na atualização periódica do snapshot: {str(e)}", exc_info=True)
+                finally:
+                    contexto.encerrar(tokens)
+
+        self._parar.clear()
+        self._intervalo = intervalo
+        self._thread = threading.Thread(target=executar, name="snapshot-refresh", daemon=True)
+        self._thread.start()
+        logger.info(f"Atualização periódica do snapshot iniciada (intervalo: {intervalo}s)")
+
+    def parar_atualizacao_periodica(self) -> None:
+        """Interrompe a thread de atualização periódica."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _expirado(self) -> bool:
+        # Com a atualização periódica ativa a thread mantém o snapshot em dia
+        if self.atualizacao_periodica_ativa:
+            return False
+        return time.monotonic() - self._carregado_em >= self.ttl
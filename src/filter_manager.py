@@ -17,6 +17,7 @@ from .utils.date_utils import (
     format_display_date,
     get_current_time
 )
+from .core.agregacao import MotorAgregacao
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,7 @@ class FiltrosDashboard:
         self.valores_default = get_valores_default()
         self.campos_filtraveis = get_campos_filtraveis()
         self.filtros_ativos = {}
+        self.motor = MotorAgregacao()
 
     def aplicar_filtros(self, df: pd.DataFrame, filtros: Dict[str, Any]) -> pd.DataFrame:
         """Aplica filtros dinâmicos ao DataFrame."""
@@ -51,6 +53,40 @@ class FiltrosDashboard:
             logger.error(f"Erro ao aplicar filtros: {str(e)}")
             return df
 
+    def aplicar_busca(self, df: pd.DataFrame, ids_ranqueados: Any) -> pd.DataFrame:
+        """
+        Restringe o DataFrame aos registros retornados pela busca textual.
+        
+        Args:
+            df: DataFrame (com a coluna id_registro)
+            ids_ranqueados: Ids em ordem de relevância (ver IndiceBusca.buscar_ids)
+            
+        Returns:
+            DataFrame apenas com os registros encontrados, na ordem do ranking
+        """
+        try:
+            posicoes = pd.Index(df['id_registro']).get_indexer(ids_ranqueados)
+            return df.iloc[posicoes[posicoes >= 0]]
+            
+        except Exception as e:
+            logger.error(f"Erro ao aplicar busca textual: {str(e)}")
+            return df
+
+    def converter_filtros(self, parametros: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte filtros indexados pelo nome interno (ex.: parâmetros da API)
+        para o formato de `aplicar_filtros`, ignorando campos não filtráveis.
+        """
+        nomes_internos = {
+            config["nome_interno"]: campo
+            for campo, config in self.campos_filtraveis.items()
+        }
+        return {
+            nomes_internos[nome]: valor
+            for nome, valor in parametros.items()
+            if nome in nomes_internos and valor
+        }
+
     def _aplicar_filtro_data(self, df: pd.DataFrame, campo: str, valor: str) -> pd.DataFrame:
         """Aplica filtro específico para datas."""
         try:
@@ -62,6 +98,9 @@ class FiltrosDashboard:
             else:
                 inicio, fim = format_date_range(valor)
             
+            # Colunas processadas guardam timestamps em ms; as demais, datetimes
+            if pd.api.types.is_numeric_dtype(df[campo]):
+                inicio, fim = format_timestamp(inicio), format_timestamp(fim)
             return df[
                 (df[campo] >= inicio) & 
                 (df[campo] <= fim)
@@ -73,20 +112,17 @@ class FiltrosDashboard:
 
     def gerar_dados_graficos(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Gera dados para gráficos baseados nos campos filtráveis."""
-        dados_graficos = {}
-        
         try:
-            for campo, config in self.campos_filtraveis.items():
-                nome_interno = config["nome_interno"]
-                if config["tipo_filtro"] == "select":
-                    contagem = df[nome_interno].value_counts()
-                    dados_graficos[nome_interno] = {
-                        "labels": contagem.index.tolist(),
-                        "values": contagem.values.tolist(),
-                        "title": config["label"]
-                    }
-            
-            return dados_graficos
+            selecionaveis = {
+                config["nome_interno"]: config
+                for config in self.campos_filtraveis.values()
+                if config["tipo_filtro"] == "select"
+            }
+            contagens = self.motor.contar(df, selecionaveis)
+            return {
+                nome_interno: {**contagens[nome_interno], "title": config["label"]}
+                for nome_interno, config in selecionaveis.items()
+            }
             
         except Exception as e:
             logger.error(f"Erro ao gerar dados para gráficos: {str(e)}")
@@ -1,3 +1,43 @@
+import base64
+import binascii
+import json
+
+import numpy as np
+
+
+def encode_cursor(sort, chave, id_registro):
+    """
+    Gera o cursor opaco que aponta para o último registro de uma página.
+    
+    Args:
+        sort: Ordenação no formato da API (ex.: 'cliente,-data_hora')
+        chave: Valores dos campos de ordenação no último registro
+        id_registro: Id do último registro (critério de desempate)
+    """
+    dados = {'s': sort, 'k': list(chave), 'i': int(id_registro)}
+    texto = json.dumps(dados, separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(texto.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+    
+    Raises:
+        ValueError: Se o cursor estiver malformado
+    """
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        dados = json.loads(texto.decode('utf-8'))
+        return {
+            'sort': dados['s'],
+            'chave': list(dados['k']),
+            'id_registro': int(dados['i'])
+        }
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+
+
 class PaginationManager:
     def get_pagination(self, page, per_page, total_items, max_visible=7):
         """
@@ -51,4 +91,112 @@ class PaginationManager:
             'start': start,
             'end': end,
             'pagination_range': pagination_range
-        }
\ No newline at end of file
+        }
+
+    def get_cursor_pagination(self, ordenacao, per_page, cursor=None):
+        """
+        Calcula uma página por cursor (keyset) sobre registros já ordenados.
+        
+        A posição do cursor é localizada por busca binária em `(chave, id)`,
+        então o custo é O(log n + per_page) independentemente da profundidade
+        da página, e registros acrescentados depois que o cursor foi emitido
+        não deslocam as páginas seguintes.
+        
+        Args:
+            ordenacao: Ordem dos registros (`src.core.ordenacao.Ordenacao`)
+            per_page: Itens por página
+            cursor: Cursor retornado pela página anterior (None para a primeira)
+        
+        Returns:
+            dict com `indices` (posições das linhas da página no DataFrame, na
+            ordem de exibição) e os metadados da página
+        
+        Raises:
+            ValueError: Se o cursor for inválido ou de outra ordenação
+        """
+        total_items = len(ordenacao)
+        per_page = max(1, per_page)
+
+        start = 0
+        if cursor:
+            dados = decode_cursor(cursor)
+            if dados['sort'] != ordenacao.sort:
+                raise ValueError("Cursor não corresponde à ordenação solicitada")
+            start = ordenacao.posicao(dados['chave'], dados['id_registro'], lado='right')
+
+        end = min(start + per_page, total_items)
+        has_next = end < total_items
+
+        next_cursor = None
+        if has_next:
+            ultimo = end - 1
+            next_cursor = encode_cursor(
+                ordenacao.sort, ordenacao.valores_em(ultimo), ordenacao.ids_ordenados[ultimo]
+            )
+
+        return {
+            'total': total_items,
+            'per_page': per_page,
+            'sort': ordenacao.sort,
+            'indices': ordenacao.permutacao[start:end],
+            'has_next': has_next,
+            'next_cursor': next_cursor
+        }
+
+    def get_search_pagination(self, consulta, ids, pontuacoes, per_page, cursor=None):
+        """
+        Calcula uma página por cursor (keyset) sobre o resultado de uma busca.
+        
+        Os registros estão em ordem de relevância (pontuação decrescente e id
+        crescente no empate); o cursor guarda a pontuação e o id do último
+        registro da página, no mesmo formato de `get_cursor_pagination`.
+        
+        Args:
+            consulta: Texto buscado (o cursor só vale para a mesma consulta)
+            ids: `id_registro` dos registros encontrados, em ordem de relevância
+            pontuacoes: Pontuação de cada registro, na mesma ordem
+            per_page: Itens por página
+            cursor: Cursor retornado pela página anterior (None para a primeira)
+        
+        Returns:
+            dict com `indices` (posições em `ids` dos registros da página) e os
+            metadados da página
+        
+        Raises:
+            ValueError: Se o cursor for inválido ou de outra consulta
+        """
+        ids = np.asarray(ids)
+        pontuacoes = np.asarray(pontuacoes, dtype=np.float64)
+        total_items = len(ids)
+        per_page = max(1, per_page)
+        sort = f"relevancia:{consulta}"
+
+        start = 0
+        if cursor:
+            dados = decode_cursor(cursor)
+            if dados['sort'] != sort:
+                raise ValueError("Cursor não corresponde à consulta solicitada")
+            try:
+                pontuacao, = dados['chave']
+                pontuacao = float(pontuacao)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Cursor inválido: {cursor}") from e
+            seguintes = (pontuacoes < pontuacao) | ((pontuacoes == pontuacao) & (ids > dados['id_registro']))
+            start = int(seguintes.argmax()) if seguintes.any() else total_items
+
+        end = min(start + per_page, total_items)
+        has_next = end < total_items
+
+        next_cursor = None
+        if has_next:
+            ultimo = end - 1
+            next_cursor = encode_cursor(sort, [float(pontuacoes[ultimo])], ids[ultimo])
+
+        return {
+            'total': total_items,
+            'per_page': per_page,
+            'sort': 'relevancia',
+            'indices': np.arange(start, end),
+            'has_next': has_next,
+            'next_cursor': next_cursor
+        }
@@ -63,7 +63,7 @@ class DashboardManager {
         if (refreshBtn) {
             refreshBtn.addEventListener('click', async () => {
                 try {
-                    await this.dataManager.loadInitialData();
+                    await this.dataManager.refresh();
                 } catch (error) {
                     console.error('Erro ao atualizar dados:', error);
                     this.showError('Erro ao atualizar dados');
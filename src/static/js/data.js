@@ -24,31 +24,24 @@ class DashboardDataManager {
         };
     }
 
+    // Gráficos exibidos pelo dashboard (ver GRAFICOS_CONFIGURACAO em campos_config)
+    static CHARTS = [
+        'status', 'tipo', 'funcionario', 'cliente', 'sistema',
+        'canal', 'relato', 'solicitacao', 'relatosDetalhados'
+    ];
+
+    // Registros carregados na abertura (limite de per_page em /api/records)
+    static RECORDS_PAGE_SIZE = 1000;
+
     async loadInitialData() {
-        try {
-            const loadingState = document.getElementById('loadingState');
-            const dashboardContent = document.getElementById('dashboardContent');
+        const loadingState = document.getElementById('loadingState');
+        const dashboardContent = document.getElementById('dashboardContent');
 
+        try {
             if (loadingState) loadingState.classList.remove('d-none');
             if (dashboardContent) dashboardContent.classList.add('d-none');
 
-            const response = await fetch('/api/data');
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            
-            const data = await response.json();
-            if (!data || !data.registros) {
-                throw new Error('Dados inválidos recebidos do servidor');
-            }
-
-            // Processa timestamps
-            data.registros = data.registros.map(registro => ({
-                ...registro,
-                data_hora: this.processTimestamp(registro.data_hora)
-            }));
-
-            this.data = data;
+            this.data = await this.fetchAll();
             
             if (loadingState) loadingState.classList.add('d-none');
             if (dashboardContent) dashboardContent.classList.remove('d-none');
@@ -62,6 +55,121 @@ class DashboardDataManager {
         }
     }
 
+    async fetchJson(url, options = {}) {
+        const response = await fetch(url, options);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const data = await response.json();
+        if (!data || data.error) {
+            throw new Error(data?.message || 'Dados inválidos recebidos do servidor');
+        }
+        return data;
+    }
+
+    async fetchCharts() {
+        const respostas = await Promise.all(DashboardDataManager.CHARTS.map(
+            nome => this.fetchJson(`/api/charts/${nome}`)
+        ));
+        const graficos = {};
+        DashboardDataManager.CHARTS.forEach((nome, i) => {
+            graficos[nome] = respostas[i].grafico;
+        });
+        return { graficos, versoes: respostas.map(resposta => resposta.versao) };
+    }
+
+    async fetchRecords() {
+        // Só a primeira página, dos registros mais recentes (o filtro de
+        // período começa no dia atual); os acrescentados depois chegam
+        // pelos deltas de refresh() e do canal de atualizações
+        const params = new URLSearchParams({
+            sort: '-data_hora',
+            format: 'columnar',
+            per_page: DashboardDataManager.RECORDS_PAGE_SIZE
+        });
+        const pagina = await this.fetchJson(`/api/records?${params}`);
+        return {
+            registros: DashboardDataManager.decodeRegistros(pagina.registros),
+            versao: pagina.versao
+        };
+    }
+
+    async fetchAll() {
+        const [resumo, graficos, registros] = await Promise.all([
+            this.fetchJson('/api/kpis'),
+            this.fetchCharts(),
+            this.fetchRecords()
+        ]);
+
+        return {
+            kpis: resumo.kpis,
+            graficos: graficos.graficos,
+            // Processa timestamps
+            registros: registros.registros.map(registro => ({
+                ...registro,
+                data_hora: this.processTimestamp(registro.data_hora)
+            })),
+            // Partes lidas de snapshots diferentes: fica com a mais antiga
+            // para que a próxima verificação recarregue tudo
+            versao: Math.min(resumo.versao, ...graficos.versoes, registros.versao),
+            ultima_atualizacao: Date.now()
+        };
+    }
+
+    async refresh() {
+        // Com a versão atual o servidor envia apenas os registros novos;
+        // KPIs, gráficos e a página de registros só são relidos quando o
+        // delta não se aplica (linhas alteradas ou versão fora do histórico)
+        const versao = this.versao;
+        if (versao !== null) {
+            const params = new URLSearchParams({ since: versao, format: 'columnar' });
+            const data = await this.fetchJson(`/api/data?${params}`, { cache: 'no-cache' });
+            if (data.versao === versao) {
+                return false;
+            }
+            if (data.delta) {
+                return this.update(data);
+            }
+        }
+
+        this.data = await this.fetchAll();
+        document.dispatchEvent(new CustomEvent('dashboardUpdate', { 
+            detail: this.data 
+        }));
+        return true;
+    }
+
+    static decodeRegistros(registros) {
+        // Formato padrão: já é uma lista de registros
+        if (Array.isArray(registros)) {
+            return registros;
+        }
+
+        // Formato colunar: { columns, total, data: {coluna: [...]}, dictionaries: {coluna: [...]} }
+        if (!registros || !Array.isArray(registros.columns) || !registros.data) {
+            return [];
+        }
+
+        const dictionaries = registros.dictionaries || {};
+        const columns = registros.columns.map(name => ({
+            name,
+            values: registros.data[name] || [],
+            dictionary: dictionaries[name]
+        }));
+        const total = registros.total ?? (columns.length ? columns[0].values.length : 0);
+
+        const result = new Array(total);
+        for (let i = 0; i < total; i++) {
+            const registro = {};
+            for (const column of columns) {
+                const value = column.values[i];
+                registro[column.name] = column.dictionary ? column.dictionary[value] : value;
+            }
+            result[i] = registro;
+        }
+        return result;
+    }
+
     processTimestamp(timestamp) {
         if (!timestamp) return null;
         
@@ -107,21 +215,39 @@ class DashboardDataManager {
         });
     }
 
+    get versao() {
+        return this.data.versao ?? null;
+    }
+
     update(newData) {
         if (!newData || !newData.registros) {
             console.error('Dados inválidos para atualização');
-            return;
+            return false;
+        }
+
+        // Delta: só pode ser aplicado sobre a versão a partir da qual foi gerado
+        if (newData.delta && newData.versao_base !== this.versao) {
+            console.warn(`Delta da versão ${newData.versao_base} não se aplica à versão ${this.versao}`);
+            return false;
         }
 
+        newData.registros = DashboardDataManager.decodeRegistros(newData.registros);
+
         // Processa timestamps dos novos dados
         newData.registros = newData.registros.map(registro => ({
             ...registro,
             data_hora: this.processTimestamp(registro.data_hora)
         }));
 
+        if (newData.delta) {
+            // Registros acrescentados vão ao fim; KPIs e gráficos vêm completos
+            newData.registros = this.data.registros.concat(newData.registros);
+        }
+
         this.data = newData;
         document.dispatchEvent(new CustomEvent('dashboardUpdate', { 
             detail: this.data 
         }));
+        return true;
     }
 }
\ No newline at end of file
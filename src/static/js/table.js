@@ -29,8 +29,9 @@ class TableManager {
         });
 
         document.addEventListener('dashboardUpdate', (event) => {
-            if (event.detail && Array.isArray(event.detail.registros)) {
-                this.filteredData = event.detail.registros;
+            if (event.detail && event.detail.registros) {
+                // Aceita tanto a lista de registros quanto o formato colunar da API
+                this.filteredData = DashboardDataManager.decodeRegistros(event.detail.registros);
                 this.updateTable(this.filteredData);
             }
         });
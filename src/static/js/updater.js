@@ -3,6 +3,68 @@ class DashboardUpdater {
         this.setupEventListeners();
         this.isUpdating = false;
         this.timezone = 'America/Sao_Paulo';
+        this.pollInterval = 5 * 60 * 1000;
+        this.pollTimer = null;
+        this.eventSource = null;
+        this.streamRetryTimer = null;
+        this.connectStream();
+    }
+
+    connectStream() {
+        if (!window.EventSource) {
+            this.startPolling();
+            return;
+        }
+
+        const versao = window.dashboardManager?.dataManager?.versao;
+        const url = versao !== null && versao !== undefined ? `/api/stream?since=${versao}` : '/api/stream';
+        this.eventSource = new EventSource(url);
+        this.eventSource.addEventListener('versao', (event) => this.handleStreamEvent(event));
+        this.eventSource.onopen = () => this.stopPolling();
+        this.eventSource.onerror = () => {
+            // 204/503 ou erro definitivo: o navegador não reconecta sozinho.
+            // Usa polling e tenta o canal de novo depois (o limite de
+            // conexões do servidor pode ter sido liberado)
+            if (this.eventSource?.readyState === EventSource.CLOSED) {
+                console.warn('Canal de atualizações indisponível, usando polling');
+                this.eventSource = null;
+                this.startPolling();
+                this.scheduleStreamRetry();
+            }
+        };
+    }
+
+    scheduleStreamRetry() {
+        if (this.streamRetryTimer) return;
+        this.streamRetryTimer = setTimeout(() => {
+            this.streamRetryTimer = null;
+            this.connectStream();
+        }, this.pollInterval);
+    }
+
+    startPolling() {
+        if (this.pollTimer) return;
+        this.pollTimer = setInterval(() => this.updateDashboard(), this.pollInterval);
+    }
+
+    stopPolling() {
+        if (!this.pollTimer) return;
+        clearInterval(this.pollTimer);
+        this.pollTimer = null;
+    }
+
+    handleStreamEvent(event) {
+        try {
+            const dataManager = window.dashboardManager?.dataManager;
+            const data = JSON.parse(event.data);
+            if (!dataManager || data.versao === dataManager.versao) return;
+
+            if (!data.delta || !dataManager.update(data)) {
+                this.updateDashboard();
+            }
+        } catch (error) {
+            console.error('Erro ao processar evento de atualização:', error);
+        }
     }
     
     setupEventListeners() {
@@ -23,26 +85,13 @@ class DashboardUpdater {
                 updateButton.innerHTML = '<i class="fas fa-sync-alt fa-spin"></i> Atualizando...';
             }
 
-            const response = await fetch('/api/data');
-            if (!response.ok) {
-                throw new Error(`Erro ao atualizar dados: ${response.statusText}`);
-            }
-            
-            const data = await response.json();
-            if (!data || !data.registros) {
-                throw new Error('Dados inválidos recebidos do servidor');
-            }
-
-            // Formata datas considerando timezone
-            data.registros = data.registros.map(registro => ({
-                ...registro,
-                data_hora: this.formatDateTime(registro.data_hora)
-            }));
+            const dataManager = window.dashboardManager?.dataManager;
 
-            // Atualiza timestamp de última atualização
-            data.ultima_atualizacao = this.formatDateTime(new Date());
-
-            window.dashboardManager?.dataManager?.update(data);
+            // Pede só o delta desde a versão atual; o restante é relido
+            // quando o delta não se aplica
+            if (dataManager) {
+                await dataManager.refresh();
+            }
             this.showUpdateSuccess();
             
         } catch (error) {
@@ -58,29 +107,6 @@ class DashboardUpdater {
         }
     }
 
-    formatDateTime(dateStr) {
-        if (!dateStr) return null;
-        
-        try {
-            const date = new Date(dateStr);
-            if (isNaN(date.getTime())) return null;
-
-            return date.toLocaleString('pt-BR', {
-                timeZone: this.timezone,
-                year: 'numeric',
-                month: '2-digit',
-                day: '2-digit',
-                hour: '2-digit',
-                minute: '2-digit',
-                second: '2-digit',
-                hour12: false
-            });
-        } catch (error) {
-            console.error('Erro ao formatar data:', error);
-            return null;
-        }
-    }
-    
     showUpdateSuccess() {
         const successAlert = document.getElementById('updateSuccess');
         if (successAlert) {
@@ -0,0 +1,83 @@
+"""
+Corpos de resposta pré-comprimidos
+"""
+from typing import Dict, List
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Níveis de compressão: o custo é pago uma vez por snapshot, não por requisição
+NIVEL_GZIP = 6
+QUALIDADE_BROTLI = 9
+
+# Corpos menores que isso são enviados sem compressão
+TAMANHO_MINIMO_COMPRESSAO = 1024
+
+def _comprimir_gzip(corpo: bytes) -> bytes:
+    # mtime fixo para que o mesmo conteúdo gere sempre os mesmos bytes
+    return gzip.compress(corpo, compresslevel=NIVEL_GZIP, mtime=0)
+
+def _comprimir_brotli(corpo: bytes) -> bytes:
+    return brotli.compress(corpo, quality=QUALIDADE_BROTLI)
+
+# Codificações suportadas, em ordem de preferência do servidor
+COMPRESSORES = {'gzip': _comprimir_gzip}
+if brotli is not None:
+    COMPRESSORES = {'br': _comprimir_brotli, **COMPRESSORES}
+
+def codificacoes_disponiveis() -> List[str]:
+    """Retorna as codificações suportadas, da preferida para a menos preferida."""
+    return list(COMPRESSORES)
+
+
+class CorpoComprimido:
+    """
+    Corpo de resposta serializado e suas versões comprimidas.
+
+    Todas as codificações são geradas na criação do objeto, que fica guardado
+    no snapshot; as requisições apenas escolhem os bytes já prontos.
+    """
+
+    def __init__(self, corpo: bytes, mimetype: str = 'application/json'):
+        """
+        Args:
+            corpo: Corpo serializado, sem compressão
+            mimetype: Tipo do conteúdo
+        """
+        self.mimetype = mimetype
+        self.variantes: Dict[str, bytes] = {'identity': corpo}
+        if len(corpo) >= TAMANHO_MINIMO_COMPRESSAO:
+            for codificacao, comprimir in COMPRESSORES.items():
+                self.variantes[codificacao] = comprimir(corpo)
+
+    def escolher_codificacao(self, accept_encodings) -> str:
+        """
+        Escolhe a codificação pelo cabeçalho Accept-Encoding.
+
+        Args:
+            accept_encodings: `request.accept_encodings` do Werkzeug
+
+        Returns:
+            Codificação disponível com maior qualidade para o cliente;
+            'identity' se nenhuma for aceita
+        """
+        candidatas = [c for c in self.variantes if c != 'identity'] + ['identity']
+        return accept_encodings.best_match(candidatas, default='identity') or 'identity'
+
+    def resposta(self, response_class, accept_encodings):
+        """
+        Monta a resposta com a variante adequada ao cliente.
+
+        Args:
+            response_class: Classe de resposta da aplicação Flask
+            accept_encodings: `request.accept_encodings` do Werkzeug
+        """
+        codificacao = self.escolher_codificacao(accept_encodings)
+        resposta = response_class(self.variantes[codificacao], mimetype=self.mimetype)
+        if codificacao != 'identity':
+            resposta.headers['Content-Encoding'] = codificacao
+        resposta.vary.add('Accept-Encoding')
+        return resposta
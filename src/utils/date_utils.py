@@ -1,9 +1,18 @@
 """
 Utilitário centralizado para manipulação de datas
+
+As funções escalares (format_timestamp, format_date_range...) convertem um
+valor por vez. As versões para arrays (parse_datetimes, format_timestamps,
+day_start_timestamps...) convertem colunas inteiras com NumPy, usando a
+tabela de transições de fuso de TIMEZONE para o intervalo de anos coberto
+pelos dados (ver _tabela_offsets).
 """
-from datetime import datetime, time
-from typing import Optional, Tuple, Union
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Union
 from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
 
 # Timezone padrão (São Paulo/Brasília)
 TIMEZONE = ZoneInfo("America/Sao_Paulo")
@@ -146,4 +155,269 @@ def get_current_time() -> datetime:
     Returns:
         datetime: Data/hora atual
     """
-    return datetime.now(TIMEZONE)
\ No newline at end of file
+    return datetime.now(TIMEZONE)
+
+# ---------------------------------------------------------------------------
+# Conversões em arrays (epoch em milissegundos, horário de TIMEZONE)
+# ---------------------------------------------------------------------------
+
+MS_POR_DIA = 24 * 60 * 60 * 1000
+
+# Timestamp das datas vazias ou inválidas nos DataFrames processados. Fixo
+# (e não o horário atual) para que reprocessar a mesma planilha produza as
+# mesmas linhas; o frontend exibe valores falsos como data ausente
+TIMESTAMP_AUSENTE = 0
+
+# Anos da tabela de transições: antes de 1914 São Paulo usava a hora média
+# local e, depois de 2037, o tzdata não prevê horário de verão; fora desse
+# intervalo vale o offset do ano mais próximo
+ANO_MINIMO_TABELA = 1900
+ANO_MAXIMO_TABELA = 2100
+
+# Intervalo representável por pd.Timestamp, usado na formatação
+_MS_MINIMO = pd.Timestamp.min.value // 10 ** 6 + 1
+_MS_MAXIMO = pd.Timestamp.max.value // 10 ** 6
+
+def _offset_ms(instante: datetime) -> int:
+    return int(instante.astimezone(TIMEZONE).utcoffset() / timedelta(milliseconds=1))
+
+@lru_cache(maxsize=None)
+def _transicoes_ano(ano: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Transições de fuso de TIMEZONE no ano: (instante UTC em ms, offset depois).
+
+    Amostra o offset dia a dia e localiza cada mudança por busca binária até
+    o segundo; o fuso nunca muda duas vezes no mesmo dia.
+    """
+    inicio = datetime(ano, 1, 1, tzinfo=timezone.utc)
+    transicoes = []
+    anterior = _offset_ms(inicio)
+    for dia in range(1, (datetime(ano + 1, 1, 1, tzinfo=timezone.utc) - inicio).days + 1):
+        fim = inicio + timedelta(days=dia)
+        offset = _offset_ms(fim)
+        if offset != anterior:
+            baixo, alto = fim - timedelta(days=1), fim
+            while alto - baixo > timedelta(seconds=1):
+                meio = baixo + (alto - baixo) / 2
+                if _offset_ms(meio) == anterior:
+                    baixo = meio
+                else:
+                    alto = meio
+            transicoes.append((int(alto.timestamp()) * 1000, offset))
+            anterior = offset
+    return tuple(transicoes)
+
+@lru_cache(maxsize=32)
+def _tabela_offsets(ano_inicial: int, ano_final: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tabela de offsets de TIMEZONE entre dois anos (inclusive).
+
+    Returns:
+        (transições em ms UTC, transições em horário local para fold=0,
+        offsets em ms), com `offsets[i]` válido depois de `i` transições
+    """
+    transicoes = [t for ano in range(ano_inicial, ano_final + 1) for t in _transicoes_ano(ano)]
+    utc = np.array([instante for instante, _ in transicoes], dtype=np.int64)
+    offsets = np.array(
+        [_offset_ms(datetime(ano_inicial, 1, 1, tzinfo=timezone.utc))] + [offset for _, offset in transicoes],
+        dtype=np.int64
+    )
+    # Horário local em que cada transição acontece, como no datetime com
+    # fold=0: horários repetidos (fim do horário de verão) e inexistentes
+    # (início) usam o offset anterior à transição
+    local = utc + np.maximum(offsets[:-1], offsets[1:])
+    return utc, local, offsets
+
+def _anos_cobertos(ms: np.ndarray) -> Tuple[int, int]:
+    validos = ms[np.isfinite(ms)] if ms.dtype.kind == 'f' else ms
+    if not len(validos):
+        return 1970, 1970
+    # Um dia de folga para os dois lados, já que o valor pode ser UTC ou local
+    extremos = np.array([validos.min() - MS_POR_DIA, validos.max() + MS_POR_DIA]).astype('datetime64[ms]')
+    anos = np.clip(extremos.astype('datetime64[Y]').astype(np.int64) + 1970, ANO_MINIMO_TABELA, ANO_MAXIMO_TABELA)
+    return int(anos[0]), int(anos[1])
+
+def utc_to_local_ms(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Converte epoch ms (UTC) para o horário de parede de TIMEZONE, também em ms.
+
+    NaN (em arrays float) é preservado.
+    """
+    timestamps = np.asarray(timestamps)
+    utc, _, offsets = _tabela_offsets(*_anos_cobertos(timestamps))
+    validos = np.nan_to_num(timestamps) if timestamps.dtype.kind == 'f' else timestamps
+    return timestamps + offsets[np.searchsorted(utc, validos, side='right')]
+
+def local_to_utc_ms(horarios: np.ndarray) -> np.ndarray:
+    """
+    Converte horários de parede de TIMEZONE (ms desde 1970 no relógio local)
+    para epoch ms UTC, com a mesma regra do datetime com fold=0.
+
+    NaN (em arrays float) é preservado.
+    """
+    horarios = np.asarray(horarios)
+    _, local, offsets = _tabela_offsets(*_anos_cobertos(horarios))
+    validos = np.nan_to_num(horarios) if horarios.dtype.kind == 'f' else horarios
+    return horarios - offsets[np.searchsorted(local, validos, side='right')]
+
+def _datetime64_para_ms(datas: pd.Series) -> np.ndarray:
+    """Datetime64 (NaT = NaN) em ms float, sem o fuso."""
+    ms = datas.to_numpy(dtype='datetime64[ms]').astype(np.int64).astype(np.float64)
+    ms[datas.isna().to_numpy()] = np.nan
+    return ms
+
+# Posições dos dígitos e separadores em 'dd/mm/aaaa HH:MM:SS'
+_POSICOES_DIGITOS = [0, 1, 3, 4, 6, 7, 8, 9, 11, 12, 14, 15, 17, 18]
+_SEPARADORES = {2: '/', 5: '/', 10: ' ', 13: ':', 16: ':'}
+_DIAS_MES = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+def _dias_desde_1970(ano: np.ndarray, mes: np.ndarray, dia: np.ndarray) -> np.ndarray:
+    """Dias entre 1970-01-01 e a data do calendário gregoriano (days_from_civil)."""
+    ano = ano - (mes <= 2)
+    era = np.floor_divide(ano, 400)
+    ano_era = ano - era * 400
+    dia_ano = (153 * (mes + np.where(mes > 2, -3, 9)) + 2) // 5 + dia - 1
+    dia_era = ano_era * 365 + ano_era // 4 - ano_era // 100 + dia_ano
+    return era * 146097 + dia_era - 719468
+
+def _parse_brasileiro_fixo(textos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interpreta, só com aritmética de arrays, os textos exatamente no formato
+    'dd/mm/aaaa HH:MM:SS' (com zeros à esquerda, como grava o Google Forms).
+
+    Returns:
+        (horário local em ms float, máscara dos textos nesse formato); datas
+        no formato mas inexistentes (ex.: 31/02) ficam NaN e dentro da máscara
+    """
+    unicode = textos.astype('U20')
+    no_formato = np.char.str_len(unicode) == 19
+    codigos = unicode.view(np.uint32).reshape(-1, 20)[:, :19].astype(np.int64)
+    for posicao, separador in _SEPARADORES.items():
+        no_formato &= codigos[:, posicao] == ord(separador)
+    digitos = codigos[:, _POSICOES_DIGITOS] - ord('0')
+    no_formato &= ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+
+    d = np.where(no_formato[:, None], digitos, 0)
+    dia, mes = d[:, 0] * 10 + d[:, 1], d[:, 2] * 10 + d[:, 3]
+    ano = d[:, 4] * 1000 + d[:, 5] * 100 + d[:, 6] * 10 + d[:, 7]
+    hora, minuto, segundo = d[:, 8] * 10 + d[:, 9], d[:, 10] * 10 + d[:, 11], d[:, 12] * 10 + d[:, 13]
+
+    bissexto = (ano % 4 == 0) & ((ano % 100 != 0) | (ano % 400 == 0))
+    mes_valido = (mes >= 1) & (mes <= 12)
+    dias_mes = _DIAS_MES[np.where(mes_valido, mes, 0)] + ((mes == 2) & bissexto)
+    valido = (
+        no_formato & mes_valido & (dia >= 1) & (dia <= dias_mes) & (ano >= 1)
+        & (hora < 24) & (minuto < 60) & (segundo < 60)
+    )
+
+    ms = (_dias_desde_1970(ano, mes, dia) * MS_POR_DIA + ((hora * 60 + minuto) * 60 + segundo) * 1000).astype(np.float64)
+    ms[~valido] = np.nan
+    return ms, no_formato
+
+def parse_datetimes(valores: Iterable, formato: str = DATETIME_FORMAT) -> np.ndarray:
+    """
+    Versão em array do parse de datas no formato brasileiro.
+
+    No formato padrão, os textos com zeros à esquerda são convertidos sem
+    passar pelo strptime; os demais (ex.: '2/1/2024 8:05:03') usam o parse
+    do pandas.
+
+    Args:
+        valores: Textos como '02/01/2024 08:05:03', no horário de TIMEZONE
+        formato: Formato strptime dos textos
+
+    Returns:
+        np.ndarray float64 com epoch ms; NaN para valores vazios ou inválidos
+    """
+    textos = pd.Series(valores, dtype=object).fillna('').astype(str).str.strip()
+    if formato == DATETIME_FORMAT:
+        locais, reconhecidos = _parse_brasileiro_fixo(textos.to_numpy(dtype=str))
+    else:
+        locais, reconhecidos = np.full(len(textos), np.nan), np.zeros(len(textos), dtype=bool)
+
+    restantes = ~reconhecidos & (textos != '').to_numpy()
+    if restantes.any():
+        datas = pd.to_datetime(textos[restantes], format=formato, errors='coerce')
+        locais[restantes] = _datetime64_para_ms(datas)
+    return local_to_utc_ms(locais)
+
+def parse_iso_datetimes(valores: Iterable) -> np.ndarray:
+    """
+    Versão em array do parse de datas ISO 8601.
+
+    Valores com offset (ou 'Z') são convertidos pelo próprio offset; valores
+    sem fuso são tratados como horário de TIMEZONE.
+
+    Returns:
+        np.ndarray float64 com epoch ms; NaN para valores vazios ou inválidos
+    """
+    textos = pd.Series(valores, dtype=object).astype(str).str.strip()
+    com_fuso = textos.str.contains(r'(?:Z|[+-]\d{2}:?\d{2})$', regex=True)
+    resultado = np.full(len(textos), np.nan)
+    if com_fuso.any():
+        datas = pd.to_datetime(textos[com_fuso], format='ISO8601', utc=True, errors='coerce')
+        resultado[com_fuso.to_numpy()] = _datetime64_para_ms(datas.dt.tz_localize(None))
+    if (~com_fuso).any():
+        datas = pd.to_datetime(textos[~com_fuso], format='ISO8601', errors='coerce')
+        resultado[~com_fuso.to_numpy()] = local_to_utc_ms(_datetime64_para_ms(datas))
+    return resultado
+
+def format_timestamps(datas: Union[pd.Series, pd.DatetimeIndex, np.ndarray]) -> np.ndarray:
+    """
+    Versão em array de `format_timestamp`: datetimes para epoch ms.
+
+    Datas sem fuso são tratadas como horário de TIMEZONE.
+
+    Returns:
+        np.ndarray float64 com epoch ms; NaN para NaT
+    """
+    datas = pd.Series(pd.to_datetime(datas))
+    if datas.dt.tz is not None:
+        return _datetime64_para_ms(datas.dt.tz_convert('UTC').dt.tz_localize(None))
+    return local_to_utc_ms(_datetime64_para_ms(datas))
+
+def _formatar_locais(timestamps: np.ndarray, formato: str) -> np.ndarray:
+    locais = utc_to_local_ms(np.asarray(timestamps, dtype=np.float64))
+    locais[(locais < _MS_MINIMO) | (locais > _MS_MAXIMO)] = np.nan
+    locais = pd.Series(pd.to_datetime(locais, unit='ms'))
+    return locais.dt.strftime(formato).to_numpy(dtype=object)
+
+def format_display_dates(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Versão em array de `format_display_date`: epoch ms para 'dd/mm/yyyy HH:MM:SS'
+    no horário de TIMEZONE (NaN vira None).
+    """
+    textos = _formatar_locais(timestamps, DATETIME_FORMAT)
+    textos[pd.isna(textos)] = None
+    return textos
+
+def format_iso_dates(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Epoch ms para ISO 8601 com o offset de TIMEZONE em cada instante
+    (ex.: '2024-01-02T08:05:03-03:00'); NaN vira None.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    offsets = (utc_to_local_ms(timestamps) - timestamps) // 60000
+    textos = _formatar_locais(timestamps, '%Y-%m-%dT%H:%M:%S')
+    validos = ~pd.isna(textos)
+    sinais = np.where(offsets < 0, '-', '+')
+    minutos = np.abs(np.nan_to_num(offsets)).astype(np.int64)
+    sufixos = np.char.add(
+        np.char.add(sinais, np.char.zfill((minutos // 60).astype(str), 2)),
+        np.char.add(':', np.char.zfill((minutos % 60).astype(str), 2))
+    )
+    resultado = np.full(len(timestamps), None, dtype=object)
+    resultado[validos] = np.char.add(textos[validos].astype(str), sufixos[validos]).astype(object)
+    return resultado
+
+def day_start_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Início do dia em TIMEZONE (00:00 local, como `get_date_with_min_time`)
+    de cada epoch ms, para agrupar registros por dia.
+
+    Returns:
+        np.ndarray float64 com epoch ms; NaN para NaN
+    """
+    locais = utc_to_local_ms(np.asarray(timestamps, dtype=np.float64))
+    return local_to_utc_ms(np.floor(locais / MS_POR_DIA) * MS_POR_DIA)
+
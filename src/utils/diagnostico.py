@@ -0,0 +1,173 @@
+"""
+Diagnóstico do ambiente do servidor (`python app.py --check`)
+
+Verifica, sem chamar a API do Google, o que a aplicação precisa para
+iniciar: variáveis de ambiente, arquivo de credenciais, planilhas
+configuradas, dependências e diretório de logs. Cada verificação imprime
+uma linha com ✓ (ok), ! (aviso) ou ✗ (erro).
+"""
+from importlib import metadata, util
+from typing import Callable, Optional
+import json
+import os
+import platform
+import sys
+
+# Dependências obrigatórias (módulo, distribuição)
+DEPENDENCIAS = [
+    ('flask', 'flask'),
+    ('pandas', 'pandas'),
+    ('numpy', 'numpy'),
+    ('dotenv', 'python-dotenv'),
+    ('google.oauth2', 'google-auth'),
+    ('googleapiclient', 'google-api-python-client')
+]
+
+# Dependências opcionais: (módulo, distribuição, função que diz se é exigida)
+OPCIONAIS = [
+    ('orjson', 'orjson', lambda config: False),
+    ('brotli', 'brotli', lambda config: False),
+    ('aiohttp', 'aiohttp', lambda config: config["async_reader"]),
+    ('gevent', 'gevent', lambda config: os.getenv('SERVER_WORKER') == 'gevent')
+]
+
+
+class Diagnostico:
+    """Acumula o resultado das verificações e o imprime linha a linha."""
+
+    def __init__(self, saida: Callable[[str], None] = print):
+        self.saida = saida
+        self.erros = 0
+        self.avisos = 0
+
+    def secao(self, titulo: str) -> None:
+        self.saida(f"\n=== {titulo} ===")
+
+    def ok(self, mensagem: str) -> None:
+        self.saida(f"  ✓ {mensagem}")
+
+    def aviso(self, mensagem: str) -> None:
+        self.avisos += 1
+        self.saida(f"  ! {mensagem}")
+
+    def erro(self, mensagem: str) -> None:
+        self.erros += 1
+        self.saida(f"  ✗ {mensagem}")
+
+    def info(self, mensagem: str) -> None:
+        self.saida(f"    {mensagem}")
+
+
+def _versao(distribuicao: str) -> str:
+    try:
+        return f"{distribuicao} {metadata.version(distribuicao)}"
+    except metadata.PackageNotFoundError:
+        return distribuicao
+
+def verificar_credenciais(diag: Diagnostico, caminho: Optional[str]) -> None:
+    if not caminho:
+        diag.erro("GOOGLE_CREDENTIALS_PATH não definido")
+        return
+    caminho_completo = os.path.abspath(caminho)
+    diag.info(f"Caminho: {caminho_completo}")
+    if not os.path.isfile(caminho_completo):
+        diag.erro(f"Arquivo de credenciais não encontrado em: {caminho_completo}")
+        pai = os.path.dirname(caminho_completo)
+        if os.path.isdir(pai):
+            diag.info(f"Conteúdo de {pai}: {', '.join(sorted(os.listdir(pai))) or '(vazio)'}")
+        return
+    try:
+        with open(caminho_completo, 'r', encoding='utf-8') as arquivo:
+            credenciais = json.load(arquivo)
+    except OSError as e:
+        diag.erro(f"Erro ao ler o arquivo de credenciais: {str(e)}")
+        return
+    except json.JSONDecodeError as e:
+        diag.erro(f"Arquivo de credenciais não é um JSON válido: {str(e)}")
+        return
+
+    if credenciais.get('type') != 'service_account':
+        diag.erro(f"Credenciais do tipo {credenciais.get('type')!r}; é esperada uma conta de serviço")
+        return
+    faltando = [campo for campo in ('client_email', 'private_key', 'token_uri') if not credenciais.get(campo)]
+    if faltando:
+        diag.erro(f"Campos ausentes nas credenciais: {', '.join(faltando)}")
+        return
+    # O e-mail da conta de serviço precisa ter acesso às planilhas
+    diag.ok(f"Conta de serviço: {credenciais['client_email']}")
+
+def verificar_planilhas(diag: Diagnostico) -> None:
+    from ..config.campos_config import get_fontes_planilha
+    try:
+        fontes = get_fontes_planilha()
+    except ValueError as e:
+        diag.erro(str(e))
+        return
+    for fonte in fontes:
+        partes = (fonte['url'] or '').split('/')
+        if len(partes) > 5 and partes[4] == 'd' and partes[5]:
+            diag.ok(f"{fonte['nome']}: planilha {partes[5]} ({fonte['range']})")
+        else:
+            diag.erro(f"{fonte['nome']}: URL da planilha inválida ou não definida: {fonte['url']}")
+
+def verificar_dependencias(diag: Diagnostico, config: dict) -> None:
+    for modulo, distribuicao in DEPENDENCIAS:
+        if util.find_spec(modulo.split('.')[0]) is None or util.find_spec(modulo) is None:
+            diag.erro(f"{distribuicao} não instalado")
+        else:
+            diag.ok(_versao(distribuicao))
+    for modulo, distribuicao, exigida in OPCIONAIS:
+        if util.find_spec(modulo) is not None:
+            diag.ok(f"{_versao(distribuicao)} (opcional)")
+        elif exigida(config):
+            diag.erro(f"{distribuicao} não instalado, mas exigido pela configuração")
+        else:
+            diag.aviso(f"{distribuicao} não instalado (opcional)")
+
+def verificar_logs(diag: Diagnostico) -> None:
+    from ..config.logging_config import LOG_DIR
+    if os.access(LOG_DIR, os.W_OK):
+        diag.ok(f"Diretório de logs gravável: {LOG_DIR}")
+    else:
+        diag.erro(f"Sem permissão de escrita em {LOG_DIR}")
+
+def diagnosticar(saida: Callable[[str], None] = print) -> bool:
+    """
+    Executa todas as verificações.
+
+    Returns:
+        True se nenhuma verificação terminou em erro
+    """
+    from ..config.campos_config import GOOGLE_SHEETS_CONFIG
+
+    diag = Diagnostico(saida)
+    diag.secao("Ambiente")
+    diag.info(f"Python {platform.python_version()} ({sys.executable})")
+    diag.info(f"Plataforma: {platform.platform()}")
+    diag.info(f"Encoding do sistema: {sys.getfilesystemencoding()}")
+    diag.info(f"Working Directory: {os.getcwd()}")
+
+    diag.secao("Configuração")
+    for chave, valor in GOOGLE_SHEETS_CONFIG.items():
+        if chave != "scopes":
+            diag.info(f"{chave}: {valor if valor is not None else 'não definido'}")
+    for variavel in ('FLASK_DEBUG', 'SERVER_WORKER', 'PROFILER_SECRET', 'PROFILER_SAMPLE_RATE'):
+        valor = os.getenv(variavel)
+        if variavel == 'PROFILER_SECRET' and valor:
+            valor = '(definido)'
+        diag.info(f"{variavel}: {valor or 'não definido'}")
+
+    diag.secao("Credenciais")
+    verificar_credenciais(diag, GOOGLE_SHEETS_CONFIG["credentials_path"])
+
+    diag.secao("Planilhas")
+    verificar_planilhas(diag)
+
+    diag.secao("Dependências")
+    verificar_dependencias(diag, GOOGLE_SHEETS_CONFIG)
+
+    diag.secao("Logs")
+    verificar_logs(diag)
+
+    saida(f"\n{diag.erros} erro(s), {diag.avisos} aviso(s)")
+    return diag.erros == 0
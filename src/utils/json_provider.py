@@ -0,0 +1,128 @@
+"""
+Provedores de JSON para as respostas Flask
+"""
+from datetime import date
+from typing import Any, Optional
+import dataclasses
+import decimal
+import os
+import uuid
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+def json_default(obj: Any) -> Any:
+    """
+    Converte objetos não suportados nativamente pelo encoder.
+
+    Datas seguem o mesmo formato do provedor padrão do Flask (data HTTP),
+    de modo que a troca de provedor não altera o conteúdo das respostas.
+    """
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+
+    if isinstance(obj, date):
+        return http_date(obj)
+
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """Provedor baseado no módulo json da biblioteca padrão, com suporte a NumPy."""
+
+    default = staticmethod(json_default)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Provedor baseado em orjson.
+
+    Tipos NumPy são serializados pelo próprio orjson (OPT_SERIALIZE_NUMPY);
+    datas, Decimal e demais tipos passam por `json_default`. Chamadas com
+    argumentos específicos do módulo json (ex.: `cls`) usam o provedor padrão.
+
+    Diferente do json padrão, NaN e Infinity são gravados como null. Objetos
+    que o orjson não aceita (inteiros com mais de 64 bits) são serializados
+    pelo provedor padrão.
+    """
+
+    default = staticmethod(json_default)
+
+    def _options(self, indent: bool = False) -> int:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options(indent))
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
+
+
+PROVEDORES_JSON = {
+    'std': NumpyJSONProvider,
+    'orjson': OrjsonProvider
+}
+
+def init_json_provider(app, nome: Optional[str] = None) -> str:
+    """
+    Instala o provedor de JSON na aplicação Flask.
+
+    Args:
+        app: Aplicação Flask
+        nome: 'orjson' ou 'std'. Se omitido, usa a variável JSON_PROVIDER e,
+              na falta dela, orjson quando disponível.
+
+    Returns:
+        Nome do provedor instalado
+    """
+    nome = nome or os.getenv('JSON_PROVIDER') or ('orjson' if orjson is not None else 'std')
+    if nome not in PROVEDORES_JSON:
+        raise ValueError(f"Provedor de JSON desconhecido: {nome}")
+    if nome == 'orjson' and orjson is None:
+        raise ImportError("Provedor 'orjson' solicitado, mas o pacote orjson não está instalado")
+
+    app.json = PROVEDORES_JSON[nome](app)
+    return nome
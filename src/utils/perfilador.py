@@ -0,0 +1,200 @@
+"""
+Perfilamento opcional de requisições em produção (cProfile)
+
+Uma requisição é perfilada quando traz o segredo configurado (cabeçalho
+`X-Profile` ou parâmetro `_profile`) ou quando é sorteada pela amostragem
+de 1 em N. O resultado (.pstats) vai para um diretório que guarda apenas os
+arquivos mais recentes, listados e baixados pelas rotas de administração:
+
+    GET /admin/perfis                  lista os perfis (JSON)
+    GET /admin/perfis/<nome>           baixa o .pstats
+    GET /admin/perfis/<nome>?formato=texto
+                                       funções com maior tempo acumulado
+
+As rotas de administração exigem o segredo (cabeçalho `X-Profile` ou
+parâmetro `token`). Sem segredo e sem amostragem, nada é instalado.
+"""
+from typing import Any, Dict, List, Optional
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from flask import abort, g, jsonify, request, send_file
+
+CABECALHO = 'X-Profile'
+PARAMETRO = '_profile'
+EXTENSAO = '.pstats'
+
+
+class PerfiladorRequisicoes:
+    """Perfila requisições selecionadas e mantém os últimos perfis em disco."""
+
+    def __init__(
+        self,
+        diretorio: str,
+        segredo: Optional[str] = None,
+        amostragem: int = 0,
+        limite_arquivos: int = 50,
+        prefixo_admin: str = '/admin/perfis'
+    ):
+        """
+        Args:
+            diretorio: Onde os perfis são gravados
+            segredo: Valor que habilita o perfil de uma requisição e as rotas
+                     de administração
+            amostragem: Perfila, em média, 1 a cada `amostragem` requisições
+                        (0 desativa)
+            limite_arquivos: Quantidade de perfis mantidos (os mais antigos
+                             são apagados)
+            prefixo_admin: Caminho das rotas de administração
+        """
+        self.diretorio = diretorio
+        self.segredo = segredo or None
+        self.amostragem = max(0, amostragem)
+        self.limite_arquivos = max(1, limite_arquivos)
+        self.prefixo_admin = prefixo_admin.rstrip('/')
+        # O cProfile das versões recentes do Python não admite dois perfis
+        # ativos ao mesmo tempo; requisições concorrentes não são perfiladas
+        self._ativo = threading.Lock()
+
+    @property
+    def habilitado(self) -> bool:
+        return bool(self.segredo or self.amostragem)
+
+    def init_app(self, app) -> bool:
+        """
+        Registra os hooks e as rotas de administração na aplicação.
+
+        Returns:
+            False se o perfilador estiver desabilitado (nada é registrado)
+        """
+        if not self.habilitado:
+            return False
+        os.makedirs(self.diretorio, exist_ok=True)
+        app.before_request(self._iniciar)
+        app.after_request(self._finalizar)
+        app.teardown_request(self._encerrar)
+        app.add_url_rule(self.prefixo_admin, 'perfis_listar', self.listar_view, methods=['GET'])
+        app.add_url_rule(f"{self.prefixo_admin}/<nome>", 'perfis_baixar', self.baixar_view, methods=['GET'])
+        return True
+
+    def _segredo_confere(self, valor: Optional[str]) -> bool:
+        return bool(self.segredo and valor) and hmac.compare_digest(valor.encode('utf-8'), self.segredo.encode('utf-8'))
+
+    def _deve_perfilar(self) -> bool:
+        if request.path.startswith(self.prefixo_admin):
+            return False
+        if self._segredo_confere(request.headers.get(CABECALHO) or request.args.get(PARAMETRO)):
+            return True
+        return bool(self.amostragem) and random.random() < 1 / self.amostragem
+
+    def _iniciar(self) -> None:
+        if not self._deve_perfilar() or not self._ativo.acquire(blocking=False):
+            return
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            # Outro perfilador (ex.: um depurador) já está ativo no processo
+            self._ativo.release()
+            return
+        g.perfil_requisicao = (perfil, time.perf_counter())
+
+    def _finalizar(self, resposta):
+        nome = self._gravar()
+        if nome is not None:
+            resposta.headers['X-Profile-Id'] = nome
+        return resposta
+
+    def _encerrar(self, erro=None) -> None:
+        # Requisições que terminaram com exceção não passam por after_request
+        self._gravar()
+
+    def _gravar(self) -> Optional[str]:
+        """Encerra o perfil da requisição, se houver, e o grava em disco."""
+        ativo = g.pop('perfil_requisicao', None)
+        if ativo is None:
+            return None
+        perfil, inicio = ativo
+        try:
+            perfil.disable()
+        finally:
+            self._ativo.release()
+
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        rota = re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_') or 'raiz'
+        nome = f"{time.strftime('%Y%m%d-%H%M%S')}_{request.method}_{rota[:60]}_{duracao_ms:.0f}ms{EXTENSAO}"
+        perfil.dump_stats(os.path.join(self.diretorio, nome))
+        self._limitar()
+        return nome
+
+    def _limitar(self) -> None:
+        """Apaga os perfis mais antigos além de `limite_arquivos`."""
+        for perfil in self.listar()[self.limite_arquivos:]:
+            try:
+                os.remove(os.path.join(self.diretorio, perfil['nome']))
+            except OSError:
+                pass
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """Perfis gravados, do mais recente para o mais antigo."""
+        perfis = []
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and entrada.name.endswith(EXTENSAO):
+                    info = entrada.stat()
+                    perfis.append({
+                        'nome': entrada.name,
+                        'tamanho': info.st_size,
+                        'criado_em': info.st_mtime
+                    })
+        return sorted(perfis, key=lambda perfil: (perfil['criado_em'], perfil['nome']), reverse=True)
+
+    def _autorizar(self) -> None:
+        if not self._segredo_confere(request.headers.get(CABECALHO) or request.args.get('token')):
+            abort(403)
+
+    def listar_view(self):
+        self._autorizar()
+        return jsonify({'perfis': self.listar(), 'limite': self.limite_arquivos})
+
+    def baixar_view(self, nome: str):
+        self._autorizar()
+        if os.path.basename(nome) != nome or not nome.endswith(EXTENSAO):
+            abort(404)
+        caminho = os.path.join(self.diretorio, nome)
+        if not os.path.isfile(caminho):
+            abort(404)
+
+        if request.args.get('formato') == 'texto':
+            ordem = request.args.get('ordem', 'cumulative')
+            if ordem not in pstats.Stats.sort_arg_dict_default:
+                abort(400)
+            saida = io.StringIO()
+            pstats.Stats(caminho, stream=saida).sort_stats(ordem).print_stats(request.args.get('linhas', 50, type=int))
+            return saida.getvalue(), 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        return send_file(caminho, mimetype='application/octet-stream', as_attachment=True, download_name=nome)
+
+
+def init_perfilador(app, diretorio: Optional[str] = None) -> Optional[PerfiladorRequisicoes]:
+    """
+    Instala o perfilador configurado pelas variáveis de ambiente.
+
+    PROFILER_SECRET (segredo), PROFILER_SAMPLE_RATE (1 em N), PROFILER_DIR
+    (padrão: logs/perfis) e PROFILER_MAX_FILES (padrão: 50).
+
+    Returns:
+        O perfilador instalado, ou None se estiver desabilitado
+    """
+    perfilador = PerfiladorRequisicoes(
+        diretorio=os.getenv('PROFILER_DIR') or diretorio or os.path.join('logs', 'perfis'),
+        segredo=os.getenv('PROFILER_SECRET'),
+        amostragem=int(os.getenv('PROFILER_SAMPLE_RATE', '0')),
+        limite_arquivos=int(os.getenv('PROFILER_MAX_FILES', '50'))
+    )
+    return perfilador if perfilador.init_app(app) else None
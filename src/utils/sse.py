@@ -0,0 +1,36 @@
+"""
+Formatação de mensagens Server-Sent Events (text/event-stream)
+"""
+from typing import Optional, Union
+
+def formatar_evento(
+    dados: Union[bytes, str, None] = None,
+    evento: Optional[str] = None,
+    id_evento: Optional[Union[int, str]] = None,
+    retry: Optional[int] = None
+) -> bytes:
+    """
+    Monta uma mensagem SSE.
+
+    Args:
+        dados: Conteúdo do evento; cada linha vira um campo `data:`
+        evento: Nome do evento (`event:`); omitido, o cliente recebe 'message'
+        id_evento: Id do evento, reenviado pelo navegador em `Last-Event-ID`
+        retry: Tempo de reconexão sugerido ao cliente, em milissegundos
+    """
+    linhas = []
+    if retry is not None:
+        linhas.append(f"retry: {int(retry)}")
+    if id_evento is not None:
+        linhas.append(f"id: {id_evento}")
+    if evento:
+        linhas.append(f"event: {evento}")
+    if dados is not None:
+        if isinstance(dados, bytes):
+            dados = dados.decode('utf-8')
+        linhas.extend(f"data: {linha}" for linha in dados.splitlines() or [''])
+    return ('\n'.join(linhas) + '\n\n').encode('utf-8')
+
+def formatar_comentario(texto: str = '') -> bytes:
+    """Linha de comentário, usada para manter a conexão aberta (keepalive)."""
+    return f": {texto}\n\n".encode('utf-8')
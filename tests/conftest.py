@@ -0,0 +1,20 @@
+"""
+Configuração dos testes: executados a partir da raiz do projeto (pytest)
+"""
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'benchmarks'))
+
+
+@pytest.fixture(autouse=True, scope='session')
+def diretorio_logs(tmp_path_factory):
+    """Os testes que criam a aplicação escrevem os logs fora do logs/ do projeto."""
+    from src.config import logging_config
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(logging_config, 'LOG_DIR', str(tmp_path_factory.mktemp('logs')))
+        yield logging_config.LOG_DIR
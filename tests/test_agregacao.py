@@ -0,0 +1,97 @@
+"""
+Testes do motor de agregação (src/core/agregacao.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from carga import PlanilhaSimulada
+from dados_sinteticos import gerar_planilha
+from src.config.campos_config import LIMITES_GRAFICOS_DASHBOARD
+from src.core.agregacao import AgregadosParciais, MotorAgregacao
+from src.core.dashboard_manager import DashboardManager
+from src.core.data_processor import ProcessadorDados
+
+
+@pytest.fixture(scope='module')
+def df():
+    return ProcessadorDados().preparar_dataframe(gerar_planilha(1500, seed=5))
+
+
+@pytest.mark.parametrize('cortes', [[1], [750], [1, 2, 3], [100, 101, 900, 1499]])
+def test_combinar_partes_igual_a_agregacao_completa(df, cortes):
+    motor = MotorAgregacao()
+    completo = motor.agregar(df)
+
+    limites = [0] + cortes + [len(df)]
+    partes = [motor.agregar(df.iloc[inicio:fim]) for inicio, fim in zip(limites, limites[1:])]
+    combinado = AgregadosParciais()
+    for parte in partes:
+        combinado.combinar(parte)
+
+    assert combinado.total == len(df)
+    assert motor.kpis(combinado) == motor.kpis(completo)
+    assert motor.graficos(combinado) == motor.graficos(completo)
+
+
+def test_copiar_nao_altera_o_original(df):
+    motor = MotorAgregacao()
+    base = motor.agregar(df.iloc[:500])
+    kpis, graficos = motor.kpis(base), motor.graficos(base)
+    base.copiar().combinar(motor.agregar(df.iloc[500:]))
+    assert motor.kpis(base) == kpis
+    assert motor.graficos(base) == graficos
+
+
+def test_grafico_com_limite_e_empates():
+    motor = MotorAgregacao({
+        'cliente': {'campo': 'cliente', 'limite': 2},
+        'dias': {'campo': 'data_hora', 'granularidade': 'dia'},
+    })
+    dia = 1704164400000  # 02/01/2024 00:00 em São Paulo
+    df = pd.DataFrame({
+        'cliente': ['B', 'A', 'C', 'A', 'B', None],
+        'data_hora': [dia + 3600_000, dia + 90_000_000, 0, dia, dia + 7200_000, dia],
+        'status_atendimento': ['Concluído', 'Pendente', 'Concluído', 'Concluído', 'Pendente', 'Concluído'],
+        'funcionario': ['x', 'x', 'y', 'y', 'x', 'y'],
+    })
+    agregados = motor.agregar(df)
+    # Empate entre B e A resolvido pela ordem de ocorrência; nulos ignorados
+    assert motor.grafico(agregados, 'cliente') == {'labels': ['B', 'A'], 'values': [2, 2]}
+    # Data ausente (0) fica fora da linha do tempo
+    assert motor.grafico(agregados, 'dias') == {'labels': [dia, dia + 86_400_000], 'values': [4, 1]}
+    assert motor.kpis(agregados)['total_concluidos'] == 4
+
+    with pytest.raises(ValueError):
+        MotorAgregacao({'x': {'campo': 'data_hora', 'granularidade': 'semana'}})
+
+
+def test_dashboard_manager_limita_as_categorias(df):
+    dados = gerar_planilha(1500, seed=5)
+    processador = ProcessadorDados()
+    registros = pd.DataFrame(dados[1:], columns=dados[0]).rename(columns=processador.mapeamento_colunas)
+    graficos = DashboardManager().processar_dashboard(registros.to_dict('records'))['graficos']
+    completos = processador.motor.graficos(processador.motor.agregar(df))
+
+    # Os 10 mais frequentes no DashboardManager; a API envia todas as categorias
+    for nome, completo in completos.items():
+        assert graficos[nome]['values'] == completo['values'][:LIMITES_GRAFICOS_DASHBOARD.get(nome)]
+    assert len(completos['cliente']['labels']) > 10 == len(graficos['cliente']['labels'])
+
+
+def test_agregacao_incremental_do_snapshot(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=400)
+    cliente = create_app(get_sheets_client=lambda sheet_url=None: planilha).test_client()
+    cliente.get('/api/kpis')
+
+    planilha.dados.extend(gerar_planilha(30, seed=9)[1:])
+    planilha._versao += 1
+    incremental = cliente.get('/api/data').get_json()
+
+    df = ProcessadorDados().preparar_dataframe(planilha.dados)
+    motor = MotorAgregacao()
+    completo = motor.agregar(df)
+    assert incremental['kpis'] == motor.kpis(completo)
+    assert incremental['graficos'] == motor.graficos(completo)
+    assert np.isfinite(incremental['kpis']['tempo_medio'])
@@ -0,0 +1,102 @@
+"""
+Testes dos geradores e utilitários de benchmark (benchmarks/)
+"""
+import datetime
+
+import carga
+import pipeline
+import pytest
+from carga import PlanilhaSimulada
+from dados_sinteticos import DATAS_MALFORMADAS, gerar_planilha
+from src.config.campos_config import MAPEAMENTO_COLUNAS
+from src.core.data_processor import ProcessadorDados
+
+
+def test_planilha_sintetica_deterministica():
+    dados = gerar_planilha(2000, seed=3)
+    assert dados == gerar_planilha(2000, seed=3)
+    assert dados != gerar_planilha(2000, seed=4)
+    assert dados[0] == list(MAPEAMENTO_COLUNAS)
+    assert len(dados) == 2001
+
+
+def test_planilha_sintetica_imita_a_api():
+    dados = gerar_planilha(2000)
+    largura = len(dados[0])
+    assert all(0 < len(linha) <= largura and linha[-1] != '' for linha in dados[1:])
+
+    datas = [linha[0] for linha in dados[1:]]
+    invalidas = [data for data in datas if data in DATAS_MALFORMADAS or data == '']
+    assert 0 < len(invalidas) < len(datas) * 0.05
+
+    # O formulário só acrescenta respostas: datas válidas em ordem cronológica
+    validas = [datetime.datetime.strptime(data, '%d/%m/%Y %H:%M:%S') for data in datas if data not in invalidas]
+    assert validas == sorted(validas)
+
+
+def test_planilha_sintetica_e_processada():
+    df = ProcessadorDados().preparar_dataframe(gerar_planilha(500))
+    assert len(df) == 500
+    assert df['id_registro'].tolist() == list(range(2, 502))
+
+
+def test_etapas_do_pipeline():
+    entradas = pipeline.preparar_entradas(300)
+    for nome, funcao in pipeline.etapas(entradas).items():
+        tempo, pico = pipeline.medir_etapa(funcao, 1)
+        assert tempo >= 0 and pico >= 0, nome
+
+
+def test_comparar_com_baseline():
+    baseline = {'resultados': {'1000': {
+        'preparar': {'tempo_ms': 100.0, 'pico_mb': 10.0},
+        'busca': {'tempo_ms': 1.0, 'pico_mb': 1.0},
+    }}}
+    resultados = {'1000': {
+        'preparar': {'tempo_ms': 150.0, 'pico_mb': 10.5},
+        # Acima do limite relativo, mas dentro da tolerância absoluta
+        'busca': {'tempo_ms': 2.5, 'pico_mb': 1.0},
+        'nova': {'tempo_ms': 500.0, 'pico_mb': 50.0},
+    }}
+    regressoes = pipeline.comparar(resultados, baseline, limite=0.2)
+    assert regressoes == ['1000 linhas / preparar: tempo_ms 100.0 -> 150.0 (+50%)']
+
+
+def test_planilha_simulada_muda_de_versao():
+    planilha = PlanilhaSimulada(linhas=20)
+    versao, dados = planilha.ler_planilha_se_alterada()
+    assert dados == planilha.dados
+    assert planilha.ler_planilha_se_alterada(versao_conhecida=versao) == (versao, None)
+
+    planilha.alterar = True
+    nova_versao, dados = planilha.ler_planilha_se_alterada(versao_conhecida=versao)
+    assert nova_versao != versao
+    assert len(dados) == 22
+    # Em blocos, as linhas vêm em um gerador
+    _, blocos = planilha.ler_planilha_se_alterada(em_blocos=True)
+    assert next(blocos) == planilha.dados
+
+
+def test_planilha_simulada_falha():
+    with pytest.raises(RuntimeError):
+        PlanilhaSimulada(linhas=5, taxa_erro=1.0).get_versao_arquivo()
+
+
+def test_carga_contra_servidor_local(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    planilha = PlanilhaSimulada(linhas=100)
+    snapshot_manager, servidor = carga.iniciar_servidor(planilha)
+    try:
+        snapshot_manager.ttl = 300
+        latencias, status, _ = carga.disparar(
+            '127.0.0.1', servidor.server_port, '/api/kpis', usuarios=2, duracao=0.5, condicional=True
+        )
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    assert len(latencias) == sum(status.values()) > 2
+    # Com If-None-Match, só a primeira resposta de cada usuário traz o corpo
+    assert set(status) == {200, 304}
+    assert status[200] <= 2
+    assert planilha.leituras == 1
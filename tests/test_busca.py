@@ -0,0 +1,112 @@
+"""
+Testes do índice de busca textual e da paginação de /api/search
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from carga import PlanilhaSimulada
+from src.core.busca import IndiceBusca, tokenizar
+
+
+def indice(*textos, ignorados=()):
+    df = pd.DataFrame({
+        'id_registro': np.arange(2, len(textos) + 2),
+        'texto': list(textos),
+    })
+    return IndiceBusca(df, ['texto'], valores_ignorados=ignorados)
+
+
+def test_tokenizar_remove_acentos_e_stopwords():
+    assert tokenizar('Instalação da Impressora, NÃO imprime!') == ['instalacao', 'impressora', 'nao', 'imprime']
+
+
+def test_indice_equivale_a_tokenizar_cada_registro():
+    textos = [
+        'Olá, mundo! erro–crítico “nota” 2º 😀emoji fim',
+        'palavra_composta ' + 'a' * 40 + ' x',
+        '',
+        'separador\x1einterno ao valor',
+        'Não especificado',
+        'cafe\u0301 decomposto',
+        'Olá, mundo! erro–crítico “nota” 2º 😀emoji fim',
+    ]
+    df = pd.DataFrame({
+        'id_registro': np.arange(2, len(textos) + 2),
+        'texto': textos,
+        'outro': ['nota fiscal', None, 'nota fiscal', 'x', '', 'mundo', 'mundo'],
+    })
+    resultado = IndiceBusca(df, ['texto', 'outro', 'inexistente'])
+
+    esperado = {}
+    for linha, (texto, outro) in enumerate(zip(df['texto'], df['outro'].astype(str))):
+        for termo in tokenizar(f'{texto} {outro}'):
+            esperado.setdefault(termo, set()).add(linha)
+    assert {termo: set(linhas.tolist()) for termo, (linhas, _) in resultado._postings.items()} == esperado
+    # Valores repetidos (fatorados) contam em cada linha em que aparecem
+    assert sorted(resultado.buscar_ids('mundo').tolist()) == [2, 7, 8]
+    # Acento combinante (NFD) não quebra a palavra
+    assert resultado.buscar_ids('cafe').tolist() == [7]
+
+
+def test_valores_ignorados_nao_sao_indexados():
+    resultado = indice('Não especificado', 'especificado pelo cliente', ignorados=['Não especificado'])
+    assert resultado.buscar_ids('especificado').tolist() == [3]
+
+
+def test_ranking_bm25():
+    resultado = indice(
+        'erro ao emitir nota fiscal',
+        'erro erro erro no sistema',
+        'impressora sem papel',
+        'erro de impressão na nota fiscal eletrônica com rejeição no sefaz e outros detalhes',
+    )
+    linhas, pontuacoes = resultado.buscar('erro')
+    # Mais ocorrências primeiro; entre uma ocorrência, o texto mais curto
+    assert linhas.tolist() == [1, 0, 3]
+    assert (np.diff(pontuacoes) < 0).all()
+    # Todos os termos precisam aparecer
+    assert resultado.buscar_ids('erro nota').tolist() == [2, 5]
+    assert resultado.buscar_ids('inexistente').tolist() == []
+
+
+def test_prefixo_pesa_menos_que_termo_exato():
+    resultado = indice('impressora', 'impress', 'impressao')
+    linhas, pontuacoes = resultado.buscar('impress')
+    assert linhas[0] == 1
+    assert set(linhas.tolist()) == {0, 1, 2}
+    # Termos curtos não são expandidos
+    assert indice('erro', 'errata').buscar_ids('er').tolist() == []
+
+
+def test_empate_ordenado_pelo_id():
+    resultado = indice('mesmo texto', 'outro', 'mesmo texto', 'mesmo texto')
+    assert resultado.buscar_ids('mesmo').tolist() == [2, 4, 5]
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=500)
+    return create_app(get_sheets_client=lambda sheet_url=None: planilha)
+
+
+def test_busca_paginada_por_cursor(app):
+    cliente = app.test_client()
+    primeira = cliente.get('/api/search?q=erro&per_page=37').get_json()
+    assert 'ids' not in primeira
+    assert len(primeira['registros']) == 37
+
+    ids, pagina = [], primeira
+    while True:
+        ids += [registro['id_registro'] for registro in pagina['registros']]
+        if not pagina['paginacao']['has_next']:
+            break
+        pagina = cliente.get(f"/api/search?q=erro&per_page=37&cursor={pagina['paginacao']['next_cursor']}").get_json()
+
+    snapshot = app.extensions['snapshot_manager'].snapshot
+    assert ids == snapshot.get_indice_busca().buscar_ids('erro').tolist()
+    assert len(ids) == primeira['total']
+
+    outra_consulta = cliente.get(f"/api/search?q=nota&cursor={primeira['paginacao']['next_cursor']}")
+    assert outra_consulta.status_code == 400
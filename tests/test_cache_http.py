@@ -0,0 +1,72 @@
+"""
+Testes das respostas condicionais (ETag, Last-Modified e 304)
+"""
+import pytest
+from carga import PlanilhaSimulada
+
+
+@pytest.fixture
+def planilha():
+    return PlanilhaSimulada(linhas=200)
+
+
+@pytest.fixture
+def cliente(monkeypatch, planilha):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    app = create_app(get_sheets_client=lambda sheet_url=None: planilha)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('url', ['/api/data', '/api/kpis', '/api/charts/status', '/api/records?per_page=20'])
+def test_if_none_match_responde_304(cliente, url):
+    resposta = cliente.get(url)
+    assert resposta.status_code == 200
+    etag = resposta.headers['ETag']
+    assert etag.startswith('W/')
+    assert resposta.headers['X-Snapshot-Version'] == '1'
+    # Sem TTL o snapshot é relido a cada requisição: o cliente sempre revalida
+    assert resposta.headers['Cache-Control'] == 'private, no-cache'
+
+    nao_modificado = cliente.get(url, headers={'If-None-Match': etag})
+    assert nao_modificado.status_code == 304
+    assert nao_modificado.data == b''
+    assert nao_modificado.headers['ETag'] == etag
+
+
+def test_variantes_tem_etags_distintas(cliente):
+    etags = {
+        cliente.get(url).headers['ETag']
+        for url in ('/api/data', '/api/data?format=columnar', '/api/data?fields=cliente', '/api/kpis')
+    }
+    assert len(etags) == 4
+    # A ETag de uma variante não vale para outra
+    colunar = cliente.get('/api/data?format=columnar').headers['ETag']
+    assert cliente.get('/api/data', headers={'If-None-Match': colunar}).status_code == 200
+
+
+def test_nova_versao_invalida_a_etag(cliente, planilha):
+    inicial = cliente.get('/api/data')
+    etag = inicial.headers['ETag']
+
+    planilha.dados.append(list(planilha.dados[-1]))
+    planilha._versao += 1
+    atualizada = cliente.get('/api/data', headers={'If-None-Match': etag})
+    assert atualizada.status_code == 200
+    assert atualizada.headers['ETag'] != etag
+    assert atualizada.headers['X-Snapshot-Version'] == '2'
+    assert len(atualizada.get_json()['registros']) == len(inicial.get_json()['registros']) + 1
+
+
+def test_if_modified_since(cliente):
+    resposta = cliente.get('/api/kpis')
+    modificado_em = resposta.headers['Last-Modified']
+    assert cliente.get('/api/kpis', headers={'If-Modified-Since': modificado_em}).status_code == 304
+
+    cliente.application.extensions['snapshot_manager'].ttl = 300
+    assert cliente.get('/api/kpis').headers['Cache-Control'].startswith('private, max-age=')
+
+    # If-None-Match tem precedência sobre If-Modified-Since
+    assert cliente.get('/api/kpis', headers={
+        'If-None-Match': 'W/"outra"', 'If-Modified-Since': modificado_em
+    }).status_code == 200
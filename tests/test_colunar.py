@@ -0,0 +1,85 @@
+"""
+Testes do formato colunar com dicionários (ProcessadorDados.gerar_registros_colunares
+e format=columnar em /api/data)
+"""
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from carga import PlanilhaSimulada
+from dados_sinteticos import gerar_planilha
+from src.core.data_processor import ProcessadorDados
+
+
+def decodificar(colunar):
+    """Mesmo procedimento de DashboardDataManager.decodeRegistros (data.js)."""
+    dicionarios = colunar['dictionaries']
+    return [
+        {
+            coluna: dicionarios[coluna][colunar['data'][coluna][linha]] if coluna in dicionarios
+            else colunar['data'][coluna][linha]
+            for coluna in colunar['columns']
+        }
+        for linha in range(colunar['total'])
+    ]
+
+
+def sem_nan(valor):
+    """NaN chega ao cliente como null (ver o provedor de JSON)."""
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    if isinstance(valor, dict):
+        return {chave: sem_nan(item) for chave, item in valor.items()}
+    if isinstance(valor, list):
+        return [sem_nan(item) for item in valor]
+    return valor
+
+
+def test_ida_e_volta_com_nulos():
+    df = pd.DataFrame({
+        'id_registro': np.arange(2, 10),
+        # Poucos valores distintos: codificado por dicionário, com nulos
+        'status': ['Concluído', None, 'Pendente', 'Concluído', np.nan, 'Concluído', 'Pendente', None],
+        # Muitos valores distintos: enviado como lista de valores
+        'descricao': ['a', 'b', None, 'd', 'e', 'f', np.nan, 'h'],
+        'nota': [1.5, np.nan, 2.0, 3.0, np.nan, 1.0, 0.5, 2.5],
+    })
+    colunar = ProcessadorDados().gerar_registros_colunares(df)
+    assert set(colunar['dictionaries']) == {'status'}
+
+    recebido = json.loads(json.dumps(sem_nan(colunar)))
+    assert decodificar(recebido) == sem_nan(df.to_dict('records'))
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=300)
+    app = create_app(get_sheets_client=lambda sheet_url=None: planilha)
+    return app.test_client(), planilha
+
+
+def test_api_colunar_igual_a_registros(cliente):
+    cliente, planilha = cliente
+    for parametros in ('', '&fields=*'):
+        colunar = cliente.get(f'/api/data?format=columnar{parametros}').get_json()
+        registros = cliente.get(f'/api/data?format=records{parametros}').get_json()
+        # Células vazias da planilha chegam como '' (nulos: teste acima)
+        assert '' in colunar['registros']['dictionaries']['sistema']
+        assert decodificar(colunar['registros']) == registros['registros']
+        assert colunar['kpis'] == registros['kpis']
+
+    # Delta (since=): só os registros novos, no mesmo formato
+    versao = colunar['versao']
+    planilha.dados.extend(gerar_planilha(7, seed=4)[1:])
+    planilha._versao += 1
+    delta_colunar = cliente.get(f'/api/data?format=columnar&since={versao}').get_json()
+    delta_registros = cliente.get(f'/api/data?format=records&since={versao}').get_json()
+    assert delta_colunar['delta'] is True and delta_colunar['versao_base'] == versao
+    assert delta_colunar['registros']['total'] == 7
+    assert decodificar(delta_colunar['registros']) == delta_registros['registros']
+    completo = cliente.get('/api/data?format=records').get_json()['registros']
+    assert delta_registros['registros'] == completo[-7:]
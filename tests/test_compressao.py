@@ -0,0 +1,99 @@
+"""
+Testes dos corpos pré-comprimidos (src/utils/compressao.py)
+"""
+import gzip
+
+import pytest
+from carga import PlanilhaSimulada
+from flask import Response
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+from src.utils import compressao
+from src.utils.compressao import TAMANHO_MINIMO_COMPRESSAO, CorpoComprimido
+
+CORPO = b'{"registros": [' + b','.join(b'{"cliente": "Empresa %d"}' % (i % 7) for i in range(500)) + b']}'
+
+
+def aceitas(cabecalho):
+    return parse_accept_header(cabecalho, Accept)
+
+
+def test_variantes_descomprimem_para_o_corpo():
+    corpo = CorpoComprimido(CORPO)
+    assert corpo.variantes['identity'] == CORPO
+    assert gzip.decompress(corpo.variantes['gzip']) == CORPO
+    assert len(corpo.variantes['gzip']) < len(CORPO)
+    if compressao.brotli is not None:
+        assert compressao.brotli.decompress(corpo.variantes['br']) == CORPO
+    # Mesmo conteúdo, mesmos bytes (ETag e caches intermediários)
+    assert CorpoComprimido(CORPO).variantes == corpo.variantes
+
+
+def test_corpo_pequeno_nao_e_comprimido():
+    corpo = CorpoComprimido(b'x' * (TAMANHO_MINIMO_COMPRESSAO - 1))
+    assert list(corpo.variantes) == ['identity']
+    assert corpo.escolher_codificacao(aceitas('gzip, br')) == 'identity'
+
+
+@pytest.mark.parametrize('cabecalho, esperada', [
+    ('', 'identity'),
+    ('gzip', 'gzip'),
+    ('deflate', 'identity'),
+    ('gzip;q=0.5, identity;q=1', 'identity'),
+    ('gzip;q=0', 'identity'),
+])
+def test_escolher_codificacao(cabecalho, esperada):
+    assert CorpoComprimido(CORPO).escolher_codificacao(aceitas(cabecalho)) == esperada
+
+
+@pytest.mark.skipif(compressao.brotli is None, reason='brotli ausente')
+def test_brotli_preferido_quando_aceito():
+    corpo = CorpoComprimido(CORPO)
+    assert corpo.escolher_codificacao(aceitas('gzip, deflate, br')) == 'br'
+    assert corpo.escolher_codificacao(aceitas('br;q=0.1, gzip')) == 'gzip'
+
+    resposta = corpo.resposta(Response, aceitas('br'))
+    assert resposta.headers['Content-Encoding'] == 'br'
+    assert resposta.headers['Vary'] == 'Accept-Encoding'
+
+
+def test_api_reaproveita_o_corpo_comprimido(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=300)
+    cliente = create_app(get_sheets_client=lambda sheet_url=None: planilha).test_client()
+
+    comprimida = cliente.get('/api/data', headers={'Accept-Encoding': 'gzip'})
+    assert comprimida.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in comprimida.headers['Vary']
+    simples = cliente.get('/api/data')
+    assert 'Content-Encoding' not in simples.headers
+    assert gzip.decompress(comprimida.data) == simples.data
+
+    # A segunda requisição comprimida recebe os mesmos bytes
+    assert cliente.get('/api/data', headers={'Accept-Encoding': 'gzip'}).data == comprimida.data
+
+
+def test_corpos_por_projecao_normalizados_e_limitados(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    import app as modulo_app
+    monkeypatch.setattr(modulo_app, 'CORPOS_DADOS_POR_SNAPSHOT', 2)
+    planilha = PlanilhaSimulada(linhas=50)
+    app = modulo_app.create_app(get_sheets_client=lambda sheet_url=None: planilha)
+    cliente = app.test_client()
+
+    def corpos():
+        snapshot = app.extensions['snapshot_manager'].snapshot
+        return [chave[1] for chave in snapshot._cache if isinstance(chave, tuple) and chave[0] == 'corpo']
+
+    # Ordem e repetições dos campos não criam outra representação
+    primeira = cliente.get('/api/data?fields=cliente,id_registro')
+    segunda = cliente.get('/api/data?fields=id_registro, cliente,cliente')
+    assert primeira.headers['ETag'] == segunda.headers['ETag']
+    assert set(primeira.get_json()['registros'][0]) == {'id_registro', 'cliente'}
+    assert corpos() == [('id_registro', 'cliente')]
+
+    cliente.get('/api/data?fields=sistema')
+    cliente.get('/api/data?fields=id_registro,cliente')
+    cliente.get('/api/data?fields=canal_atendimento')
+    assert sorted(corpos()) == [('canal_atendimento',), ('id_registro', 'cliente')]
@@ -0,0 +1,111 @@
+"""
+Testes do contexto da requisição e do resumo registrado no log (src/core/contexto.py)
+"""
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from carga import PlanilhaSimulada
+from src.core import contexto
+from src.core.logger import FiltroContexto, FormatadorJSON, FormatadorTexto
+
+
+def test_fora_de_requisicao_nada_e_registrado():
+    assert contexto.id_requisicao() is None
+    assert contexto.resumo() is None
+    contexto.registrar_etapa('json', 0.1)
+    contexto.somar('linhas', 1)
+
+
+def test_propagar_compartilha_o_resumo_entre_threads():
+    tokens = contexto.iniciar('abc')
+    try:
+        vistos = []
+
+        def etapa(indice):
+            vistos.append(contexto.id_requisicao())
+            contexto.registrar_etapa('processamento', 0.5)
+            contexto.somar('linhas_processadas', indice)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(contexto.propagar(etapa), range(4)))
+        # Sem `propagar`, a thread nova não vê a requisição
+        thread = threading.Thread(target=lambda: vistos.append(contexto.id_requisicao()))
+        thread.start()
+        thread.join()
+
+        assert vistos == ['abc'] * 4 + [None]
+        assert contexto.resumo().como_dict() == {
+            'linhas_processadas': 6,
+            'etapas_ms': {'processamento': 2000.0},
+            'cache': {}
+        }
+    finally:
+        contexto.encerrar(tokens)
+    assert contexto.id_requisicao() is None
+
+
+def test_formatadores_incluem_id_e_resumo():
+    try:
+        raise ValueError('falha')
+    except ValueError:
+        registro = logging.LogRecord('app', logging.ERROR, __file__, 1, 'GET /api/data 500', None, sys.exc_info())
+    registro.id_requisicao = 'abc'
+    registro.resumo = {'status': 500, 'etapas_ms': {'json': 1.5}}
+
+    dados = json.loads(FormatadorJSON().format(registro))
+    assert dados['id_requisicao'] == 'abc'
+    assert dados['resumo'] == {'status': 500, 'etapas_ms': {'json': 1.5}}
+    assert dados['excecao'].endswith('ValueError: falha')
+
+    sem_id = logging.LogRecord('app', logging.INFO, __file__, 1, 'mensagem', None, None)
+    assert FiltroContexto().filter(sem_id)
+    assert FormatadorTexto('[%(id_requisicao)s] %(message)s', None).format(sem_id) == '[-] mensagem'
+
+
+class Captura(logging.Handler):
+    """Guarda os registros com o id da requisição visto ao registrá-los."""
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append((contexto.id_requisicao(), record))
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=100)
+    return create_app(get_sheets_client=lambda sheet_url=None: planilha).test_client()
+
+
+def test_um_resumo_por_requisicao(cliente):
+    captura = Captura()
+    logger = logging.getLogger('app')
+    nivel = logger.level
+    logger.addHandler(captura)
+    logger.setLevel(logging.INFO)
+    try:
+        aceito = cliente.get('/api/kpis', headers={'X-Request-ID': 'proxy-123'})
+        substituido = cliente.get('/api/kpis', headers={'X-Request-ID': 'inválido com espaço'})
+    finally:
+        logger.removeHandler(captura)
+        logger.setLevel(nivel)
+
+    assert aceito.headers['X-Request-ID'] == 'proxy-123'
+    assert substituido.headers['X-Request-ID'] not in ('', 'inválido com espaço')
+
+    resumos = [(id_requisicao, registro.resumo) for id_requisicao, registro in captura.registros if hasattr(registro, 'resumo')]
+    assert [id_requisicao for id_requisicao, _ in resumos] == ['proxy-123', substituido.headers['X-Request-ID']]
+    primeiro = resumos[0][1]
+    assert primeiro['rota'] == '/api/kpis'
+    assert primeiro['status'] == 200
+    assert 'carregamento' in primeiro['etapas_ms']
+    # A segunda requisição reaproveita o corpo do mesmo snapshot
+    assert resumos[1][1]['cache']['corpo'] == {'acertos': 1, 'falhas': 0}
@@ -0,0 +1,86 @@
+"""
+Testes das conversões de datas em arrays (src/utils/date_utils.py), com
+atenção às transições do horário de verão de São Paulo
+"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from src.utils.date_utils import (
+    DATETIME_FORMAT, TIMEZONE, day_start_timestamps, format_display_dates, format_iso_dates,
+    format_timestamp, get_date_with_min_time, local_to_utc_ms, parse_datetimes, utc_to_local_ms
+)
+
+# Início (00:00 vira 01:00) e fim (00:00 volta a 23:00 do dia anterior)
+# do horário de verão, mais um ano sem horário de verão e um fora da tabela
+INICIOS_VERAO = [datetime(2018, 11, 4), datetime(2017, 10, 15)]
+FINS_VERAO = [datetime(2019, 2, 17), datetime(2018, 2, 18)]
+SEM_VERAO = [datetime(2023, 11, 5), datetime(2150, 6, 1)]
+
+
+def horarios_ao_redor(momento, horas=3, passo=timedelta(minutes=15)):
+    atual, fim = momento - timedelta(hours=horas), momento + timedelta(hours=horas)
+    while atual <= fim:
+        yield atual
+        atual += passo
+
+
+def ms_escalar(local):
+    """Referência: datetime com fold=0, como no restante do módulo."""
+    return format_timestamp(local.replace(tzinfo=TIMEZONE))
+
+
+@pytest.mark.parametrize('momento', INICIOS_VERAO + FINS_VERAO + SEM_VERAO)
+def test_parse_igual_ao_escalar(momento):
+    locais = list(horarios_ao_redor(momento))
+    textos = [local.strftime(DATETIME_FORMAT) for local in locais]
+    assert parse_datetimes(textos).tolist() == [ms_escalar(local) for local in locais]
+
+
+def test_horario_inexistente_e_repetido():
+    # 04/11/2018 00:30 não existe: fold=0 usa o offset anterior (-03:00)
+    inexistente = parse_datetimes(['04/11/2018 00:30:00'])[0]
+    assert inexistente == datetime(2018, 11, 4, 3, 30, tzinfo=timezone.utc).timestamp() * 1000
+    # 16/02/2019 23:30 acontece duas vezes: fold=0 é a primeira (-02:00)
+    repetido = parse_datetimes(['16/02/2019 23:30:00'])[0]
+    assert repetido == datetime(2019, 2, 17, 1, 30, tzinfo=timezone.utc).timestamp() * 1000
+
+
+@pytest.mark.parametrize('momento', INICIOS_VERAO + FINS_VERAO + SEM_VERAO)
+def test_utc_para_local_igual_ao_zoneinfo(momento):
+    inicio = momento.replace(tzinfo=timezone.utc)
+    instantes = [inicio + timedelta(minutes=minutos) for minutos in range(-300, 301, 10)]
+    utc = np.array([instante.timestamp() * 1000 for instante in instantes])
+    esperado = [
+        instante.astimezone(TIMEZONE).replace(tzinfo=timezone.utc).timestamp() * 1000
+        for instante in instantes
+    ]
+    assert utc_to_local_ms(utc).tolist() == esperado
+    assert format_display_dates(utc).tolist() == [
+        instante.astimezone(TIMEZONE).strftime(DATETIME_FORMAT) for instante in instantes
+    ]
+
+
+def test_ida_e_volta_fora_do_horario_repetido():
+    utc = np.array([ms_escalar(local) for local in horarios_ao_redor(datetime(2018, 11, 4), horas=48)], dtype=np.float64)
+    assert local_to_utc_ms(utc_to_local_ms(utc)).tolist() == utc.tolist()
+
+
+def test_inicio_do_dia_no_dia_sem_meia_noite():
+    # Em 04/11/2018 o dia começa às 01:00 (-02:00)
+    meio_dia = ms_escalar(datetime(2018, 11, 4, 12))
+    inicio = day_start_timestamps(np.array([meio_dia]))[0]
+    assert inicio == format_timestamp(get_date_with_min_time('2018-11-04'))
+    assert format_iso_dates(np.array([inicio])).tolist() == ['2018-11-04T01:00:00-02:00']
+
+
+def test_datas_invalidas_e_fora_do_formato_fixo():
+    resultado = parse_datetimes([
+        '29/02/2024 10:00:00', '29/02/2023 10:00:00', '31/04/2024 10:00:00',
+        '2/1/2024 8:05:03', '', None, 'ontem', '10/10/2024 24:00:00'
+    ])
+    assert resultado[0] == ms_escalar(datetime(2024, 2, 29, 10))
+    assert resultado[3] == ms_escalar(datetime(2024, 1, 2, 8, 5, 3))
+    assert np.isnan(resultado[[1, 2, 4, 5, 6, 7]]).all()
+    assert format_display_dates(np.array([np.nan])).tolist() == [None]
+    assert format_iso_dates(np.array([np.nan])).tolist() == [None]
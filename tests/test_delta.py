@@ -0,0 +1,58 @@
+"""
+Testes das atualizações por delta de /api/data (since=<versao>)
+"""
+import pandas as pd
+import pytest
+from carga import PlanilhaSimulada
+from src.core.data_processor import ProcessadorDados
+from src.utils.date_utils import TIMESTAMP_AUSENTE
+
+
+@pytest.fixture
+def planilha():
+    planilha = PlanilhaSimulada(linhas=300)
+    # Datas vazias e inválidas nas linhas já existentes
+    planilha.dados[1][0] = ''
+    planilha.dados[2][0] = 'ontem'
+    return planilha
+
+
+@pytest.fixture
+def cliente(monkeypatch, planilha):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    app = create_app(get_sheets_client=lambda sheet_url=None: planilha)
+    return app.test_client()
+
+
+def test_reprocessar_datas_invalidas_e_deterministico(planilha):
+    processador = ProcessadorDados()
+    primeiro = processador.preparar_dataframe(planilha.dados)
+    segundo = processador.preparar_dataframe(planilha.dados)
+    pd.testing.assert_frame_equal(primeiro, segundo)
+    assert (primeiro['data_hora'].iloc[:2] == TIMESTAMP_AUSENTE).all()
+
+
+def test_linhas_acrescentadas_retornam_delta(cliente, planilha):
+    inicial = cliente.get('/api/data').get_json()
+    assert inicial['delta'] is False
+    ultimo_id = inicial['registros'][-1]['id_registro']
+
+    planilha.dados.append(list(planilha.dados[-1]))
+    planilha._versao += 1
+    delta = cliente.get(f"/api/data?since={inicial['versao']}").get_json()
+
+    assert delta['versao'] == inicial['versao'] + 1
+    assert delta['delta'] is True
+    assert len(delta['registros']) == 1
+    assert delta['registros'][0]['id_registro'] == ultimo_id + 1
+    # KPIs do delta (agregação incremental) iguais aos de uma leitura completa
+    completo = cliente.get('/api/data').get_json()
+    assert delta['kpis'] == completo['kpis']
+    assert delta['graficos'] == completo['graficos']
+
+
+def test_releitura_sem_alteracao_mantem_a_versao(cliente, planilha):
+    inicial = cliente.get('/api/kpis').get_json()
+    planilha._versao += 1  # versão do arquivo muda, conteúdo não
+    assert cliente.get('/api/kpis').get_json()['versao'] == inicial['versao']
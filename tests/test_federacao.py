@@ -0,0 +1,90 @@
+"""
+Testes da leitura federada de várias planilhas (src/core/federacao.py)
+"""
+import pandas as pd
+import pytest
+from dados_sinteticos import gerar_planilha
+from src.core import data_processor
+from src.core.data_processor import ProcessadorDados
+from src.core.federacao import MULTIPLICADOR_ID, CarregadorFederado
+
+FONTES = [{'nome': 'a', 'url': 'url-a', 'range': 'A:Z'}, {'nome': 'b', 'url': 'url-b', 'range': 'A:Z'}]
+
+
+class Planilhas:
+    """Leitor de fontes em memória, com versão por planilha como no Drive."""
+
+    def __init__(self):
+        self.dados = {'a': gerar_planilha(40), 'b': gerar_planilha(30)}
+        self.versoes = {'a': 1, 'b': 1}
+        self.leituras = []
+
+    def alterar(self, nome):
+        self.dados[nome] = self.dados[nome] + [list(self.dados[nome][-1])]
+        self.versoes[nome] += 1
+
+    def __call__(self, fonte, versao_conhecida):
+        nome = fonte['nome']
+        versao = str(self.versoes[nome])
+        if versao == versao_conhecida:
+            return versao, None
+        self.leituras.append(nome)
+        return versao, self.dados[nome]
+
+
+class ProcessadorFalho(ProcessadorDados):
+    def __init__(self):
+        super().__init__()
+        self.falhas = 0
+
+    def preparar_dataframe(self, dados_brutos, *args, **kwargs):
+        if self.falhas:
+            self.falhas -= 1
+            raise ValueError("falha simulada")
+        return super().preparar_dataframe(dados_brutos, *args, **kwargs)
+
+
+def test_fontes_sem_alteracao_nao_sao_relidas():
+    planilhas = Planilhas()
+    carregador = CarregadorFederado(FONTES, planilhas)
+    primeiro = carregador.carregar()
+    assert len(primeiro) == 40 + 30
+    assert primeiro.loc[primeiro['fonte'] == 'b', 'id_registro'].min() == MULTIPLICADOR_ID + 2
+
+    planilhas.leituras.clear()
+    assert carregador.carregar() is primeiro
+    assert planilhas.leituras == []
+
+    planilhas.alterar('b')
+    assert len(carregador.carregar()) == 40 + 31
+    assert planilhas.leituras == ['b']
+
+
+def test_falha_no_processamento_nao_marca_a_versao_como_lida():
+    planilhas = Planilhas()
+    processador = ProcessadorFalho()
+    carregador = CarregadorFederado(FONTES, planilhas, processador=processador)
+    carregador.carregar()
+
+    planilhas.alterar('a')
+    processador.falhas = 1
+    with pytest.raises(ValueError):
+        carregador.carregar()
+
+    # A versão nova ainda não foi processada: a fonte é lida de novo
+    planilhas.leituras.clear()
+    assert len(carregador.carregar()) == 41 + 30
+    assert planilhas.leituras == ['a']
+
+
+def test_fontes_processadas_no_pool_do_processador(monkeypatch):
+    monkeypatch.setattr(data_processor, 'nucleos_disponiveis', lambda: 2)
+    processador = ProcessadorDados(processos=2)
+    try:
+        paralelo = CarregadorFederado(FONTES, Planilhas(), processador=processador).carregar()
+        assert processador._paralelo is not None
+    finally:
+        processador.encerrar()
+
+    serial = CarregadorFederado(FONTES, Planilhas()).carregar()
+    pd.testing.assert_frame_equal(paralelo, serial)
@@ -0,0 +1,91 @@
+"""
+Testes dos provedores de JSON das respostas (src/utils/json_provider.py)
+"""
+import dataclasses
+import decimal
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from flask import Flask, jsonify
+from src.utils import json_provider
+from src.utils.json_provider import init_json_provider
+
+
+@dataclasses.dataclass
+class Ponto:
+    x: int
+    y: float
+
+
+def conteudo():
+    return {
+        'inteiro': np.int64(7),
+        'real': np.float32(0.5),
+        'booleano': np.bool_(True),
+        'vetor': np.arange(3),
+        'matriz': np.array([[1.5, 2.0], [3.0, 4.0]]),
+        'data': datetime(2024, 3, 10, 14, 30, tzinfo=timezone.utc),
+        'decimal': decimal.Decimal('1.10'),
+        'uuid': uuid.UUID(int=1),
+        'ponto': Ponto(1, 2.5),
+        'texto': 'Não especificado',
+    }
+
+
+def resposta(nome):
+    app = Flask(__name__)
+    assert init_json_provider(app, nome) == nome
+    with app.app_context():
+        return jsonify(conteudo())
+
+
+@pytest.mark.parametrize('nome', [
+    'std',
+    pytest.param('orjson', marks=pytest.mark.skipif(json_provider.orjson is None, reason='orjson ausente')),
+])
+def test_tipos_serializados(nome):
+    dados = resposta(nome).get_json()
+    assert dados == {
+        'inteiro': 7,
+        'real': 0.5,
+        'booleano': True,
+        'vetor': [0, 1, 2],
+        'matriz': [[1.5, 2.0], [3.0, 4.0]],
+        'data': 'Sun, 10 Mar 2024 14:30:00 GMT',
+        'decimal': '1.10',
+        'uuid': '00000000-0000-0000-0000-000000000001',
+        'ponto': {'x': 1, 'y': 2.5},
+        'texto': 'Não especificado',
+    }
+
+
+@pytest.mark.skipif(json_provider.orjson is None, reason='orjson ausente')
+def test_orjson_equivale_ao_padrao():
+    assert resposta('orjson').get_json() == resposta('std').get_json()
+    app = Flask(__name__)
+    init_json_provider(app, 'orjson')
+    # Argumentos do módulo json usam o provedor padrão
+    assert app.json.dumps({'b': 1, 'a': 2}, sort_keys=True, indent=None) == '{"a": 2, "b": 1}'
+
+
+def test_provedor_invalido(monkeypatch):
+    with pytest.raises(ValueError):
+        init_json_provider(Flask(__name__), 'ujson')
+    monkeypatch.delenv('JSON_PROVIDER', raising=False)
+    monkeypatch.setattr(json_provider, 'orjson', None)
+    with pytest.raises(ImportError):
+        init_json_provider(Flask(__name__), 'orjson')
+    assert init_json_provider(Flask(__name__)) == 'std'
+
+
+@pytest.mark.skipif(json_provider.orjson is None, reason='orjson ausente')
+def test_orjson_recorre_ao_padrao_com_inteiro_grande():
+    app = Flask(__name__)
+    init_json_provider(app, 'orjson')
+    with app.app_context():
+        dados = {'id': 2 ** 70, 'vetor': np.arange(2)}
+        assert jsonify(dados).get_json() == {'id': 2 ** 70, 'vetor': [0, 1]}
+        # NaN vira null com orjson
+        assert jsonify({'media': float('nan')}).get_json() == {'media': None}
@@ -0,0 +1,110 @@
+"""
+Testes do log centralizado (src/core/logger.py)
+"""
+import logging
+import queue
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from conftest import BASE_DIR
+from src.config.campos_config import GOOGLE_SHEETS_CONFIG
+from src.core.logger import HandlerEspera, HandlerFila, LoggerManager
+
+
+def registro(nivel, mensagem):
+    return logging.LogRecord('teste', nivel, __file__, 0, mensagem, None, None)
+
+
+def test_importar_modulos_nao_inicia_o_log():
+    # Processo separado: aqui o log pode já ter sido iniciado por outro teste
+    codigo = textwrap.dedent("""
+        import logging, threading
+        import src.core.data_processor, src.core.snapshot, src.core.processamento_paralelo
+        from src.core.logger import log_manager
+        logging.getLogger('teste').warning('antes do início')
+        assert log_manager.ouvinte is None
+        assert not any(isinstance(h, logging.FileHandler) for h in logging.getLogger().handlers)
+        assert [t.name for t in threading.enumerate()] == ['MainThread']
+        assert len(log_manager.espera.registros) == 1
+    """)
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=BASE_DIR, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    # Sem o lastResort do logging: nada vai para o stderr antes do início
+    assert 'antes do início' not in resultado.stderr
+
+
+def test_handler_espera_guarda_os_ultimos_registros():
+    handler = HandlerEspera(limite=2)
+    for mensagem in ('a', 'b', 'c'):
+        handler.handle(logging.LogRecord('teste', logging.WARNING, __file__, 0, mensagem, None, None))
+    assert [registro.getMessage() for registro in handler.registros] == ['b', 'c']
+    assert all(registro.id_requisicao == '-' for registro in handler.registros)
+
+
+def test_fila_cheia_descarta_e_avisa():
+    fila = queue.Queue(maxsize=2)
+    handler = HandlerFila(fila, espera_alertas=0.01)
+    antes = {nivel: handler.descartados.valor(nivel=nivel) for nivel in ('INFO', 'WARNING')}
+
+    for mensagem in 'abcd':
+        handler.handle(registro(logging.INFO, mensagem))
+    # WARNING espera `espera_alertas` por espaço antes de ser descartado
+    handler.handle(registro(logging.WARNING, 'alerta'))
+    assert [fila.get_nowait().getMessage() for _ in range(2)] == ['a', 'b']
+    assert handler.descartados.valor(nivel='INFO') - antes['INFO'] == 2
+    assert handler.descartados.valor(nivel='WARNING') - antes['WARNING'] == 1
+
+    # Com espaço na fila, o registro seguinte leva junto o aviso dos descartes
+    handler.handle(registro(logging.INFO, 'e'))
+    assert [fila.get_nowait().getMessage() for _ in range(2)] == ['e', '3 registros de log descartados (fila cheia)']
+    assert fila.empty()
+
+
+def test_alerta_aguarda_espaco_na_fila():
+    fila = queue.Queue(maxsize=1)
+    handler = HandlerFila(fila, espera_alertas=5)
+    handler.handle(registro(logging.INFO, 'ocupa'))
+    threading.Timer(0.05, fila.get_nowait).start()
+    handler.handle(registro(logging.ERROR, 'erro'))
+    assert fila.get(timeout=1).getMessage() == 'erro'
+
+
+def test_parar_escreve_a_fila_e_o_aviso_de_descartes(tmp_path, monkeypatch):
+    monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, 'log_format', 'texto')
+    monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, 'log_queue_size', 5)
+    raiz = logging.getLogger()
+    nivel = raiz.level
+    logger = logging.getLogger('teste_parar')
+    monkeypatch.setattr(logger, 'propagate', False)
+
+    manager = LoggerManager()
+    manager.iniciar(tmp_path)
+    try:
+        # Só os registros deste logger vão para a fila do gerenciador de teste
+        raiz.removeHandler(manager.handler)
+        logger.addHandler(manager.handler)
+
+        # Com o handler de arquivo travado, a thread de escrita para no primeiro registro
+        arquivo = manager.ouvinte.handlers[0]
+        arquivo.acquire()
+        try:
+            logger.info('mensagem 0')
+            limite = time.monotonic() + 5
+            while not manager.fila.empty() and time.monotonic() < limite:
+                time.sleep(0.01)
+            for indice in range(1, 20):
+                logger.info(f'mensagem {indice}')
+        finally:
+            arquivo.release()
+        manager.parar()
+    finally:
+        logger.removeHandler(manager.handler)
+        raiz.setLevel(nivel)
+
+    linhas = manager.app_log.read_text(encoding='utf-8').splitlines()
+    assert [linha.rsplit('] ', 1)[1] for linha in linhas] == [
+        *(f'mensagem {indice}' for indice in range(6)),
+        '14 registros de log descartados (fila cheia)'
+    ]
@@ -0,0 +1,85 @@
+"""
+Testes das métricas no formato do Prometheus (src/core/metricas.py)
+"""
+import pytest
+from carga import PlanilhaSimulada
+from src.core.metricas import CONTENT_TYPE, RegistroMetricas
+
+
+def amostras(registro, nome):
+    """Linhas de amostra (sem HELP/TYPE) de uma métrica, como dict linha -> valor."""
+    resultado = {}
+    for linha in registro.exportar().splitlines():
+        if linha.startswith(nome) and not linha.startswith('#'):
+            serie, valor = linha.rsplit(' ', 1)
+            resultado[serie] = valor
+    return resultado
+
+
+def test_histograma_cumulativo():
+    registro = RegistroMetricas()
+    histograma = registro.histograma('teste_duracao', 'Durações', buckets=(0.1, 1.0))
+    for valor in (0.05, 0.1, 0.5, 3.0):
+        histograma.observar(valor, rota='/api/kpis')
+
+    assert amostras(registro, 'teste_duracao') == {
+        'teste_duracao_bucket{rota="/api/kpis",le="0.1"}': '2',
+        'teste_duracao_bucket{rota="/api/kpis",le="1"}': '3',
+        'teste_duracao_bucket{rota="/api/kpis",le="+Inf"}': '4',
+        'teste_duracao_sum{rota="/api/kpis"}': '3.65',
+        'teste_duracao_count{rota="/api/kpis"}': '4',
+    }
+    assert histograma.contagem(rota='/api/kpis') == 4
+
+
+def test_rotulos_escapados_e_ordenados():
+    registro = RegistroMetricas()
+    contador = registro.contador('teste_total', 'Contador')
+    contador.inc(2, b='x', a='aspas "e" barra \\\nfim')
+    assert amostras(registro, 'teste_total') == {
+        'teste_total{a="aspas \\"e\\" barra \\\\\\nfim",b="x"}': '2'
+    }
+    # Registrar de novo o mesmo nome devolve a métrica existente
+    assert registro.contador('teste_total', 'Outro') is contador
+
+
+def test_medir_registra_duracao_mesmo_com_excecao():
+    registro = RegistroMetricas()
+
+    @registro.cronometrar('decorada')
+    def etapa():
+        return 42
+
+    assert etapa() == 42
+    with pytest.raises(ValueError):
+        with registro.medir('falha'):
+            raise ValueError
+    assert registro.duracao_etapas.contagem(etapa='decorada') == 1
+    assert registro.duracao_etapas.contagem(etapa='falha') == 1
+
+
+def test_taxa_de_acerto_dos_caches():
+    registro = RegistroMetricas()
+    for acerto in (True, True, True, False):
+        registro.registrar_cache('corpo', acerto)
+    registro.registrar_cache('agregados', False)
+    assert amostras(registro, 'dashboard_cache_taxa_acerto') == {
+        'dashboard_cache_taxa_acerto{cache="agregados"}': '0',
+        'dashboard_cache_taxa_acerto{cache="corpo"}': '0.75',
+    }
+
+
+def test_endpoint_metrics(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=50)
+    cliente = create_app(get_sheets_client=lambda sheet_url=None: planilha).test_client()
+    cliente.get('/api/data')
+
+    resposta = cliente.get('/metrics')
+    assert resposta.status_code == 200
+    assert resposta.headers['Content-Type'] == CONTENT_TYPE
+    texto = resposta.get_data(as_text=True)
+    assert '# TYPE dashboard_etapa_duracao_segundos histogram' in texto
+    assert 'dashboard_etapa_duracao_segundos_count{etapa="carregamento"}' in texto
+    assert 'dashboard_snapshot_linhas 50' in texto
@@ -0,0 +1,93 @@
+"""
+Testes da ordenação server-side e da paginação por cursor (src/core/ordenacao.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from carga import PlanilhaSimulada
+from src.core.ordenacao import IndiceColuna, Ordenacao, parse_ordenacao
+from src.pagination import PaginationManager
+
+
+def ordenar(df, sort):
+    espec = parse_ordenacao(sort)
+    indices = [IndiceColuna(df[campo]) for campo, _ in espec]
+    return Ordenacao(espec, indices, df['id_registro'].to_numpy())
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(7)
+    total = 500
+    return pd.DataFrame({
+        # Poucos valores distintos: muitos empates entre colunas
+        'cliente': rng.choice(['Beta', 'Alfa', 'Gama'], total),
+        'status': rng.choice(['Pendente', 'Concluído'], total),
+        'data_hora': rng.integers(0, 20, total) * 1000,
+        'id_registro': rng.permutation(total) + 2,
+    })
+
+
+def test_parse_ordenacao():
+    assert parse_ordenacao('cliente, -data_hora') == (('cliente', False), ('data_hora', True))
+    with pytest.raises(ValueError):
+        parse_ordenacao(' , ')
+    with pytest.raises(ValueError):
+        parse_ordenacao('cliente,-cliente')
+
+
+@pytest.mark.parametrize('sort', ['cliente', '-data_hora', 'cliente,-data_hora', '-status,cliente,data_hora'])
+def test_varias_colunas_desempatam_pelo_id(df, sort):
+    espec = parse_ordenacao(sort)
+    esperado = df.sort_values(
+        [campo for campo, _ in espec] + ['id_registro'],
+        ascending=[not decrescente for _, decrescente in espec] + [True]
+    )
+    assert ordenar(df, sort).ids_ordenados.tolist() == esperado['id_registro'].tolist()
+
+
+def test_cursor_percorre_todos_os_registros(df):
+    ordenacao = ordenar(df, 'cliente,-data_hora')
+    paginador = PaginationManager()
+    vistos, cursor = [], None
+    while True:
+        pagina = paginador.get_cursor_pagination(ordenacao, 37, cursor=cursor)
+        vistos += df['id_registro'].to_numpy()[pagina['indices']].tolist()
+        if not pagina['has_next']:
+            break
+        cursor = pagina['next_cursor']
+    assert vistos == ordenacao.ids_ordenados.tolist()
+
+    with pytest.raises(ValueError):
+        paginador.get_cursor_pagination(ordenar(df, 'cliente'), 37, cursor=cursor)
+
+
+def test_cursor_de_registro_removido_continua_na_posicao(df):
+    ordenacao = ordenar(df, 'cliente,-data_hora')
+    posicao = 123
+    valores, id_registro = ordenacao.valores_em(posicao), int(ordenacao.ids_ordenados[posicao])
+
+    restante = ordenar(df[df['id_registro'] != id_registro], 'cliente,-data_hora')
+    assert restante.posicao(valores, id_registro, lado='right') == posicao
+    # Valor que não existe mais na coluna fica entre os vizinhos
+    assert ordenacao.posicao(['Beta0', 10**9], 0) == int((df['cliente'] <= 'Beta').sum())
+
+
+def test_registros_paginados_pela_api(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=300)
+    cliente = create_app(get_sheets_client=lambda sheet_url=None: planilha).test_client()
+
+    registros, url = [], '/api/records?sort=cliente,-data_hora&per_page=40'
+    while url:
+        pagina = cliente.get(url).get_json()
+        registros += pagina['registros']
+        cursor = pagina['paginacao']['next_cursor']
+        url = f'/api/records?sort=cliente,-data_hora&per_page=40&cursor={cursor}' if cursor else None
+
+    df = pd.DataFrame(registros)
+    esperado = df.sort_values(['cliente', 'data_hora', 'id_registro'], ascending=[True, False, True])
+    assert df['id_registro'].tolist() == esperado['id_registro'].tolist()
+    assert len(df) == 300
+    assert cliente.get('/api/records?sort=inexistente').status_code == 400
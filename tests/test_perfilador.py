@@ -0,0 +1,130 @@
+"""
+Testes do perfilador de requisições (src/utils/perfilador.py e a cópia do
+servidor modelo em modelo/app/lib/perfilador.py)
+"""
+import importlib.util
+import inspect
+import os
+import pstats
+import sys
+
+import pytest
+from flask import Flask
+from src.utils import perfilador as perfilador_dashboard
+from src.utils.perfilador import PerfiladorRequisicoes, init_perfilador
+
+SEGREDO = 'segredo-de-teste'
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def carregar_perfilador_modelo():
+    """Importa modelo/app/lib/perfilador.py, implantado sem o pacote src."""
+    caminho = os.path.join(BASE_DIR, 'modelo', 'app', 'lib', 'perfilador.py')
+    spec = importlib.util.spec_from_file_location('modelo_perfilador', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    # inspect.getsource localiza as classes pelo módulo registrado
+    sys.modules[spec.name] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def criar_app(diretorio, **kwargs):
+    app = Flask(__name__)
+
+    @app.route('/lenta')
+    def lenta():
+        return str(sum(range(10000)))
+
+    @app.route('/falha')
+    def falha():
+        raise RuntimeError('falha')
+
+    perfilador = PerfiladorRequisicoes(str(diretorio), **kwargs)
+    assert perfilador.init_app(app)
+    return app, perfilador
+
+
+def test_desabilitado_sem_segredo_nem_amostragem(tmp_path, monkeypatch):
+    for variavel in ('PROFILER_SECRET', 'PROFILER_SAMPLE_RATE', 'PROFILER_DIR'):
+        monkeypatch.delenv(variavel, raising=False)
+    app = Flask(__name__)
+    assert init_perfilador(app, str(tmp_path / 'perfis')) is None
+    assert not (tmp_path / 'perfis').exists()
+    assert 'perfis_listar' not in app.view_functions
+
+
+def test_perfila_apenas_com_o_segredo(tmp_path):
+    app, perfilador = criar_app(tmp_path, segredo=SEGREDO)
+    cliente = app.test_client()
+
+    assert 'X-Profile-Id' not in cliente.get('/lenta').headers
+    assert 'X-Profile-Id' not in cliente.get('/lenta', headers={'X-Profile': 'errado'}).headers
+
+    nome = cliente.get('/lenta', headers={'X-Profile': SEGREDO}).headers['X-Profile-Id']
+    assert nome == cliente.get(f'/admin/perfis?token={SEGREDO}').get_json()['perfis'][0]['nome']
+    assert pstats.Stats(os.path.join(perfilador.diretorio, nome)).total_calls > 0
+    assert cliente.get(f'/lenta?_profile={SEGREDO}').headers['X-Profile-Id'].endswith('.pstats')
+
+
+def test_requisicao_com_excecao_libera_o_perfilador(tmp_path):
+    app, perfilador = criar_app(tmp_path, segredo=SEGREDO)
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    cliente = app.test_client()
+
+    assert cliente.get('/falha', headers={'X-Profile': SEGREDO}).status_code == 500
+    assert len(perfilador.listar()) == 1
+    assert cliente.get('/lenta', headers={'X-Profile': SEGREDO}).headers['X-Profile-Id']
+
+
+def test_mantem_apenas_os_mais_recentes(tmp_path):
+    app, perfilador = criar_app(tmp_path, amostragem=1, limite_arquivos=3)
+    for indice in range(4):
+        antigo = tmp_path / f'antigo{indice}.pstats'
+        antigo.write_bytes(b'')
+        os.utime(antigo, (1000 + indice, 1000 + indice))
+
+    nome = app.test_client().get('/lenta').headers['X-Profile-Id']
+    assert [perfil['nome'] for perfil in perfilador.listar()] == [nome, 'antigo3.pstats', 'antigo2.pstats']
+
+
+def test_rotas_de_administracao(tmp_path):
+    app, _ = criar_app(tmp_path, segredo=SEGREDO)
+    cliente = app.test_client()
+    nome = cliente.get('/lenta', headers={'X-Profile': SEGREDO}).headers['X-Profile-Id']
+
+    assert cliente.get('/admin/perfis').status_code == 403
+    assert cliente.get(f'/admin/perfis/{nome}').status_code == 403
+
+    autorizado = {'X-Profile': SEGREDO}
+    baixado = cliente.get(f'/admin/perfis/{nome}', headers=autorizado)
+    assert baixado.status_code == 200
+    assert baixado.headers['Content-Disposition'].startswith('attachment')
+
+    texto = cliente.get(f'/admin/perfis/{nome}?formato=texto&linhas=5', headers=autorizado)
+    assert 'function calls' in texto.get_data(as_text=True)
+    assert cliente.get(f'/admin/perfis/{nome}?formato=texto&ordem=invalida', headers=autorizado).status_code == 400
+    assert cliente.get('/admin/perfis/..%2Fsegredo.pstats', headers=autorizado).status_code == 404
+    assert cliente.get('/admin/perfis/inexistente.pstats', headers=autorizado).status_code == 404
+
+
+@pytest.mark.parametrize('amostragem, perfilados', [(0, 0), (1, 4)])
+def test_amostragem(tmp_path, amostragem, perfilados):
+    app, _ = criar_app(tmp_path, segredo=SEGREDO, amostragem=amostragem)
+    cliente = app.test_client()
+    respostas = [cliente.get('/lenta') for _ in range(4)]
+    assert sum('X-Profile-Id' in resposta.headers for resposta in respostas) == perfilados
+
+
+def test_copia_do_modelo_igual_a_do_dashboard(tmp_path, monkeypatch):
+    modelo = carregar_perfilador_modelo()
+    for nome in ('CABECALHO', 'PARAMETRO', 'EXTENSAO'):
+        assert getattr(modelo, nome) == getattr(perfilador_dashboard, nome)
+    # Apenas as variáveis de ambiente de init_perfilador podem diferir
+    assert inspect.getsource(modelo.PerfiladorRequisicoes) == inspect.getsource(PerfiladorRequisicoes)
+
+    monkeypatch.setenv('nbti.nbAdminServer-profile-secret', SEGREDO)
+    monkeypatch.setenv('nbti.nbAdminServer-profile-dir', str(tmp_path))
+    monkeypatch.setenv('nbti.nbAdminServer-profile-max', '7')
+    perfilador = modelo.init_perfilador(Flask(__name__))
+    assert (perfilador.diretorio, perfilador.segredo, perfilador.limite_arquivos) == (str(tmp_path), SEGREDO, 7)
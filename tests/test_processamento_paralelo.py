@@ -0,0 +1,70 @@
+"""
+Testes do processamento em partes (src/core/processamento_paralelo.py)
+"""
+import logging
+import time
+import pandas as pd
+import pytest
+from dados_sinteticos import gerar_planilha
+from src.core import contexto
+from src.core.data_processor import ProcessadorDados
+from src.core.processamento_paralelo import ProcessamentoParalelo, codificar_linhas, decodificar_linhas
+
+
+class ListaRegistros(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+
+@pytest.fixture(scope='module')
+def dados():
+    return gerar_planilha(2000)
+
+
+def test_codificar_e_decodificar_linhas():
+    linhas = [['a', 'b c', ''], [], ['ção', '1']]
+    assert decodificar_linhas(codificar_linhas(linhas)) == linhas
+    assert codificar_linhas([['com\x1fseparador']]) is None
+
+
+def test_processadores_limitados_aos_nucleos():
+    assert 0 < ProcessadorDados(processos=10_000).processos <= 10_000
+    assert ProcessadorDados(processos=0).processos == 0
+
+
+def test_partes_iguais_ao_processamento_serial(dados):
+    processador = ProcessadorDados()
+    paralelo = ProcessamentoParalelo(2)
+    handler = ListaRegistros()
+    logger_processador = logging.getLogger('src.core.data_processor')
+    logger_processador.addHandler(handler)
+    tokens = contexto.iniciar('teste-paralelo')
+    try:
+        df, agregados = paralelo.processar(dados)
+    finally:
+        contexto.encerrar(tokens)
+        paralelo.encerrar()
+
+    serial = processador.preparar_dataframe(dados)
+    # Datas inválidas não dependem do momento do processamento
+    pd.testing.assert_frame_equal(df, serial)
+    motor = processador.motor
+    assert motor.kpis(agregados) == motor.kpis(motor.agregar(serial))
+    assert motor.graficos(agregados) == motor.graficos(motor.agregar(serial))
+
+    # Os avisos dos processos chegam ao processo principal, com o id da requisição
+    def dos_processos():
+        return [registro for registro in handler.registros if registro.processName != 'MainProcess']
+
+    prazo = time.monotonic() + 5
+    while not dos_processos() and time.monotonic() < prazo:
+        time.sleep(0.05)
+    logger_processador.removeHandler(handler)
+    assert dos_processos()
+    assert {registro.id_requisicao for registro in dos_processos()} == {'teste-paralelo'}
+    # Processos no nível da raiz do principal (WARNING sem o log iniciado), nunca DEBUG
+    assert all(registro.levelno > logging.DEBUG for registro in dos_processos())
@@ -0,0 +1,47 @@
+"""
+Testes das rotas de registros (/api/records, /api/records/<id> e /api/search)
+"""
+import pytest
+from carga import PlanilhaSimulada
+from src.config.campos_config import GOOGLE_SHEETS_CONFIG
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    planilha = PlanilhaSimulada(linhas=300)
+    return create_app(get_sheets_client=lambda sheet_url=None: planilha).test_client()
+
+
+@pytest.mark.parametrize('rota', ['/api/records?', '/api/search?q=erro&'])
+def test_per_page_limitado(cliente, monkeypatch, rota):
+    monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, 'max_records_per_page', 20)
+    pagina = cliente.get(f'{rota}per_page=100000').get_json()
+    assert pagina['paginacao']['per_page'] == 20
+    assert len(pagina['registros']) == 20
+    assert cliente.get(f'{rota}per_page=0').get_json()['paginacao']['per_page'] == 1
+
+
+@pytest.mark.parametrize('rota', ['/api/records', '/api/search?q=erro'])
+def test_projecao_de_campos(cliente, rota):
+    separador = '&' if '?' in rota else '?'
+    registros = cliente.get(f'{rota}{separador}fields=cliente,id_registro').get_json()['registros']
+    assert registros and all(set(registro) == {'cliente', 'id_registro'} for registro in registros)
+
+    desconhecido = cliente.get(f'{rota}{separador}fields=cliente,inexistente')
+    assert desconhecido.status_code == 400
+    assert desconhecido.get_json() == {'error': True, 'message': 'Campos desconhecidos: inexistente'}
+
+
+def test_registro_por_id(cliente):
+    primeiro = cliente.get('/api/records?sort=id_registro&per_page=1').get_json()['registros'][0]
+    detalhe = cliente.get(f"/api/records/{primeiro['id_registro']}")
+    assert detalhe.status_code == 200
+    # Todos os campos, inclusive os fora da projeção padrão
+    assert set(primeiro) <= set(detalhe.get_json())
+    assert detalhe.get_json()['id_registro'] == primeiro['id_registro']
+
+    ausente = cliente.get('/api/records/999999')
+    assert ausente.status_code == 404
+    assert ausente.get_json()['error'] is True
@@ -0,0 +1,59 @@
+"""
+Testes do toJson do servidor modelo (modelo/app/lib/serializer.py)
+"""
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+from json_encoders import carregar_serializer_modelo
+
+serializer = carregar_serializer_modelo()
+
+ENCODERS = [
+    'std',
+    pytest.param('orjson', marks=pytest.mark.skipif(serializer.orjson is None, reason='orjson ausente')),
+]
+
+
+@pytest.fixture(params=ENCODERS)
+def encoder(request, monkeypatch):
+    monkeypatch.setattr(serializer, 'JSON_ENCODER', request.param)
+    return request.param
+
+
+def test_formatos_de_saida(encoder):
+    linha = {
+        'data': datetime.date(2024, 3, 5),
+        'data_hora': datetime.datetime(2024, 3, 5, 8, 7, 6),
+        'hora': datetime.time(8, 7),
+        'valor': Decimal('10.50'),
+        'texto': 'Não',
+        1: 'chave numérica',
+    }
+    assert json.loads(serializer.toJson([linha])) == [{
+        'data': '05/03/2024',
+        'data_hora': '05/03/2024 08:07:06',
+        'hora': '08:07:00',
+        'valor': '10.50',
+        'texto': 'Não',
+        '1': 'chave numérica',
+    }]
+
+
+def test_inteiro_maior_que_64_bits(encoder):
+    # orjson não aceita: o objeto inteiro é serializado pelo json padrão
+    grande = 2 ** 70
+    assert serializer.toJson({'id': grande, 'data': datetime.date(2024, 1, 2)}) == json.dumps(
+        {'id': grande, 'data': '02/01/2024'}
+    )
+
+
+@pytest.mark.parametrize('encoder, esperado', [
+    ('std', '[NaN, Infinity, 1.5]'),
+    pytest.param('orjson', '[null,null,1.5]',
+                 marks=pytest.mark.skipif(serializer.orjson is None, reason='orjson ausente')),
+])
+def test_nan_e_infinito(monkeypatch, encoder, esperado):
+    monkeypatch.setattr(serializer, 'JSON_ENCODER', encoder)
+    assert serializer.toJson([float('nan'), float('inf'), 1.5]) == esperado
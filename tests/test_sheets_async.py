@@ -0,0 +1,100 @@
+"""
+Testes do leitor assíncrono contra um servidor local da API
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from carga import PlanilhaSimulada
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+from src.core import sheets_async
+from src.core.sheets_async import AsyncSheetsClient
+
+ID_PLANILHA = 'teste'
+
+
+@pytest.fixture
+def servidor():
+    planilha = PlanilhaSimulada(linhas=20)
+    ranges = []
+
+    async def metadados(request):
+        return web.json_response({'sheets': [{'properties': {'title': "Atendimentos d'Ana"}}]})
+
+    async def valores(request):
+        ranges.append(request.match_info['range'])
+        return web.json_response({'values': planilha.dados})
+
+    app = web.Application()
+    app.router.add_get(f'/{ID_PLANILHA}', metadados)
+    app.router.add_get(f'/{ID_PLANILHA}/values/{{range}}', valores)
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    runner = web.AppRunner(app)
+    asyncio.run_coroutine_threadsafe(runner.setup(), loop).result()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    asyncio.run_coroutine_threadsafe(site.start(), loop).result()
+    porta = site._server.sockets[0].getsockname()[1]
+
+    yield SimpleNamespace(url=f'http://127.0.0.1:{porta}', ranges=ranges, planilha=planilha)
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@pytest.fixture
+def cliente(servidor):
+    credenciais = SimpleNamespace(valid=True, token='token')
+    cliente = AsyncSheetsClient(credentials=credenciais, timeout=2, base_url=servidor.url, drive_url=servidor.url)
+    cliente.config = dict(cliente.config, max_retries=1, retry_delay=0)
+    yield cliente
+    cliente.encerrar()
+
+
+def test_range_padrao_le_ate_o_fim_da_aba(cliente, servidor):
+    assert cliente.ler_planilha(spreadsheet_id=ID_PLANILHA) == servidor.planilha.dados
+    assert servidor.ranges == ["'Atendimentos d''Ana'!A:Z"]
+
+
+def test_chamadas_simultaneas_criam_uma_sessao(cliente, servidor, monkeypatch):
+    sessoes, resultados = [], []
+    classe = aiohttp.ClientSession
+
+    def criar_sessao(*args, **kwargs):
+        sessoes.append(classe(*args, **kwargs))
+        return sessoes[-1]
+
+    monkeypatch.setattr(sheets_async.aiohttp, 'ClientSession', criar_sessao)
+    threads = [
+        threading.Thread(target=lambda: resultados.append(cliente.ler_planilha(spreadsheet_id=ID_PLANILHA)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sessoes) == 1
+    assert resultados == [servidor.planilha.dados] * 8
+
+
+def test_espera_limitada_pelo_prazo(cliente):
+    cliente.timeout = 0.2
+    cancelada = threading.Event()
+
+    async def travada():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelada.set()
+            raise
+
+    inicio = time.monotonic()
+    with pytest.raises(TimeoutError):
+        cliente._executar(travada)
+    assert time.monotonic() - inicio < 5
+    assert cancelada.wait(1)
@@ -0,0 +1,142 @@
+"""
+Testes do cliente síncrono do Google Sheets com serviços simulados
+(consulta de versão no Drive antes da leitura dos valores)
+"""
+import pytest
+from carga import PlanilhaSimulada
+from dados_sinteticos import gerar_planilha
+from src.config.campos_config import GOOGLE_SHEETS_CONFIG
+from src.core import sheets_client
+from src.core.ingestao import PADRAO_RANGE
+from src.core.sheets_client import GoogleSheetsClient
+
+
+class Requisicao:
+    def __init__(self, resposta):
+        self.resposta = resposta
+
+    def execute(self):
+        if isinstance(self.resposta, Exception):
+            raise self.resposta
+        return self.resposta() if callable(self.resposta) else self.resposta
+
+
+class ServicoDrive:
+    """files().get(...).execute() com a versão atual (ou a exceção configurada)."""
+
+    def __init__(self, versao):
+        self.versao = versao
+        self.consultas = 0
+
+    def files(self):
+        return self
+
+    def get(self, **kwargs):
+        self.consultas += 1
+        if isinstance(self.versao, Exception):
+            return Requisicao(self.versao)
+        return Requisicao({'version': self.versao, 'modifiedTime': '2024-01-02T10:00:00Z'})
+
+
+class ServicoSheets:
+    """spreadsheets().get(...) e spreadsheets().values().get(...), que respeita as linhas do range."""
+
+    def __init__(self, dados):
+        self.dados = dados
+        self.leituras = 0
+        self.ranges = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self.Valores(self)
+
+    def get(self, **kwargs):
+        return Requisicao({'sheets': [{'properties': {'title': 'Respostas'}}]})
+
+    class Valores:
+        def __init__(self, servico):
+            self.servico = servico
+
+        def get(self, range, **kwargs):
+            partes = PADRAO_RANGE.match(range)
+            inicio = int(partes['linha_inicial'] or 1)
+            fim = int(partes['linha_final']) if partes['linha_final'] else None
+            self.servico.ranges.append(range)
+
+            def ler():
+                self.servico.leituras += 1
+                return {'values': self.servico.dados[inicio - 1:fim]}
+            return Requisicao(ler)
+
+
+@pytest.fixture
+def cliente():
+    # Sem credenciais: os serviços do Sheets e do Drive são simulados
+    cliente = GoogleSheetsClient.__new__(GoogleSheetsClient)
+    cliente.config = dict(GOOGLE_SHEETS_CONFIG, change_probe=True)
+    cliente.spreadsheet_id = 'planilha'
+    cliente.service = ServicoSheets(gerar_planilha(5, seed=1))
+    cliente._drive_service = ServicoDrive('7')
+    return cliente
+
+
+def test_versao_inalterada_nao_le_os_valores(cliente):
+    versao, dados = cliente.ler_planilha_se_alterada()
+    assert versao == '7@2024-01-02T10:00:00Z'
+    assert dados == cliente.service.dados
+    assert cliente.service.leituras == 1
+
+    assert cliente.ler_planilha_se_alterada(versao_conhecida=versao) == (versao, None)
+    assert cliente.service.leituras == 1
+
+    cliente._drive_service.versao = '8'
+    versao, dados = cliente.ler_planilha_se_alterada(versao_conhecida=versao)
+    assert versao.startswith('8@') and dados == cliente.service.dados
+    assert cliente.service.leituras == 2
+
+
+def test_falha_na_consulta_de_versao_le_a_planilha(cliente):
+    cliente._drive_service.versao = RuntimeError('403 drive.readonly ausente')
+    versao, dados = cliente.ler_planilha_se_alterada(versao_conhecida='7@2024-01-02T10:00:00Z')
+    assert versao is None
+    assert dados == cliente.service.dados
+    assert cliente.service.leituras == 1
+
+
+def test_consulta_desativada(cliente):
+    cliente.config['change_probe'] = False
+    assert cliente.ler_planilha_se_alterada(versao_conhecida='7@2024-01-02T10:00:00Z')[0] is None
+    assert cliente._drive_service.consultas == 0
+    assert cliente.service.leituras == 1
+
+
+def test_le_a_aba_inteira_alem_de_1000_linhas(cliente):
+    # O range padrão não tem linha final: antes, "A1:Z1000" cortava a
+    # planilha nos primeiros 999 registros
+    cliente.service.dados = gerar_planilha(2500, seed=2)
+    assert cliente.ler_planilha() == cliente.service.dados
+    assert cliente.service.ranges == ["'Respostas'!A:Z"]
+
+    blocos = list(cliente.iterar_planilha(linhas_por_bloco=1000))
+    assert [linha for bloco in blocos for linha in bloco] == cliente.service.dados
+    assert cliente.service.ranges[1:] == ["'Respostas'!A1:Z1000", "'Respostas'!A1001:Z2000", "'Respostas'!A2001:Z3000"]
+
+
+def test_app_reaproveita_o_cliente_por_planilha(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, 'async_reader', False)
+    criados = []
+
+    class ClienteSimulado(PlanilhaSimulada):
+        def __init__(self, sheet_url=None):
+            super().__init__(linhas=20)
+            criados.append(sheet_url)
+
+    monkeypatch.setattr(sheets_client, 'GoogleSheetsClient', ClienteSimulado)
+    from app import create_app
+    cliente = create_app().test_client()
+    for _ in range(3):
+        assert cliente.get('/api/kpis').status_code == 200
+    assert len(criados) == 1
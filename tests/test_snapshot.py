@@ -0,0 +1,165 @@
+"""
+Testes do snapshot e da paginação por cursor (src/core/snapshot.py, src/pagination.py)
+"""
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from src.core.ordenacao import parse_ordenacao
+from src.core import snapshot as modulo_snapshot
+from src.core.snapshot import Snapshot, SnapshotManager
+from src.pagination import PaginationManager, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def snapshot():
+    df = pd.DataFrame({
+        'id_registro': np.arange(2, 27, dtype=np.int64),
+        'cliente': [f"Cliente {i % 4}" for i in range(25)],
+        'data_hora': np.arange(25, dtype=np.int64) * 1000
+    })
+    return Snapshot(df, 1)
+
+
+def test_cursor_ida_e_volta():
+    cursor = encode_cursor('cliente,-data_hora', ['Ação', 10], 42)
+    assert decode_cursor(cursor) == {'sort': 'cliente,-data_hora', 'chave': ['Ação', 10], 'id_registro': 42}
+    with pytest.raises(ValueError):
+        decode_cursor('nao-e-um-cursor')
+
+
+def test_paginas_por_cursor_percorrem_todos_os_registros(snapshot):
+    ordenacao = snapshot.get_ordenacao(parse_ordenacao('cliente,-data_hora'))
+    paginador = PaginationManager()
+    vistos, cursor = [], None
+    while True:
+        pagina = paginador.get_cursor_pagination(ordenacao, 7, cursor=cursor)
+        vistos.extend(snapshot.df['id_registro'].to_numpy()[pagina['indices']].tolist())
+        if not pagina['has_next']:
+            break
+        cursor = pagina['next_cursor']
+
+    esperado = snapshot.df.sort_values(['cliente', 'data_hora'], ascending=[True, False])['id_registro'].tolist()
+    assert vistos == esperado
+
+
+def test_cursor_de_outra_ordenacao_e_rejeitado(snapshot):
+    paginador = PaginationManager()
+    pagina = paginador.get_cursor_pagination(snapshot.get_ordenacao(parse_ordenacao('cliente')), 5)
+    with pytest.raises(ValueError):
+        paginador.get_cursor_pagination(
+            snapshot.get_ordenacao(parse_ordenacao('-data_hora')), 5, cursor=pagina['next_cursor']
+        )
+
+
+def test_cache_calcula_cada_chave_uma_vez(snapshot):
+    chamadas = []
+
+    def lenta():
+        chamadas.append(1)
+        time.sleep(0.2)
+        return 'lenta'
+
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(snapshot.get_cache('lenta', lenta))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    # Outra chave não espera o cálculo em andamento
+    inicio = time.monotonic()
+    assert snapshot.get_cache('rapida', lambda: 'rapida') == 'rapida'
+    assert time.monotonic() - inicio < 0.1
+    for thread in threads:
+        thread.join()
+    assert resultados == ['lenta'] * 4
+    assert len(chamadas) == 1
+
+
+def test_ordenacoes_normalizadas_e_limitadas(snapshot, monkeypatch):
+    monkeypatch.setattr(modulo_snapshot, 'LIMITE_ORDENACOES', 2)
+    padrao = snapshot.get_ordenacao(parse_ordenacao('-data_hora'))
+    # id_registro crescente é o desempate implícito; depois dele nada decide
+    cliente = snapshot.get_ordenacao(parse_ordenacao('cliente'))
+    assert snapshot.get_ordenacao(parse_ordenacao('cliente,id_registro,-data_hora')) is cliente
+    assert cliente.sort == 'cliente'
+
+    assert snapshot.get_ordenacao(parse_ordenacao('-data_hora')) is padrao
+    snapshot.get_ordenacao(parse_ordenacao('-cliente'))
+    guardadas = [chave[1] for chave in snapshot._cache if isinstance(chave, tuple) and chave[0] == 'ordenacao']
+    # A usada há mais tempo ('cliente') foi descartada; os índices das colunas ficam
+    assert sorted(guardadas) == [(('cliente', True),), (('data_hora', True),)]
+    assert ('indice', 'cliente') in snapshot._cache
+    assert snapshot.get_ordenacao(parse_ordenacao('-data_hora')) is padrao
+
+
+def test_cache_nao_guarda_falhas(snapshot):
+    def falha():
+        raise RuntimeError('falhou')
+
+    with pytest.raises(RuntimeError):
+        snapshot.get_cache('chave', falha)
+    assert snapshot.get_cache('chave', lambda: 1) == 1
+
+
+def test_posicao_delta(snapshot):
+    base = snapshot.resumo()
+    acrescentado = pd.concat([snapshot.df, snapshot.df.tail(1).assign(id_registro=27)], ignore_index=True)
+    assert Snapshot(acrescentado, 2).posicao_delta(base) == len(snapshot)
+    alterado = snapshot.df.copy()
+    alterado.loc[0, 'cliente'] = 'Outro'
+    assert Snapshot(alterado, 3).posicao_delta(base) is None
+
+
+def test_snapshot_recarregado_por_requisicao_e_aquecido(snapshot):
+    aquecidos = []
+    evento = threading.Event()
+    dados = [snapshot.df]
+
+    def aquecer(atual):
+        aquecidos.append(atual.versao)
+        evento.set()
+
+    manager = SnapshotManager(lambda: dados[0], aquecer=aquecer)
+    publicado = manager.get_snapshot()
+    assert evento.wait(5)
+    assert aquecidos == [publicado.versao]
+
+    # Snapshot preparado pela atualização periódica não é aquecido de novo
+    evento.clear()
+    dados[0] = snapshot.df.assign(cliente='Outro')
+    manager.atualizar(preparar=True)
+    assert not evento.wait(0.2)
+    assert aquecidos == [publicado.versao]
+
+
+def test_requisicoes_simultaneas_com_snapshot_expirado_releem_uma_vez(snapshot):
+    leituras = []
+    liberar = threading.Event()
+
+    def carregador():
+        leituras.append(threading.current_thread().name)
+        if len(leituras) > 1:
+            # A releitura deve ser única; as demais esperam o lock
+            liberar.wait(5)
+        return snapshot.df.assign(cliente=f'Cliente {len(leituras)}')
+
+    manager = SnapshotManager(carregador, ttl=60)
+    primeiro = manager.get_snapshot()
+    manager._carregado_em -= 61
+
+    resultados = []
+    threads = [
+        threading.Thread(target=lambda: resultados.append(manager.get_snapshot()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    liberar.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(leituras) == 2
+    assert len({atual.versao for atual in resultados}) == 1
+    assert resultados[0].versao > primeiro.versao
@@ -0,0 +1,102 @@
+"""
+Testes do canal Server-Sent Events (/api/stream e src/utils/sse.py)
+"""
+import pytest
+from carga import PlanilhaSimulada
+from werkzeug.test import EnvironBuilder
+from src.config.campos_config import GOOGLE_SHEETS_CONFIG
+from src.utils.sse import formatar_comentario, formatar_evento
+
+
+def test_formatar_evento():
+    assert formatar_evento('{"a": 1}\nsegunda', evento='versao', id_evento=3, retry=15000) == (
+        b'retry: 15000\nid: 3\nevent: versao\ndata: {"a": 1}\ndata: segunda\n\n'
+    )
+    assert formatar_evento(b'') == b'data: \n\n'
+    assert formatar_comentario('keepalive') == b': keepalive\n\n'
+
+
+@pytest.fixture
+def criar_app(monkeypatch):
+    monkeypatch.setenv('GOOGLE_SHEETS_URL', 'https://docs.google.com/spreadsheets/d/teste/edit')
+    from app import create_app
+    aplicacoes = []
+
+    def criar(limite=None):
+        if limite is not None:
+            monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, 'stream_max_connections', limite)
+        planilha = PlanilhaSimulada(linhas=50)
+        aplicacoes.append(create_app(get_sheets_client=lambda sheet_url=None: planilha))
+        return aplicacoes[-1]
+
+    yield criar
+    for aplicacao in aplicacoes:
+        aplicacao.extensions['snapshot_manager'].parar_atualizacao_periodica()
+
+
+def abrir_stream(cliente):
+    resposta = cliente.get('/api/stream', buffered=False)
+    if resposta.status_code == 200:
+        assert next(iter(resposta.response)).startswith(b'retry: ')
+    return resposta
+
+
+def test_sem_atualizacao_periodica_responde_204(criar_app):
+    assert criar_app().test_client().get('/api/stream').status_code == 204
+
+
+def test_limite_de_conexoes(criar_app):
+    app = criar_app(limite=1)
+    manager = app.extensions['snapshot_manager']
+    manager.get_snapshot()
+    manager.iniciar_atualizacao_periodica(3600)
+    cliente = app.test_client()
+
+    primeira = abrir_stream(cliente)
+    assert primeira.status_code == 200
+    recusada = abrir_stream(cliente)
+    assert recusada.status_code == 503
+    assert recusada.headers['Retry-After'] == str(GOOGLE_SHEETS_CONFIG["update_interval"])
+
+    # Encerrar o stream libera a vaga
+    primeira.close()
+    assert abrir_stream(cliente).status_code == 200
+
+
+def test_limite_padrao_do_servidor_com_threads(criar_app):
+    import app as modulo_app
+    assert not modulo_app.servidor_gevent()
+    app = criar_app(limite=0)
+    manager = app.extensions['snapshot_manager']
+    manager.get_snapshot()
+    manager.iniciar_atualizacao_periodica(3600)
+    cliente = app.test_client()
+
+    abertas = [abrir_stream(cliente) for _ in range(modulo_app.STREAM_CONEXOES_THREADS)]
+    assert all(resposta.status_code == 200 for resposta in abertas)
+    assert abrir_stream(cliente).status_code == 503
+    # Os contextos das requisições (mesma thread) são desfeitos em ordem inversa
+    for resposta in reversed(abertas):
+        resposta.close()
+
+
+def test_resposta_fechada_antes_do_primeiro_evento_libera_a_vaga(criar_app):
+    app = criar_app(limite=1)
+    manager = app.extensions['snapshot_manager']
+    manager.get_snapshot()
+    manager.iniciar_atualizacao_periodica(3600)
+
+    # Como um servidor WSGI cujo cliente desconectou antes do primeiro evento:
+    # a resposta é fechada sem que o gerador tenha começado (o cliente de
+    # teste sempre lê o primeiro item)
+    status = []
+    resposta = app(EnvironBuilder(path='/api/stream').get_environ(), lambda s, h, e=None: status.append(s))
+    assert status == ['200 OK']
+    resposta.close()
+    resposta.close()
+
+    cliente = app.test_client()
+    aberta = abrir_stream(cliente)
+    assert aberta.status_code == 200
+    assert abrir_stream(cliente).status_code == 503
+    aberta.close()